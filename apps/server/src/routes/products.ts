@@ -54,10 +54,12 @@ router.get('/search', async (req, res, next) => {
 });
 
 // 제품 캐시 수동 동기화 엔드포인트 (메모리 기반)
+// 기본은 증분 동기화(카탈로그 스냅샷 대비 추가/삭제/변경분만 반영), ?full=true면 전체 목록을 다시 로드
 router.post('/sync', async (req, res, next) => {
   try {
-    console.log('🔄 메모리 제품 데이터 수동 새로고침 시작...');
-    const result = await memoryProductService.refresh();
+    const full = req.query.full === 'true';
+    console.log(`🔄 메모리 제품 데이터 ${full ? '전체 새로고침' : '증분 동기화'} 시작...`);
+    const result = full ? await memoryProductService.refresh() : await memoryProductService.syncCatalog();
     
     if (result.success) {
       res.json({
@@ -1,5 +1,4 @@
-import { spawn } from 'child_process';
-import path from 'path';
+import { pythonWorkerService } from './pythonWorkerService';
 
 interface ProductData {
   prodCd: string;    // 제품코드
@@ -10,6 +9,7 @@ class MemoryProductService {
   private products: ProductData[] = [];
   private isLoaded = false;
   private isLoading = false;
+  private catalogVersion: number | null = null;
 
   constructor() {
     // 서버 시작 시 자동으로 제품 데이터 로드 (실제 데이터)
@@ -46,116 +46,31 @@ class MemoryProductService {
     console.log('🔄 Python에서 제품 데이터 로딩 시작...');
 
     try {
-      // test.py는 code 디렉토리에 있으므로 상위 디렉토리로 이동
-      const rootDir = path.join(process.cwd(), '..', '..');
-      const scriptPath = path.join(rootDir, 'test.py');
-      
-      // Python 스크립트 실행 - 자재관리 데이터에서 제품 정보 가져오기
-      const pythonCode = `
-import sys
-import os
-import json
-
-# test.py가 있는 루트 디렉토리 경로 설정
-working_dir = r'${rootDir.replace(/\\/g, '/')}'
-sys.path.insert(0, working_dir)
-
-try:
-    # test.py 파일을 직접 실행하여 함수들을 사용 가능하게 만듦
-    test_py_path = os.path.join(working_dir, 'test.py')
-    if os.path.exists(test_py_path):
-        exec(open(test_py_path).read())
-        
-        # get_materials_management 함수 호출
-        result = get_materials_management()
-        
-        if result and result.get('success') and result.get('data'):
-            products = []
-            for item in result['data']:
-                if 'prodCd' in item and 'prodNm' in item:
-                    products.append({
-                        'prodCd': item['prodCd'],
-                        'prodNm': item['prodNm']
-                    })
-            
-            print(json.dumps({
-                'success': True,
-                'data': products,
-                'count': len(products)
-            }, ensure_ascii=False))
-        else:
-            print(json.dumps({'success': False, 'message': '데이터를 가져올 수 없습니다.'}, ensure_ascii=False))
-    else:
-        print(json.dumps({'success': False, 'message': f'test.py 파일을 찾을 수 없습니다: {test_py_path}'}, ensure_ascii=False))
-        
-except Exception as e:
-    import traceback
-    print(json.dumps({'success': False, 'message': f'Python 스크립트 오류: {str(e)}', 'traceback': traceback.format_exc()}, ensure_ascii=False))
-`;
-
-      const pythonProcess = spawn('python', ['-c', pythonCode], {
-        cwd: process.cwd(),
-        encoding: 'utf8'
-      });
-
-      let stdout = '';
-      let stderr = '';
-
-      pythonProcess.stdout.on('data', (data) => {
-        stdout += data.toString();
-      });
-
-      pythonProcess.stderr.on('data', (data) => {
-        stderr += data.toString();
-      });
-
-      return new Promise((resolve) => {
-        pythonProcess.on('close', (code) => {
-          this.isLoading = false;
-
-          if (code !== 0) {
-            console.error('❌ Python 스크립트 실행 실패:', stderr);
-            resolve({
-              success: false,
-              message: `Python 스크립트 실행 실패 (코드: ${code}): ${stderr}`
-            });
-            return;
-          }
-
-          try {
-            const result = JSON.parse(stdout.trim());
-            
-            if (result.success && result.data) {
-              this.products = result.data;
-              this.isLoaded = true;
-              console.log(`✅ ${result.count}개 제품 데이터 메모리 로딩 완료`);
-              
-              // 샘플 데이터 확인
-              const sampleProducts = this.products.slice(0, 3);
-              console.log('📦 샘플 제품 데이터:', sampleProducts);
-              
-              resolve({
-                success: true,
-                message: `${result.count}개 제품이 성공적으로 로드되었습니다.`,
-                count: result.count
-              });
-            } else {
-              console.error('❌ Python에서 데이터 처리 실패:', result.message);
-              resolve({
-                success: false,
-                message: result.message || '데이터 처리 실패'
-              });
-            }
-          } catch (parseError) {
-            console.error('❌ JSON 파싱 오류:', parseError);
-            console.error('Raw stdout:', stdout);
-            resolve({
-              success: false,
-              message: `JSON 파싱 오류: ${parseError.message}`
-            });
-          }
-        });
-      });
+      // 상주 Python 워커에서 자재관리 데이터(제품 정보) 가져오기
+      const result = await pythonWorkerService.call('materials_management');
+      this.isLoading = false;
+
+      if (result && result.success && result.data) {
+        this.products = result.data.filter((item: any) => item.prodCd && item.prodNm);
+        this.isLoaded = true;
+        console.log(`✅ ${this.products.length}개 제품 데이터 메모리 로딩 완료`);
+
+        // 샘플 데이터 확인
+        const sampleProducts = this.products.slice(0, 3);
+        console.log('📦 샘플 제품 데이터:', sampleProducts);
+
+        return {
+          success: true,
+          message: `${this.products.length}개 제품이 성공적으로 로드되었습니다.`,
+          count: this.products.length
+        };
+      }
+
+      console.error('❌ Python에서 데이터 처리 실패:', result?.message);
+      return {
+        success: false,
+        message: result?.message || '데이터 처리 실패'
+      };
 
     } catch (error) {
       this.isLoading = false;
@@ -167,6 +82,49 @@ except Exception as e:
     }
   }
 
+  // 증분 동기화: 마지막으로 적용한 스냅샷 버전 이후의 추가/삭제/변경분만 반영
+  // (POST /api/products/sync에서 호출)
+  async syncCatalog(): Promise<{ success: boolean; message: string; count?: number }> {
+    if (this.isLoading) {
+      return { success: false, message: '이미 로딩 중입니다.' };
+    }
+    // 아직 로드 전이거나 버전을 모르면 -1을 보내 전체 목록(data)을 받는다
+    const sinceVersion = this.isLoaded && this.catalogVersion !== null ? this.catalogVersion : -1;
+
+    try {
+      const delta = await pythonWorkerService.call('catalog_sync', [sinceVersion]);
+      if (!delta || !delta.success) {
+        return { success: false, message: delta?.error || '카탈로그 동기화 실패' };
+      }
+
+      if (delta.fullResyncRequired) {
+        this.products = delta.data;
+      } else {
+        const byCode = new Map(this.products.map(product => [product.prodCd, product]));
+        for (const prodCd of delta.removed) {
+          byCode.delete(prodCd);
+        }
+        for (const product of [...delta.added, ...delta.changed]) {
+          byCode.set(product.prodCd, { prodCd: product.prodCd, prodNm: product.prodNm });
+        }
+        this.products = Array.from(byCode.values());
+      }
+      this.catalogVersion = delta.version;
+      this.isLoaded = true;
+
+      const { added, removed, changed } = delta.counts;
+      console.log(`✅ 카탈로그 v${delta.baseVersion} -> v${delta.version} (추가 ${added}, 삭제 ${removed}, 변경 ${changed})`);
+      return {
+        success: true,
+        message: `카탈로그 동기화 완료 (추가 ${added}, 삭제 ${removed}, 변경 ${changed})`,
+        count: this.products.length
+      };
+    } catch (error) {
+      console.error('❌ 카탈로그 동기화 오류:', error);
+      return { success: false, message: `카탈로그 동기화 실패: ${error.message}` };
+    }
+  }
+
   // 제품 검색 (자동완성용)
   searchProducts(searchTerm: string, limit: number = 15): Array<{id: string; productCode: string; productName: string}> {
     if (!this.isLoaded || !searchTerm || searchTerm.trim().length < 1) {
@@ -0,0 +1,117 @@
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import path from 'path';
+import readline from 'readline';
+
+// test.py 상주 워커 (python cli.py worker) 클라이언트
+// 요청마다 Python 프로세스를 띄우지 않고 워커 하나에 줄 단위 JSON으로 명령을 보낸다.
+
+interface PendingRequest {
+  resolve: (value: any) => void;
+  reject: (reason: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+const DEFAULT_TIMEOUT_MS = 120000;
+
+class PythonWorkerService {
+  private worker: ChildProcessWithoutNullStreams | null = null;
+  private pending = new Map<string, PendingRequest>();
+  private nextId = 1;
+
+  private get scriptPath(): string {
+    return path.resolve(__dirname, '../../../../cli.py');
+  }
+
+  private start(): ChildProcessWithoutNullStreams {
+    const scriptPath = this.scriptPath;
+    const worker = spawn(process.env.PYTHON_COMMAND || 'python', [scriptPath, 'worker'], {
+      cwd: path.dirname(scriptPath),
+      env: {
+        ...process.env,
+        PYTHONIOENCODING: 'utf-8',
+        LANG: 'ko_KR.UTF-8'
+      }
+    });
+
+    readline.createInterface({ input: worker.stdout }).on('line', (line) => {
+      let message: any;
+      try {
+        message = JSON.parse(line);
+      } catch (error) {
+        console.error('Python worker 응답 파싱 실패:', line);
+        return;
+      }
+      if (message.id === null || message.id === undefined) {
+        return; // ready 알림 등
+      }
+      const request = this.pending.get(String(message.id));
+      if (!request) {
+        return;
+      }
+      this.pending.delete(String(message.id));
+      clearTimeout(request.timer);
+      if (message.success) {
+        request.resolve(message.result);
+      } else {
+        request.reject(new Error(message.error || 'Python worker error'));
+      }
+    });
+
+    worker.stderr.on('data', (data) => {
+      console.log(`[python-worker] ${data.toString('utf8').trimEnd()}`);
+    });
+
+    worker.on('exit', (code) => {
+      console.warn(`Python worker 종료 (code: ${code})`);
+      if (this.worker === worker) {
+        this.worker = null;
+      }
+      for (const [id, request] of this.pending) {
+        clearTimeout(request.timer);
+        request.reject(new Error(`Python worker exited with code ${code}`));
+        this.pending.delete(id);
+      }
+    });
+
+    worker.on('error', (error) => {
+      console.error('Python worker 실행 오류:', error);
+    });
+
+    return worker;
+  }
+
+  // 워커에 명령을 보내고 결과(result)를 받는다. 워커가 없으면 새로 띄운다.
+  // tenant를 주면 해당 회사코드(테넌트) 설정으로 실행된다 (없으면 기본 테넌트).
+  call(
+    command: string,
+    args: any[] | Record<string, any> = [],
+    timeoutMs = DEFAULT_TIMEOUT_MS,
+    tenant?: string
+  ): Promise<any> {
+    if (!this.worker) {
+      this.worker = this.start();
+    }
+    const worker = this.worker;
+    const id = String(this.nextId++);
+
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`Python worker timeout: ${command}`));
+      }, timeoutMs);
+      this.pending.set(id, { resolve, reject, timer });
+      worker.stdin.write(JSON.stringify(tenant ? { id, command, args, tenant } : { id, command, args }) + '\n');
+    });
+  }
+
+  stop(): void {
+    if (this.worker) {
+      this.worker.stdin.write(JSON.stringify({ id: null, command: 'shutdown' }) + '\n');
+      this.worker.stdin.end();
+      this.worker = null;
+    }
+  }
+}
+
+// 싱글톤 인스턴스
+export const pythonWorkerService = new PythonWorkerService();
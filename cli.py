@@ -0,0 +1,12 @@
+"""ECOUNT 조회 CLI 진입점 (python cli.py <명령> [인수...])
+
+test.py와 같은 명령을 받는다. 스크립트로 직접 실행한 파일은 매번 새로 컴파일되지만
+import한 test.py는 캐시된 바이트코드(__pycache__)를 쓰므로 Node에서 명령마다 띄우는 프로세스는 이 파일로 실행한다.
+test.py는 처음에 세션/전송/속도 제한 등 ecount 모듈을 import하지 않고 그것을 쓰는 함수 안에서 import하며,
+requests도 실제로 HTTP 요청을 보낼 때 import된다. 로컬 파일만 쓰는 명령은 이 모듈들을 불러오지 않는다.
+시작 시간은 python -m ecount.startup_bench로 잰다.
+"""
+
+if __name__ == "__main__":
+    from test import main
+    main()
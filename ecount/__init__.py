@@ -0,0 +1,5 @@
+"""ECOUNT OpenAPI 연동 공통 모듈
+
+test.py의 조회 함수들이 사용하는 세션, 잠금 등의 인프라를 모아둔다.
+각 하위 모듈은 필요한 것만 import해서 쓰도록 여기서는 아무것도 미리 불러오지 않는다.
+"""
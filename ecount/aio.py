@@ -0,0 +1,70 @@
+"""asyncio 조회 클라이언트
+
+run_* 조회 함수(동기, requests 기반 Transport 사용)를 asyncio.to_thread로 실행해
+독립적인 조회를 동시에 진행한다. 세션과 연결 풀은 동기 쪽 SessionManager/Transport를
+그대로 공유하므로 로그인은 한 번만 일어나고 keep-alive 연결도 재사용된다.
+
+동시에 실행되는 호출 수는 max_concurrency로 제한한다.
+"""
+import asyncio
+import time
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class AsyncClient:
+    """세션 호출 함수를 감싼 asyncio 클라이언트
+
+    Args:
+        call: call(func, *args, **kwargs) 형태의 동기 세션 호출 함수 (test.call_with_session)
+        max_concurrency: 동시에 실행할 최대 호출 수
+    """
+
+    def __init__(self, call, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        self._call = call
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._semaphore = None
+
+    def _get_semaphore(self):
+        # Semaphore는 실행 중인 이벤트 루프에 묶이므로 처음 쓸 때 만든다
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def call(self, func, *args, **kwargs):
+        """func(session_id, zone, *args, **kwargs)를 스레드에서 실행하고 결과를 돌려준다"""
+        async with self._get_semaphore():
+            return await asyncio.to_thread(self._call, func, *args, **kwargs)
+
+    async def _timed(self, name, func, args):
+        started = time.perf_counter()
+        try:
+            result = await self.call(func, *args)
+            outcome = {"success": True, "result": result}
+        except Exception as e:
+            outcome = {"success": False, "error": str(e)}
+        outcome["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return name, outcome
+
+    async def gather(self, calls):
+        """여러 조회를 동시에 실행 (하나가 실패해도 나머지 결과는 그대로 반환)
+
+        Args:
+            calls: {이름: (func, args)} - args는 session_id, zone 뒤에 붙는 인수 튜플
+
+        Returns:
+            ({이름: {"success", "result"|"error", "ms"}}, stats)
+            stats에는 전체 소요시간(elapsedMs)과 각 호출 시간의 합(sumMs), 가장 느린 호출(slowestMs)이 들어간다
+        """
+        started = time.perf_counter()
+        finished = await asyncio.gather(*(self._timed(name, func, tuple(args)) for name, (func, args) in calls.items()))
+        results = dict(finished)
+        timings = [outcome["ms"] for outcome in results.values()]
+        stats = {
+            "calls": len(results),
+            "maxConcurrency": self.max_concurrency,
+            "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+            "sumMs": round(sum(timings), 1),
+            "slowestMs": max(timings) if timings else 0,
+        }
+        return results, stats
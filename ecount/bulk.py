@@ -0,0 +1,310 @@
+"""ECOUNT 일괄 저장 (작업지시서, 주문서, 구매 등)
+
+레코드(BulkDatas 필드 dict) 목록을 저장 API의 여러 줄 요청으로 묶어 보낸다.
+
+- 같은 UPLOAD_SER_NO 레코드는 한 전표이므로 같은 요청에 넣고, 요청마다 UPLOAD_SER_NO를 1부터 다시 매긴다
+- 요청 하나는 batch_limit 줄 이하 (전표 하나가 그보다 크면 그 전표만 단독 요청)
+- 요청들은 동시에 보내고 속도 제한은 호출 측 전송 계층(RateLimiter)이 맡는다
+- ECOUNT가 요청 전체를 거부(오류 Status)한 배치만 retries번까지 다시 보낸다.
+  줄 단위 검증 오류는 다시 보내도 같으므로 실패로 보고한다
+- 전송 오류(타임아웃, 연결 끊김)나 읽을 수 없는 응답은 ECOUNT가 이미 저장했을 수 있으므로
+  다시 보내지 않고 "결과 불명"(unknown)으로 남긴다. 저장 API는 멱등이 아니어서 다시 보내면 전표가 중복될 수 있다
+- 레코드마다 멱등 키(_key, 없으면 내용 해시)로 결과를 저널(SQLite)에 남기고,
+  같은 레코드를 다시 제출하면 이미 성공한 것은 보내지 않고 이전 결과(전표번호)를 돌려준다.
+  결과 불명 레코드도 다시 보내지 않는다. ECOUNT에서 전표가 없는 것을 확인한 뒤 resend_unknown=True로 다시 제출한다
+
+레코드 입력: JSON 배열, {"records": [...]}, 또는 한 줄에 하나씩 JSON(NDJSON). 경로 "-"는 stdin.
+"""
+import contextvars
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 종류 -> (API 경로, 요청 목록 이름)
+BULK_ENDPOINTS = {
+    'job_order': ('JobOrder/SaveJobOrder', 'JobOrderList'),          # 작업지시서 (생산계획)
+    'sale_order': ('SaleOrder/SaveSaleOrder', 'SaleOrderList'),      # 주문서
+    'sale': ('Sale/SaveSale', 'SaleList'),                           # 판매
+    'purchases': ('Purchases/SavePurchases', 'PurchasesList'),       # 구매
+    'goods_issued': ('GoodsIssued/SaveGoodsIssued', 'GoodsIssuedList'),      # 생산불출
+    'goods_receipt': ('GoodsReceipt/SaveGoodsReceipt', 'GoodsReceiptList'),  # 생산입고
+}
+DEFAULT_BATCH_LIMIT = 300      # 저장 API 한 요청의 최대 줄 수
+DEFAULT_RETRIES = 2
+KEY_FIELD = '_key'             # 멱등 키 (ECOUNT로 보내지 않음)
+SERIAL_FIELD = 'UPLOAD_SER_NO'
+# 저널 success 컬럼 값
+FAILED, SUCCEEDED, UNKNOWN = 0, 1, -1
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS submissions ('
+    ' kind TEXT NOT NULL, key TEXT NOT NULL, success INTEGER NOT NULL, slip_no TEXT, error TEXT,'
+    ' attempts INTEGER NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (kind, key))',
+]
+
+
+def read_records(source):
+    """레코드 리스트 (source: 리스트, 파일 경로, "-"(stdin), JSON 문자열)"""
+    if isinstance(source, list):
+        return source
+    if source == '-':
+        text = sys.stdin.read()
+    elif isinstance(source, str) and source.lstrip()[:1] in ('[', '{'):
+        text = source
+    else:
+        with open(source, encoding='utf-8') as f:
+            text = f.read()
+    text = text.strip()
+    if not text:
+        return []
+    try:
+        data = json.loads(text)
+    except ValueError:
+        # NDJSON
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        data = data.get('records', [data])
+    return data
+
+
+def record_key(kind, record):
+    """멱등 키: _key가 있으면 그 값, 없으면 종류 + 필드 내용 해시"""
+    if record.get(KEY_FIELD):
+        return str(record[KEY_FIELD])
+    fields = {name: value for name, value in record.items() if name != KEY_FIELD}
+    canonical = json.dumps([kind, fields], ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def plan_batches(entries, batch_limit=DEFAULT_BATCH_LIMIT):
+    """[(index, key, fields)] -> 배치 리스트 [[(index, key, fields), ...]]
+
+    UPLOAD_SER_NO가 같은 레코드(같은 전표)는 나누지 않는다. 없으면 레코드마다 전표 하나.
+    배치 안에서 UPLOAD_SER_NO는 전표 순서대로 1부터 다시 매긴다.
+    """
+    documents = {}
+    for index, key, fields in entries:
+        serial = fields.get(SERIAL_FIELD)
+        group = ('ser', str(serial)) if serial not in (None, '') else ('row', index)
+        documents.setdefault(group, []).append((index, key, fields))
+
+    batches, current = [], []
+    for lines in documents.values():
+        if current and len(current) + len(lines) > batch_limit:
+            batches.append(current)
+            current = []
+        current.extend(lines)
+        if len(current) >= batch_limit:
+            batches.append(current)
+            current = []
+    if current:
+        batches.append(current)
+
+    renumbered = []
+    for batch in batches:
+        serials = {}
+        lines = []
+        for index, key, fields in batch:
+            serial = fields.get(SERIAL_FIELD)
+            group = str(serial) if serial not in (None, '') else f"row:{index}"
+            number = serials.setdefault(group, len(serials) + 1)
+            lines.append((index, key, {**fields, SERIAL_FIELD: str(number)}))
+        renumbered.append(lines)
+    return renumbered
+
+
+def _state(result):
+    if result.get("unknown"):
+        return UNKNOWN
+    return SUCCEEDED if result["success"] else FAILED
+
+
+def parse_save_response(contents, batch):
+    """저장 API 응답 -> ([{index, key, success, slipNo, error}], 요청 전체 실패 메시지 또는 None)"""
+    if contents.get('Status') != '200':
+        error = contents.get('Error') or {}
+        return None, f"Status={contents.get('Status')}, Code={error.get('Code')}, Message={error.get('Message')}"
+    data = contents.get('Data') or {}
+    details = data.get('ResultDetails') or []
+    slip_nos = data.get('SlipNos') or []
+    by_line = {}
+    for position, detail in enumerate(details):
+        line = detail.get('Line')
+        by_line[int(line) if str(line).isdigit() else position] = detail
+    fail_count = int(data.get('FailCnt') or 0)
+
+    results = []
+    for position, (index, key, fields) in enumerate(batch):
+        detail = by_line.get(position)
+        if detail is not None:
+            success = str(detail.get('IsSuccess')).lower() in ('true', '1')
+            error = None if success else (detail.get('TotalError') or json.dumps(detail.get('Errors'), ensure_ascii=False))
+        else:
+            # 줄별 결과가 없으면 실패 건수가 0일 때만 성공으로 본다
+            success = fail_count == 0
+            error = None if success else "No result for this line"
+        serial = int(fields[SERIAL_FIELD])
+        slip_no = slip_nos[serial - 1] if success and serial <= len(slip_nos) else None
+        results.append({"index": index, "key": key, "success": success, "slipNo": slip_no, "error": error})
+    return results, None
+
+
+class BulkJournal:
+    """레코드별 제출 결과 저널 (SQLite)
+
+    Args:
+        path: SQLite 파일 경로
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+
+    def _lookup(self, kind, keys, state, column):
+        found = {}
+        keys = list(keys)
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, {column} FROM submissions WHERE kind = ? AND success = ?"
+                    f" AND key IN ({','.join('?' * len(chunk))})", [kind, state] + chunk).fetchall()
+                found.update(rows)
+        return found
+
+    def succeeded(self, kind, keys):
+        """이미 성공한 키 -> 전표번호"""
+        return self._lookup(kind, keys, SUCCEEDED, 'slip_no')
+
+    def unknown(self, kind, keys):
+        """결과 불명으로 남은 키 -> 오류 메시지"""
+        return self._lookup(kind, keys, UNKNOWN, 'error')
+
+    def record(self, kind, results, attempts):
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO submissions (kind, key, success, slip_no, error, attempts, updated_at)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    [(kind, result["key"], _state(result), result["slipNo"], result["error"], attempts, now)
+                     for result in results])
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def submit_bulk(kind, records, send, journal=None, batch_limit=DEFAULT_BATCH_LIMIT, max_workers=2,
+                retries=DEFAULT_RETRIES, dry_run=False, resend_unknown=False):
+    """레코드를 배치로 묶어 저장
+
+    Args:
+        kind: BULK_ENDPOINTS 키
+        records: 레코드 dict 리스트
+        send: send(endpoint, list_name, lines) -> 저장 API 응답 dict (세션/전송은 호출 측)
+        journal: BulkJournal (없으면 재제출 건너뛰기 없음)
+        batch_limit: 요청당 최대 줄 수
+        max_workers: 동시에 보낼 배치 수
+        retries: ECOUNT가 요청 전체를 거부한 배치의 재시도 횟수 (전송 오류는 재시도하지 않음)
+        dry_run: True면 보내지 않고 배치 계획만 반환
+        resend_unknown: True면 저널에 결과 불명으로 남은 레코드도 다시 보낸다
+                        (ECOUNT에 전표가 없는 것을 확인한 뒤에만)
+
+    Returns:
+        (results, summary) - results는 입력 순서대로 {index, key, success, unknown, slipNo, error, skipped, batch}
+        unknown이 True인 레코드는 저장됐는지 알 수 없으므로 ECOUNT에서 확인해야 한다
+    """
+    if kind not in BULK_ENDPOINTS:
+        raise ValueError(f"Unknown bulk kind: {kind} (use {', '.join(BULK_ENDPOINTS)})")
+    endpoint, list_name = BULK_ENDPOINTS[kind]
+
+    entries = []
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise ValueError(f"Record {index} must be an object")
+        fields = {name: value for name, value in record.items() if name != KEY_FIELD}
+        entries.append((index, record_key(kind, record), fields))
+
+    results = {}
+    keys = {key for _, key, _ in entries}
+    done = journal.succeeded(kind, keys) if journal is not None else {}
+    unresolved = journal.unknown(kind, keys) if journal is not None and not resend_unknown else {}
+    pending = []
+    for index, key, fields in entries:
+        if key in done:
+            results[index] = {"index": index, "key": key, "success": True, "unknown": False, "slipNo": done[key],
+                              "error": None, "skipped": True, "batch": None}
+        elif key in unresolved:
+            results[index] = {"index": index, "key": key, "success": False, "unknown": True, "slipNo": None,
+                              "error": unresolved[key], "skipped": True, "batch": None}
+        else:
+            pending.append((index, key, fields))
+
+    batches = plan_batches(pending, max(1, int(batch_limit)))
+    summary = {"records": len(entries), "skipped": len(entries) - len(pending), "batches": len(batches),
+               "retriedBatches": 0, "succeeded": 0, "failed": 0, "unknown": 0, "dryRun": bool(dry_run)}
+    if dry_run:
+        for number, batch in enumerate(batches):
+            for index, key, _ in batch:
+                results[index] = {"index": index, "key": key, "success": None, "unknown": False, "slipNo": None,
+                                  "error": None, "skipped": False, "batch": number}
+        return [results[index] for index in sorted(results)], summary
+
+    lock = threading.Lock()
+
+    def run_batch(number, batch):
+        lines = [fields for _, _, fields in batch]
+        unknown = False
+        for attempt in range(1 + int(retries)):
+            if attempt:
+                if attempt == 1:
+                    with lock:
+                        summary["retriedBatches"] += 1
+                time.sleep(min(2 ** (attempt - 1), 8))
+            try:
+                batch_results, error = parse_save_response(send(endpoint, list_name, lines), batch)
+            except Exception as e:
+                # 전송 오류나 읽을 수 없는 응답: 저장됐는지 알 수 없으므로 다시 보내지 않는다
+                batch_results, error, unknown = None, f"Outcome unknown, check ECOUNT before resending: {e}", True
+                break
+            if batch_results is not None:
+                break
+        if batch_results is None:
+            batch_results = [{"index": index, "key": key, "success": False, "slipNo": None, "error": error}
+                             for index, key, _ in batch]
+        for result in batch_results:
+            result["unknown"] = unknown
+        if journal is not None:
+            journal.record(kind, batch_results, attempt + 1)
+        for result in batch_results:
+            result.update(skipped=False, batch=number, attempts=attempt + 1)
+        return batch_results
+
+    workers = max(1, min(int(max_workers), len(batches) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # 테넌트/우선순위(contextvars)가 배치 스레드로 이어지도록 컨텍스트를 복사해 넘긴다
+        futures = [executor.submit(contextvars.copy_context().run, run_batch, number, batch)
+                   for number, batch in enumerate(batches)]
+        for future in futures:
+            for result in future.result():
+                results[result["index"]] = result
+
+    ordered = [results[index] for index in sorted(results)]
+    summary["succeeded"] = sum(1 for result in ordered if result["success"] and not result["skipped"])
+    summary["unknown"] = sum(1 for result in ordered if result["unknown"])
+    summary["failed"] = sum(1 for result in ordered if not result["success"] and not result["unknown"])
+    return ordered, summary
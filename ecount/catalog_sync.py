@@ -0,0 +1,137 @@
+"""품목 카탈로그 증분 동기화
+
+품목별 내용 해시를 가진 버전 스냅샷을 로컬에 두고, 새로 받아온 카탈로그와 비교해
+추가/삭제/변경된 품목만 돌려준다. 스냅샷이 없으면 products_data.json(get_materials_management
+출력 형식)을 버전 0 스냅샷으로 사용한다.
+
+스냅샷 파일 형식:
+    {"version": 3, "createdAt": "...", "count": 2,
+     "products": {"A00010": {"prodNm": "...", "hash": "..."}, ...}}
+"""
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from .locking import file_lock
+
+def product_hash(prod_cd, prod_nm):
+    """품목 내용 해시 (prodCd, prodNm 기준)"""
+    digest = hashlib.blake2b(f"{prod_cd}\x1f{prod_nm}".encode('utf-8'), digest_size=8)
+    return digest.hexdigest()
+
+
+def build_snapshot_products(products):
+    """[{prodCd, prodNm}, ...] -> {prodCd: {prodNm, hash}} (prodCd 중복 시 마지막 값 사용)"""
+    result = {}
+    for product in products:
+        prod_cd = product.get('prodCd')
+        prod_nm = product.get('prodNm')
+        if not prod_cd or prod_nm is None:
+            continue
+        result[prod_cd] = {"prodNm": prod_nm, "hash": product_hash(prod_cd, prod_nm)}
+    return result
+
+
+def load_snapshot(path, seed_path=None):
+    """스냅샷 로드. 없으면 seed_path(products_data.json 형식)로 버전 0 스냅샷을 만들고, 그것도 없으면 빈 스냅샷."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    products = {}
+    if seed_path and os.path.exists(seed_path):
+        with open(seed_path, encoding='utf-8') as f:
+            seed = json.load(f)
+        products = build_snapshot_products(seed.get('data') or [])
+    return {"version": 0, "createdAt": None, "count": len(products), "products": products}
+
+
+def save_snapshot(path, snapshot):
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix='.products_snapshot_', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def diff_products(old_products, new_products):
+    """두 스냅샷 품목 dict 비교 -> (added, removed, changed)
+
+    added/changed는 [{prodCd, prodNm, hash}], removed는 [prodCd] (모두 prodCd 순 정렬)
+    """
+    added = []
+    changed = []
+    for prod_cd in sorted(new_products):
+        entry = new_products[prod_cd]
+        old_entry = old_products.get(prod_cd)
+        record = {"prodCd": prod_cd, "prodNm": entry["prodNm"], "hash": entry["hash"]}
+        if old_entry is None:
+            added.append(record)
+        elif old_entry.get("hash") != entry["hash"]:
+            changed.append(record)
+    removed = sorted(prod_cd for prod_cd in old_products if prod_cd not in new_products)
+    return added, removed, changed
+
+
+def sync_catalog(products, snapshot_path, seed_path=None, since_version=None):
+    """새 카탈로그를 스냅샷과 비교해 변경분을 반환하고 스냅샷을 갱신한다.
+
+    Args:
+        products: get_materials_management()의 data ([{prodCd, prodNm}, ...])
+        snapshot_path: 스냅샷 파일 경로
+        seed_path: 스냅샷이 없을 때 사용할 products_data.json 경로
+        since_version: 호출 측이 가진 스냅샷 버전. 기준 버전과 다르면 fullResyncRequired=True이고
+                       변경분 대신 적용할 전체 목록(data)을 함께 반환한다
+
+    Returns:
+        {"baseVersion", "version", "added", "removed", "changed", "counts", "fullResyncRequired"[, "data"]}
+
+    products가 비어 있으면 ValueError (조회 실패를 "모든 품목 삭제"로 기록하지 않도록 스냅샷은 그대로)
+    """
+    if not products:
+        raise ValueError("Refusing to sync an empty catalog")
+    with file_lock(snapshot_path + '.lock'):
+        snapshot = load_snapshot(snapshot_path, seed_path)
+        old_products = snapshot.get("products") or {}
+        new_products = build_snapshot_products(products)
+        added, removed, changed = diff_products(old_products, new_products)
+
+        base_version = snapshot.get("version", 0)
+        version = base_version
+        if added or removed or changed or not os.path.exists(snapshot_path):
+            version = base_version + (1 if (added or removed or changed) else 0)
+            save_snapshot(snapshot_path, {
+                "version": version,
+                "createdAt": datetime.now().isoformat(timespec='seconds'),
+                "count": len(new_products),
+                "products": new_products,
+            })
+
+    full_resync = since_version is not None and int(since_version) != base_version
+    result = {
+        "baseVersion": base_version,
+        "version": version,
+        "fullResyncRequired": full_resync,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "counts": {
+            "total": len(new_products),
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed),
+            "unchanged": len(new_products) - len(added) - len(changed),
+        },
+    }
+    if full_resync:
+        # 호출 측 버전이 기준 버전과 달라 변경분만으로는 맞출 수 없으므로 전체 목록도 함께 보낸다
+        result["data"] = [{"prodCd": prod_cd, "prodNm": entry["prodNm"]} for prod_cd, entry in sorted(new_products.items())]
+    return result
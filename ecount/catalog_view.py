@@ -0,0 +1,143 @@
+"""전체 품목 목록 기반 조회 뷰
+
+품목 기본정보를 조건별로 따로 조회하는 대신(전체, PROD_TYPE=1, 특정 PROD_CD 등),
+전체 목록을 freshness window(ttl)마다 한 번만 받아 메모리 인덱스로 답한다.
+조건별 결과는 모두 전체 목록의 부분집합이므로 같은 행을 돌려준다.
+
+인덱스 (INDEX_FIELDS): PROD_CD, PROD_TYPE, CLASS_CD, CLASS_CD2, BAR_CODE -> 값별 행 번호 리스트
+조회: 필드끼리는 AND, 한 필드의 여러 값("A,B" 또는 ECOUNT 구분자 "A∬B")은 OR. 결과는 목록 순서 그대로.
+
+행은 test.py run_product_basic_lookup 행(PRODUCT_FIELDS 순서 15개 필드 리스트)이고 호출들이 함께 쓰므로 고치지 않는다.
+
+뷰의 나이(age)는 fetch가 끝난 때부터 센다. fetch는 응답 캐시를 거치지 않고 ECOUNT에서 받아야
+데이터가 최대 ttl만큼만 오래된다 (캐시된 응답으로 만들면 캐시 TTL만큼 더 오래될 수 있다).
+빈 결과는 뷰로 남기지 않는다 (조회 실패가 빈 목록으로 넘어와 ttl 동안 모든 조회가 빈 결과가 되지 않도록).
+"""
+import threading
+import time
+
+from ecount.stream_decode import PRODUCT_FIELDS
+
+INDEX_FIELDS = ('PROD_CD', 'PROD_TYPE', 'CLASS_CD', 'CLASS_CD2', 'BAR_CODE')
+DEFAULT_TTL = 30 * 60   # 초, 품목 마스터는 하루 몇 번만 바뀐다
+VALUE_SEPARATOR = '∬'   # ECOUNT API의 여러 값 구분자
+
+
+def split_values(value):
+    """"A,B", "A∬B" 또는 리스트 -> 중복 없는 값 리스트 (빈값 제외, 없으면 None = 조건 없음)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.replace(VALUE_SEPARATOR, ',').split(',')
+    values = []
+    for item in value:
+        item = str(item).strip()
+        if item and item not in values:
+            values.append(item)
+    return values or None
+
+
+class CatalogView:
+    """전체 품목 행과 필드별 인덱스
+
+    Args:
+        rows: 품목 행 리스트
+        fields: 행의 필드 순서 (기본 PRODUCT_FIELDS)
+    """
+
+    def __init__(self, rows, fields=PRODUCT_FIELDS):
+        started = time.perf_counter()
+        self.rows = rows
+        self.loaded_at = time.monotonic()
+        self._indexes = {}
+        for field in INDEX_FIELDS:
+            position = fields.index(field)
+            index = {}
+            for number, row in enumerate(rows):
+                value = row[position]
+                if value is not None and value != '':
+                    index.setdefault(str(value).strip(), []).append(number)
+            self._indexes[field] = index
+        self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def age(self):
+        return time.monotonic() - self.loaded_at
+
+    def query(self, **filters):
+        """필드별 조건으로 행 찾기 (예: query(PROD_CD="A,B", PROD_TYPE="1"))
+
+        값이 비어 있는 조건은 무시한다. 조건이 없으면 전체 행.
+        """
+        selected = None
+        for field, value in filters.items():
+            if field not in self._indexes:
+                raise ValueError(f"Not an indexed field: {field} (use {', '.join(INDEX_FIELDS)})")
+            values = split_values(value)
+            if values is None:
+                continue
+            postings = [self._indexes[field].get(item, ()) for item in values]
+            numbers = list(postings[0]) if len(postings) == 1 else sorted(set().union(*postings))
+            selected = numbers if selected is None else sorted(set(selected).intersection(numbers))
+            if not selected:
+                return []
+        if selected is None:
+            return list(self.rows)
+        return [self.rows[number] for number in selected]
+
+
+class CatalogViewCache:
+    """freshness window 안에서 CatalogView를 재사용 (스레드 안전)
+
+    ttl이 지나면 다음 get()이 전체 목록을 다시 받는다. 동시에 여러 호출이 오래된 뷰를 만나도
+    전체 목록 조회는 한 번만 하고 나머지는 새 뷰를 함께 쓴다.
+
+    Args:
+        ttl: 뷰 유효 시간(초)
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._view = None
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "refreshes": 0, "emptyFetches": 0}
+
+    def _fresh(self, view):
+        return view is not None and view.age() < self.ttl
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, fetch):
+        """유효한 뷰 (없거나 오래됐으면 fetch()로 전체 행을 받아 새로 만든다)
+
+        fetch()가 예외를 내면 그대로 전달하고, 빈 리스트를 돌려주면 그 호출에만 빈 뷰를 준다 (둘 다 뷰는 그대로).
+        """
+        with self._refresh_lock:
+            view = self._view
+            if self._fresh(view):
+                self._count("hits")
+                return view
+            rows = fetch()
+            if not rows:
+                self._count("emptyFetches")
+                return CatalogView(rows)
+            view = self._view = CatalogView(rows)
+            self._count("refreshes")
+            return view
+
+    def invalidate(self):
+        self._view = None
+
+    def stats(self):
+        view = self._view
+        with self._lock:
+            result = dict(self._counters)
+        result.update(ttl=self.ttl, loaded=view is not None, size=len(view) if view is not None else 0,
+                      ageSeconds=round(view.age(), 1) if view is not None else None,
+                      buildMs=view.build_ms if view is not None else None)
+        return result
@@ -0,0 +1,356 @@
+"""컬럼형 품목 테이블 (메모리 매핑 파일)
+
+run_product_basic_lookup의 15개 필드 행(list)을 컬럼 단위로 저장한다.
+
+- 문자열 컬럼 (PROD_CD, PROD_DES, SIZE_DES, BAR_CODE): UTF-8 문자열 힙 + uint32 오프셋
+- 사전 인코딩 컬럼 (UNIT, PROD_TYPE, CLASS_CD 등 값 종류가 적은 것): 값 사전 + uint16/uint32 코드
+- 숫자 컬럼 (단가, 수량): float64 배열(값이 없으면 NaN) + 원래 값의 사전 인코딩 컬럼
+  행/컬럼 값은 ECOUNT가 준 원래 값("1200.5" 등 문자열)을 그대로 돌려주고, 계산용 float64는 numeric_view()로 본다
+
+파일은 mmap으로 열고 각 컬럼은 memoryview.cast로 복사 없이 읽는다.
+numpy가 있으면 numeric_view()를 np.frombuffer로 그대로 감싸 쓸 수 있다.
+
+mmap으로 열린 파일은 Windows에서 교체(os.replace)하거나 지울 수 없으므로, 갱신은 save_version()으로
+버전 번호가 붙은 새 파일(products_columns.<버전>.bin)에 쓰고 latest_version()으로 가장 새 파일을 연다.
+이전 버전 파일은 지울 수 있을 때(다른 프로세스가 열고 있지 않을 때) 지운다.
+
+파일 형식:
+    MAGIC(8) | 헤더 길이 uint32(4) | 헤더 JSON | 8바이트 정렬된 섹션들
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+
+MAGIC = b'ECPCOL1\x00'
+ALIGN = 8
+
+# (필드명, 종류) - run_product_basic_lookup 행 순서와 같다
+PRODUCT_COLUMNS = [
+    ('PROD_CD', 'str'),       # 품목코드
+    ('PROD_DES', 'str'),      # 품목명
+    ('SIZE_DES', 'str'),      # 규격명
+    ('UNIT', 'dict'),         # 단위
+    ('PROD_TYPE', 'dict'),    # 품목구분
+    ('IN_PRICE', 'f64'),      # 입고단가
+    ('OUT_PRICE', 'f64'),     # 출고단가
+    ('BAL_FLAG', 'dict'),     # 재고수량관리여부
+    ('SET_FLAG', 'dict'),     # 세트여부
+    ('CLASS_CD', 'dict'),     # 그룹코드1
+    ('CLASS_CD2', 'dict'),    # 그룹코드2
+    ('BAR_CODE', 'str'),      # 바코드
+    ('VAT_YN', 'dict'),       # 부가세율구분
+    ('SAFE_QTY', 'f64'),      # 안전재고수량
+    ('MIN_QTY', 'f64'),       # 최소구매단위
+]
+
+
+def _to_float(value):
+    if value is None or value == '':
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _pad(buffer):
+    remainder = len(buffer) % ALIGN
+    if remainder:
+        buffer.extend(b'\x00' * (ALIGN - remainder))
+
+
+class StringColumn:
+    """문자열 힙 컬럼 (None은 null 플래그로 구분)"""
+
+    def __init__(self, offsets, heap, nulls):
+        self._offsets = offsets
+        self._heap = heap
+        self._nulls = nulls
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if self._nulls is not None and self._nulls[index]:
+            return None
+        return bytes(self._heap[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8')
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class DictColumn:
+    """사전 인코딩 컬럼"""
+
+    def __init__(self, codes, values):
+        self.codes = codes
+        self.values = values
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+
+    def __iter__(self):
+        values = self.values
+        for code in self.codes:
+            yield values[code]
+
+
+class NumericColumn:
+    """float64 컬럼 (값은 원래 값 컬럼 text가 있으면 그 값, 없으면 float이고 NaN은 None)"""
+
+    def __init__(self, values, text=None):
+        self.values = values
+        self.text = text
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if self.text is not None:
+            return self.text[index]
+        value = self.values[index]
+        return None if value != value else value
+
+    def __iter__(self):
+        if self.text is not None:
+            yield from self.text
+            return
+        for value in self.values:
+            yield None if value != value else value
+
+
+def _encode_dictionary(values, sections, info, prefix=''):
+    dictionary = {}
+    codes = [dictionary.setdefault(value, len(dictionary)) for value in values]
+    typecode = 'H' if len(dictionary) <= 0xFFFF else 'I'
+    info[prefix + "typecode"] = typecode
+    info[prefix + "values"] = list(dictionary)
+    info[prefix + "codes"] = len(sections)
+    sections.extend(array(typecode, codes).tobytes())
+    _pad(sections)
+
+
+def encode_rows(rows, columns=PRODUCT_COLUMNS):
+    """행 리스트를 컬럼형 바이너리로 인코딩"""
+    count = len(rows)
+    sections = bytearray()
+    meta = []
+    for position, (name, kind) in enumerate(columns):
+        values = [row[position] if position < len(row) else None for row in rows]
+        info = {"name": name, "kind": kind}
+        if kind == 'str':
+            offsets = array('I', [0])
+            heap = bytearray()
+            nulls = bytearray(count)
+            for index, value in enumerate(values):
+                if value is None:
+                    nulls[index] = 1
+                else:
+                    heap.extend(str(value).encode('utf-8'))
+                offsets.append(len(heap))
+            info["offsets"] = len(sections)
+            sections.extend(offsets.tobytes())
+            _pad(sections)
+            info["heap"] = len(sections)
+            info["heapBytes"] = len(heap)
+            sections.extend(heap)
+            _pad(sections)
+            if any(nulls):
+                info["nulls"] = len(sections)
+                sections.extend(nulls)
+                _pad(sections)
+        elif kind == 'dict':
+            _encode_dictionary(values, sections, info)
+        elif kind == 'f64':
+            info["values"] = len(sections)
+            sections.extend(array('d', (_to_float(value) for value in values)).tobytes())
+            _pad(sections)
+            # 단가/수량은 값 종류가 적으므로 원래 값도 사전 인코딩으로 함께 둔다
+            _encode_dictionary(values, sections, info, prefix='text')
+        else:
+            raise ValueError(f"Unknown column kind: {kind}")
+        meta.append(info)
+
+    header = json.dumps({"rows": count, "byteorder": sys.byteorder, "columns": meta},
+                        ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    prefix = bytearray(MAGIC + struct.pack('<I', len(header)) + header)
+    _pad(prefix)
+    return bytes(prefix + sections)
+
+
+class ProductTable:
+    """컬럼형 품목 테이블
+
+    ProductTable.from_rows(rows)로 만들고 save(path)로 저장, ProductTable.open(path)로 mmap 로드.
+    """
+
+    def __init__(self, buffer, mapped=None, file=None):
+        self._buffer = memoryview(buffer)
+        self._mmap = mapped
+        self._file = file
+        if bytes(self._buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a product column file")
+        header_length = struct.unpack_from('<I', self._buffer, len(MAGIC))[0]
+        header_start = len(MAGIC) + 4
+        header = json.loads(bytes(self._buffer[header_start:header_start + header_length]).decode('utf-8'))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError("Product column file was written with a different byte order")
+        base = header_start + header_length
+        base += (-base) % ALIGN
+
+        self.rows = header["rows"]
+        self.column_names = []
+        self._columns = {}
+        for info in header["columns"]:
+            name = info["name"]
+            self.column_names.append(name)
+            if info["kind"] == 'str':
+                offsets = self._view(base + info["offsets"], (self.rows + 1) * 4, 'I')
+                heap = self._buffer[base + info["heap"]:base + info["heap"] + info["heapBytes"]]
+                nulls = self._buffer[base + info["nulls"]:base + info["nulls"] + self.rows] if "nulls" in info else None
+                self._columns[name] = StringColumn(offsets, heap, nulls)
+            elif info["kind"] == 'dict':
+                self._columns[name] = self._dictionary(base, info)
+            else:
+                text = self._dictionary(base, info, prefix='text') if "textcodes" in info else None
+                self._columns[name] = NumericColumn(self._view(base + info["values"], self.rows * 8, 'd'), text)
+
+    def _view(self, start, length, typecode):
+        return self._buffer[start:start + length].cast(typecode)
+
+    def _dictionary(self, base, info, prefix=''):
+        typecode = info[prefix + "typecode"]
+        size = 2 if typecode == 'H' else 4
+        codes = self._view(base + info[prefix + "codes"], self.rows * size, typecode)
+        return DictColumn(codes, info[prefix + "values"])
+
+    @classmethod
+    def from_rows(cls, rows):
+        return cls(encode_rows(rows))
+
+    @classmethod
+    def open(cls, path):
+        """파일을 읽기 전용 mmap으로 연다 (컬럼 데이터는 복사하지 않음)"""
+        file = open(path, 'rb')
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            file.close()
+            raise
+        return cls(mapped, mapped=mapped, file=file)
+
+    def save(self, path):
+        directory = os.path.dirname(path) or '.'
+        fd, tmp_path = tempfile.mkstemp(prefix='.products_columns_', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._buffer)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def close(self):
+        # 컬럼 뷰를 먼저 놓아야 mmap을 닫을 수 있다
+        for column in self._columns.values():
+            for view in (getattr(column, name, None) for name in ('_offsets', '_heap', '_nulls', 'codes', 'values')):
+                if isinstance(view, memoryview):
+                    view.release()
+            text = getattr(column, 'text', None)
+            if text is not None:
+                text.codes.release()
+        self._columns = {}
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def nbytes(self):
+        return len(self._buffer)
+
+    def column(self, name):
+        return self._columns[name]
+
+    def numeric_view(self, name):
+        """숫자 컬럼의 float64 memoryview (np.frombuffer로 복사 없이 감쌀 수 있음)"""
+        column = self._columns[name]
+        if not isinstance(column, NumericColumn):
+            raise TypeError(f"{name} is not a numeric column")
+        return column.values
+
+    def row(self, index):
+        return [self._columns[name][index] for name in self.column_names]
+
+    def iter_rows(self):
+        columns = [iter(self._columns[name]) for name in self.column_names]
+        return (list(values) for values in zip(*columns))
+
+    def to_rows(self):
+        return list(self.iter_rows())
+
+
+def versioned_path(path, version):
+    """products_columns.bin -> products_columns.<version>.bin"""
+    root, extension = os.path.splitext(path)
+    return f"{root}.{version}{extension}"
+
+
+def list_versions(path):
+    """path의 버전 파일 [(버전, 경로)] (오래된 순)"""
+    root, extension = os.path.splitext(path)
+    directory = os.path.dirname(root) or '.'
+    prefix = os.path.basename(root) + '.'
+    versions = []
+    for name in os.listdir(directory) if os.path.isdir(directory) else ():
+        if name.startswith(prefix) and name.endswith(extension):
+            version = name[len(prefix):len(name) - len(extension)]
+            if version.isdigit():
+                versions.append((int(version), os.path.join(os.path.dirname(root), name)))
+    return sorted(versions)
+
+
+def latest_version(path):
+    """가장 새 버전 파일 경로 (없으면 None)"""
+    versions = list_versions(path)
+    return versions[-1][1] if versions else None
+
+
+def save_version(table, path):
+    """table을 새 버전 파일로 저장하고 이전 버전은 지울 수 있는 것만 지운다 -> 새 파일 경로
+
+    열려 있는(mmap된) 파일을 덮어쓰지 않으므로 Windows에서도 다른 프로세스가 읽는 중에 갱신할 수 있다.
+    """
+    previous = list_versions(path)
+    version = max([time.time_ns()] + [number + 1 for number, _ in previous])
+    target = versioned_path(path, version)
+    table.save(target)
+    for _, old_path in previous:
+        try:
+            os.remove(old_path)
+        except OSError:
+            pass   # 아직 열려 있음 (Windows) - 다음 갱신 때 다시 지운다
+    return target
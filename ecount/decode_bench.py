@@ -0,0 +1,130 @@
+"""품목 기본정보 응답 디코딩 메모리 벤치마크
+
+GetBasicProductsList 모양의 응답(Data.Result가 JSON 배열을 담은 문자열)을 파일로 만들고,
+디코딩 방식마다 새 프로세스에서 행(15개 필드) 리스트를 만들어 최대 RSS를 잰다.
+
+- loads: 기존 방식. 본문 bytes -> str -> json.loads -> Result 문자열 json.loads -> 행
+- stream: ecount.stream_decode.ResponseStream으로 64KB 청크를 읽으며 바로 행
+
+결과 항목:
+    peakRssMb: 프로세스 최대 RSS (ru_maxrss)
+    decodeRssMb: 디코딩 전 RSS 대비 증가분 (본문과 중간 객체가 차지한 몫)
+    seconds: 디코딩 시간
+
+사용:
+    python -m ecount.decode_bench
+    python -m ecount.decode_bench --products 100000 --extra-fields 40
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_PRODUCTS = 50000
+DEFAULT_EXTRA_FIELDS = 30   # 실제 응답은 행에 쓰지 않는 필드가 훨씬 많다
+MODES = ('loads', 'stream')
+
+
+def write_sample(path, products=DEFAULT_PRODUCTS, extra_fields=DEFAULT_EXTRA_FIELDS):
+    """GetBasicProductsList 모양의 응답 본문을 path에 쓴다"""
+    from ecount.stream_decode import PRODUCT_FIELDS
+
+    items = []
+    for number in range(products):
+        item = {name: f"{name}-{number}" for name in PRODUCT_FIELDS}
+        item.update(PROD_CD=f"P{number:07d}", PROD_DES=f"허브큐어 \"샘플\" 제품 {number}", PROD_TYPE=str(number % 4))
+        for extra in range(extra_fields):
+            item[f"CONT{extra}"] = f"값 {number}/{extra}"
+        items.append(item)
+    body = {"Data": {"TotalCnt": products, "Result": json.dumps(items, ensure_ascii=False)},
+            "Status": "200", "Error": None, "Timestamp": "", "RequestKey": None, "IsEnableNoL4": False}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(body, f, ensure_ascii=False)
+
+
+def _rss_mb():
+    import resource
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024   # ru_maxrss: macOS는 바이트, Linux는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _decode(mode, path):
+    from ecount.stream_decode import DEFAULT_CHUNK_SIZE, PRODUCT_FIELDS, ResponseStream
+
+    if mode == 'loads':
+        with open(path, 'rb') as f:
+            content = f.read()
+        text = content.decode('utf-8')
+        contents = json.loads(text)
+        items = json.loads(contents['Data']['Result'])
+        return [[m.get(name) for name in PRODUCT_FIELDS] for m in items]
+    with open(path, 'rb') as f:
+        chunks = iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b'')
+        return [[m.get(name) for name in PRODUCT_FIELDS] for m in ResponseStream(chunks, PRODUCT_FIELDS)]
+
+
+def run_child(mode, path):
+    """자식 프로세스: 한 방식으로 디코딩하고 결과를 JSON 한 줄로 출력"""
+    before = _rss_mb()
+    started = time.perf_counter()
+    rows = _decode(mode, path)
+    seconds = time.perf_counter() - started
+    peak = _rss_mb()
+    digest = hashlib.sha1(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+    print(json.dumps({"mode": mode, "rows": len(rows), "seconds": round(seconds, 3),
+                      "peakRssMb": round(peak, 1), "decodeRssMb": round(peak - before, 1), "digest": digest}))
+
+
+def _run_module(*args):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run([sys.executable, '-m', 'ecount.decode_bench', *args],
+                          cwd=root, capture_output=True, text=True, check=True).stdout
+
+
+def bench(path, modes=MODES):
+    """방식마다 새 프로세스에서 디코딩한 결과 리스트"""
+    return [json.loads(_run_module('--child', mode, path).strip().splitlines()[-1]) for mode in modes]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ecount.decode_bench")
+    parser.add_argument("--products", type=int, default=DEFAULT_PRODUCTS, help="샘플 품목 수")
+    parser.add_argument("--extra-fields", type=int, default=DEFAULT_EXTRA_FIELDS, help="품목당 행에 쓰지 않는 필드 수")
+    parser.add_argument("--body", help="샘플 대신 쓸 응답 본문 파일 (GetBasicProductsList 응답 저장본)")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--write-sample", metavar="PATH", help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+
+    if options.child:
+        run_child(*options.child)
+        return 0
+    if options.write_sample:
+        write_sample(options.write_sample, options.products, options.extra_fields)
+        return 0
+    if sys.platform == 'win32':
+        print("decode_bench needs the resource module (not available on Windows)", file=sys.stderr)
+        return 1
+
+    # 두 방식이 만든 행이 다르면 mismatch와 종료 코드 1
+    with tempfile.TemporaryDirectory() as directory:
+        path = options.body
+        if not path:
+            path = os.path.join(directory, 'products_response.json')
+            # 샘플도 별도 프로세스에서 만든다 (ru_maxrss는 fork한 자식에게 이어지므로 부모 RSS를 작게 유지)
+            _run_module('--write-sample', path, '--products', str(options.products),
+                        '--extra-fields', str(options.extra_fields))
+        report = {"bodyMb": round(os.path.getsize(path) / (1024 * 1024), 1), "results": bench(path)}
+    loads, stream = report["results"]
+    if stream["digest"] != loads["digest"]:
+        report["mismatch"] = True
+    report["peakRssRatio"] = round(stream["peakRssMb"] / loads["peakRssMb"], 2) if loads["peakRssMb"] else None
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if report.get("mismatch") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
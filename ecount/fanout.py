@@ -0,0 +1,102 @@
+"""여러 창고/품목 재고현황 조회 계획
+
+창고코드·품목코드 목록이 주어졌을 때 ECOUNT 호출을 어떻게 나눌지 정한다.
+
+- filtered: (창고, 품목) 조합마다 필터를 건 호출 - 호출 수는 많지만 응답이 작다
+- per_warehouse: 창고마다 품목 필터 없이 호출하고 품목은 로컬에서 거른다
+- unfiltered: 창고 목록이 없을 때 필터 없이 한 번 호출하고 품목은 로컬에서 거른다
+
+호출 하나의 고정 비용(CALL_MS)과 응답 행당 비용(ROW_MS), 동시 실행 수로 예상 시간을 계산해
+가장 빠른 계획을 고른다. 필터 없는 호출의 응답 행 수는 카탈로그 크기로 추정한다.
+"""
+import math
+
+CALL_MS = 400.0        # 호출 하나의 고정 비용 (왕복 + 속도 제한 대기)
+ROW_MS = 0.05          # 응답 행 하나의 비용 (전송 + JSON 디코딩)
+DEFAULT_CATALOG_ROWS = 1000
+
+
+def split_codes(value):
+    """"A,B" 문자열 또는 리스트 -> 중복 없는 코드 리스트 (순서 유지, 빈값 제외)"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    codes = []
+    for code in value:
+        code = str(code).strip()
+        if code and code not in codes:
+            codes.append(code)
+    return codes
+
+
+def _estimate_ms(calls, rows_per_call, max_workers):
+    waves = math.ceil(calls / max(1, max_workers))
+    return round(waves * CALL_MS + calls * rows_per_call * ROW_MS, 1)
+
+
+def plan_balance_fanout(wh_codes, prod_codes, catalog_rows=None, max_workers=4):
+    """조회 계획
+
+    Args:
+        wh_codes: 창고코드 리스트 (비면 전체 창고 합계)
+        prod_codes: 품목코드 리스트 (비면 전체 품목)
+        catalog_rows: 필터 없는 호출의 예상 응답 행 수 (품목 수)
+        max_workers: 동시 호출 수
+
+    Returns:
+        {"strategy", "requests": [(wh_cd, prod_cd), ...], "localFilter": bool,
+         "estimatedMs", "alternatives": {strategy: estimatedMs}}
+    """
+    catalog_rows = catalog_rows or DEFAULT_CATALOG_ROWS
+    warehouses = wh_codes or ['']
+    candidates = {}
+
+    if prod_codes:
+        requests = [(wh_cd, prod_cd) for wh_cd in warehouses for prod_cd in prod_codes]
+        candidates['filtered'] = (requests, False, _estimate_ms(len(requests), 1, max_workers))
+        requests = [(wh_cd, '') for wh_cd in warehouses]
+        strategy = 'per_warehouse' if wh_codes else 'unfiltered'
+        candidates[strategy] = (requests, True, _estimate_ms(len(requests), catalog_rows, max_workers))
+    else:
+        # 품목 필터가 없으면 창고별 호출 외에 방법이 없다
+        requests = [(wh_cd, '') for wh_cd in warehouses]
+        strategy = 'per_warehouse' if wh_codes else 'unfiltered'
+        candidates[strategy] = (requests, False, _estimate_ms(len(requests), catalog_rows, max_workers))
+
+    strategy = min(candidates, key=lambda name: (candidates[name][2], len(candidates[name][0])))
+    requests, local_filter, estimated_ms = candidates[strategy]
+    return {
+        "strategy": strategy,
+        "requests": requests,
+        "localFilter": local_filter,
+        "estimatedMs": estimated_ms,
+        "alternatives": {name: candidate[2] for name, candidate in candidates.items()},
+    }
+
+
+def merge_balance_rows(batches, prod_codes=None):
+    """호출별 결과를 (WH_CD, PROD_CD) 기준으로 합친다.
+
+    Args:
+        batches: [(요청한 wh_cd, 원본 item 리스트), ...]
+        prod_codes: 주어지면 이 품목만 남긴다 (로컬 필터)
+
+    Returns:
+        ([[PROD_CD, BAL_QTY, WH_CD], ...] (WH_CD, PROD_CD 순), 중복으로 버린 행 수)
+    """
+    wanted = set(prod_codes) if prod_codes else None
+    merged = {}
+    duplicates = 0
+    for requested_wh_cd, items in batches:
+        for item in items:
+            prod_cd = item.get('PROD_CD')
+            if wanted is not None and prod_cd not in wanted:
+                continue
+            wh_cd = item.get('WH_CD') or requested_wh_cd
+            key = (wh_cd, prod_cd)
+            if key in merged:
+                duplicates += 1
+                continue
+            merged[key] = [prod_cd, item.get('BAL_QTY'), wh_cd]
+    return [merged[key] for key in sorted(merged, key=lambda key: (key[0] or '', key[1] or ''))], duplicates
@@ -0,0 +1,56 @@
+"""프로세스 간 파일 잠금"""
+import os
+import time
+from contextlib import contextmanager
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+def _try_lock(fd):
+    if os.name == 'nt':
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock(fd):
+    if os.name == 'nt':
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path, timeout=30.0, poll_interval=0.05):
+    """잠금 파일에 대한 배타적 잠금을 잡는다.
+
+    Args:
+        path: 잠금 파일 경로 (없으면 생성)
+        timeout: 잠금 대기 최대 시간(초), 초과 시 TimeoutError
+        poll_interval: 잠금 재시도 간격(초)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _try_lock(fd)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"잠금 획득 시간 초과: {path}")
+                time.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
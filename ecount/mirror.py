@@ -0,0 +1,242 @@
+"""ECOUNT 데이터 로컬 미러 (SQLite)
+
+품목 기본정보, 재고현황, 발주서 조회 결과를 인덱스가 있는 SQLite 테이블에 저장하고
+데이터셋별 동기화 기준점(watermark)을 기록한다. 대시보드 조회는 ECOUNT 대신 미러에서 답한다.
+
+- products: 전체 카탈로그를 받아 upsert, 카탈로그에 없어진 품목은 삭제
+- inventory: 기준일자 단위로 교체 (watermark = 마지막 기준일자)
+- purchase_orders: 조회 기간 단위로 교체 (watermark = 동기화한 마지막 날짜)
+
+products/inventory는 빈 조회 결과로 비어 있지 않은 테이블을 비우지 않는다 (EmptySyncError, allow_empty=True로만 허용).
+ECOUNT 일시 오류가 빈 결과로 넘어와 로컬 사본이 지워지는 것을 막는다. 실패한 동기화는 watermark를 바꾸지 않는다.
+
+여러 프로세스가 같은 파일을 함께 쓴다 (WAL 모드).
+"""
+import sqlite3
+import threading
+import time
+
+PRODUCT_FIELDS = ('prod_cd', 'prod_des', 'size_des', 'unit', 'prod_type', 'in_price', 'out_price', 'bal_flag',
+                  'set_flag', 'class_cd', 'class_cd2', 'bar_code', 'vat_yn', 'safe_qty', 'min_qty')
+ORDER_FIELDS = ('ord_no', 'ord_date', 'cust_des', 'prod_des', 'qty', 'buy_amt', 'vat_amt', 'ttl_ctt',
+                'time_date', 'edms_app_type')
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS products ('
+    ' prod_cd TEXT PRIMARY KEY, prod_des TEXT, size_des TEXT, unit TEXT, prod_type TEXT, in_price TEXT,'
+    ' out_price TEXT, bal_flag TEXT, set_flag TEXT, class_cd TEXT, class_cd2 TEXT, bar_code TEXT, vat_yn TEXT,'
+    ' safe_qty TEXT, min_qty TEXT, synced_at REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS products_class_cd ON products(class_cd)',
+    'CREATE INDEX IF NOT EXISTS products_prod_type ON products(prod_type)',
+    'CREATE TABLE IF NOT EXISTS inventory ('
+    ' base_date TEXT NOT NULL, wh_cd TEXT NOT NULL, prod_cd TEXT NOT NULL, bal_qty TEXT, synced_at REAL NOT NULL,'
+    ' PRIMARY KEY (base_date, wh_cd, prod_cd))',
+    'CREATE INDEX IF NOT EXISTS inventory_prod_cd ON inventory(prod_cd, base_date)',
+    'CREATE INDEX IF NOT EXISTS inventory_wh_cd ON inventory(wh_cd, base_date)',
+    'CREATE TABLE IF NOT EXISTS purchase_orders ('
+    ' ord_no TEXT, ord_date TEXT, cust_des TEXT, prod_des TEXT, qty TEXT, buy_amt TEXT, vat_amt TEXT,'
+    ' ttl_ctt TEXT, time_date TEXT, edms_app_type TEXT, synced_at REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS purchase_orders_ord_date ON purchase_orders(ord_date)',
+    'CREATE INDEX IF NOT EXISTS purchase_orders_cust_des ON purchase_orders(cust_des, ord_date)',
+    'CREATE INDEX IF NOT EXISTS purchase_orders_ord_no ON purchase_orders(ord_no)',
+    'CREATE TABLE IF NOT EXISTS sync_state ('
+    ' dataset TEXT PRIMARY KEY, watermark TEXT, synced_at REAL NOT NULL, rows INTEGER, elapsed_ms REAL)',
+]
+
+
+class EmptySyncError(ValueError):
+    """비어 있지 않은 테이블을 빈 조회 결과로 교체하려 할 때 발생"""
+
+
+def _in_clause(column, values):
+    return f"{column} IN ({','.join('?' * len(values))})", list(values)
+
+
+class Mirror:
+    """로컬 SQLite 미러
+
+    Args:
+        path: SQLite 파일 경로
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+
+    def _write(self, statements):
+        """[(sql, params 또는 params 리스트, many)]를 한 트랜잭션으로 실행"""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for sql, params, many in statements:
+                    if many:
+                        self._conn.executemany(sql, params)
+                    else:
+                        self._conn.execute(sql, params)
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _state(dataset, watermark, rows, elapsed_ms):
+        return ('INSERT OR REPLACE INTO sync_state (dataset, watermark, synced_at, rows, elapsed_ms)'
+                ' VALUES (?, ?, ?, ?, ?)', (dataset, watermark, time.time(), rows, elapsed_ms), False)
+
+    def _refuse_empty(self, table, values, allow_empty):
+        if values or allow_empty:
+            return
+        existing = self._query(f'SELECT COUNT(*) AS count FROM {table}')[0]['count']
+        if existing:
+            raise EmptySyncError(f"Refusing to replace {existing} mirrored {table} rows with an empty fetch"
+                                 f" (pass allow_empty to clear them)")
+
+    def sync_products(self, rows, elapsed_ms=None, allow_empty=False):
+        """전체 카탈로그 upsert (run_product_basic_lookup 15개 필드 행), 없어진 품목은 삭제
+
+        rows가 비었는데 테이블에 품목이 있으면 allow_empty가 아닌 한 EmptySyncError (아무것도 바꾸지 않음)
+        """
+        now = time.time()
+        rows = [list(row[:len(PRODUCT_FIELDS)]) + [now] for row in rows if row and row[0]]
+        self._refuse_empty('products', rows, allow_empty)
+        columns = ', '.join(PRODUCT_FIELDS)
+        updates = ', '.join(f"{field} = excluded.{field}" for field in PRODUCT_FIELDS[1:])
+        self._write([
+            (f"INSERT INTO products ({columns}, synced_at) VALUES ({', '.join('?' * (len(PRODUCT_FIELDS) + 1))})"
+             f" ON CONFLICT(prod_cd) DO UPDATE SET {updates}, synced_at = excluded.synced_at", rows, True),
+            ('DELETE FROM products WHERE synced_at < ?', (now,), False),
+            self._state('products', None, len(rows), elapsed_ms),
+        ])
+        return len(rows)
+
+    def sync_inventory(self, base_date, rows, elapsed_ms=None, allow_empty=False):
+        """기준일자 재고현황 교체 (행: [PROD_CD, BAL_QTY, WH_CD])
+
+        rows가 비었는데 테이블에 재고가 있으면 allow_empty가 아닌 한 EmptySyncError (아무것도 바꾸지 않음)
+        """
+        now = time.time()
+        values = [(base_date, row[2] or '', row[0], row[1], now) for row in rows if row and row[0]]
+        self._refuse_empty('inventory', values, allow_empty)
+        self._write([
+            ('DELETE FROM inventory WHERE base_date = ?', (base_date,), False),
+            ('INSERT OR REPLACE INTO inventory (base_date, wh_cd, prod_cd, bal_qty, synced_at) VALUES (?, ?, ?, ?, ?)',
+             values, True),
+            self._state('inventory', base_date, len(values), elapsed_ms),
+        ])
+        return len(values)
+
+    def sync_orders(self, date_from, date_to, rows, elapsed_ms=None):
+        """발주일자가 [date_from, date_to]인 발주서를 교체 (행: _order_row 10개 필드)"""
+        now = time.time()
+        values = []
+        for row in rows:
+            row = list(row[:len(ORDER_FIELDS)])
+            # 날짜 범위 비교가 되도록 발주일자는 YYYYMMDD로 맞춘다 ("2024-01-05", "2024/01/05" 등)
+            row[1] = ''.join(ch for ch in str(row[1] or '') if ch.isdigit())
+            values.append(row + [now])
+        previous = self.watermarks().get('purchase_orders', {}).get('watermark')
+        self._write([
+            ('DELETE FROM purchase_orders WHERE ord_date >= ? AND ord_date <= ?', (date_from, date_to), False),
+            (f"INSERT INTO purchase_orders ({', '.join(ORDER_FIELDS)}, synced_at)"
+             f" VALUES ({', '.join('?' * (len(ORDER_FIELDS) + 1))})", values, True),
+            self._state('purchase_orders', max(filter(None, [previous, date_to])), len(values), elapsed_ms),
+        ])
+        return len(values)
+
+    def watermarks(self):
+        """{dataset: {"watermark", "syncedAt", "rows", "elapsedMs"}}"""
+        return {
+            row['dataset']: {"watermark": row['watermark'], "syncedAt": row['synced_at'],
+                             "rows": row['rows'], "elapsedMs": row['elapsed_ms']}
+            for row in self._query('SELECT * FROM sync_state')
+        }
+
+    def products(self, prod_cd=None, class_cd=None, prod_type=None, limit=None):
+        """품목 조회 (각 조건은 코드 리스트, 비면 전체)"""
+        clauses, params = [], []
+        for column, values in (('prod_cd', prod_cd), ('class_cd', class_cd), ('prod_type', prod_type)):
+            if values:
+                clause, clause_params = _in_clause(column, values)
+                clauses.append(clause)
+                params.extend(clause_params)
+        sql = f"SELECT {', '.join(PRODUCT_FIELDS)} FROM products"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY prod_cd'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return self._query(sql, params)
+
+    def inventory(self, prod_cd=None, wh_cd=None, base_date=None):
+        """재고 조회 (base_date가 없으면 가장 최근 기준일자)"""
+        if not base_date:
+            latest = self._query('SELECT MAX(base_date) AS base_date FROM inventory')
+            base_date = latest[0]['base_date'] if latest else None
+            if not base_date:
+                return None, []
+        clauses, params = ['base_date = ?'], [base_date]
+        for column, values in (('prod_cd', prod_cd), ('wh_cd', wh_cd)):
+            if values:
+                clause, clause_params = _in_clause(column, values)
+                clauses.append(clause)
+                params.extend(clause_params)
+        rows = self._query(
+            f"SELECT prod_cd, bal_qty, wh_cd FROM inventory WHERE {' AND '.join(clauses)} ORDER BY wh_cd, prod_cd",
+            params)
+        return base_date, rows
+
+    def orders(self, date_from=None, date_to=None, cust_des=None, limit=None):
+        """발주서 조회 (발주일자 범위, 거래처명 리스트)"""
+        clauses, params = [], []
+        if date_from:
+            clauses.append('ord_date >= ?')
+            params.append(date_from)
+        if date_to:
+            clauses.append('ord_date <= ?')
+            params.append(date_to)
+        if cust_des:
+            clause, clause_params = _in_clause('cust_des', cust_des)
+            clauses.append(clause)
+            params.extend(clause_params)
+        sql = f"SELECT {', '.join(ORDER_FIELDS)} FROM purchase_orders"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY ord_date DESC, ord_no'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return self._query(sql, params)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def start_background_refresh(refresh, interval):
+    """interval초마다 refresh()를 실행하는 데몬 스레드를 시작한다. 중지용 Event를 반환
+
+    refresh에서 난 예외는 다음 주기에 다시 시도하도록 삼킨다 (stderr에 기록).
+    """
+    import sys
+
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            try:
+                refresh()
+            except Exception as e:
+                print(f"Mirror refresh failed: {e}", file=sys.stderr)
+
+    threading.Thread(target=loop, name='ecount-mirror-refresh', daemon=True).start()
+    return stop
@@ -0,0 +1,188 @@
+"""업로드 품목명 -> 품목코드 일괄 매칭 (NumPy)
+
+엑셀/CSV 생산계획의 자유 입력 품목명을 카탈로그({prodCd, prodNm})의 품목명과 비교해
+후보 품목코드를 점수 순으로 돌려준다.
+
+정규화:
+    - NFKC(전각 문자, 호환 문자 통일) 후 소문자
+    - 괄호 안 내용 제거: "(국산)", "[증정]" 등
+    - 규격 토큰 제거: 중량/용량/입수("9g", "500ml", "2kg x 3", "12입", "10개입")는 어디에 있든 지우고,
+      그 밖의 수량/포장 단위("3개", "2단", "4p", "30cm")는 품목명 뒤에 올 때만 지운다
+      ("3M 테이프", "2단 선반", "4p 세트"처럼 이름 앞에 오면 이름의 일부로 본다)
+    - 한글 음절은 자모로 분해해 비교 (받침 하나 틀린 오타도 대부분의 n-gram이 겹친다)
+
+유사도는 정규화 문자열(공백 제거)의 3-gram 집합 Jaccard 지수이다.
+카탈로그 3-gram 역색인을 만들고, 질의 묶음마다 (질의, 품목) 교집합 크기를 bincount 한 번으로 세어
+행 단위 반복 없이 점수를 계산한다. numpy는 선택 의존성이며 이 모듈을 쓸 때만 필요하다.
+"""
+import csv
+import io
+import json
+import re
+import sys
+import unicodedata
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy가 없는 환경
+    np = None
+
+DEFAULT_TOP_K = 5
+DEFAULT_THRESHOLD = 0.5      # 1순위 점수가 이 이상이면 matched
+CHUNK_CELLS = 4_000_000      # 질의 묶음 크기 = CHUNK_CELLS // 카탈로그 크기 (점수 행렬 메모리 제한)
+PAD = '\x02'
+
+_BRACKETS = re.compile(r'[(\[{（【<〈][^)\]}）】>〉]*[)\]}）】>〉]')
+_NUMBER = r'\d+(?:\.\d+)?\s*'
+_MEASURES = r'(?:(?:kg|mg|g|ml|l|ℓ|cc|oz|lb)(?![a-z])|(?:개입|매입|입)(?![가-힣]))'
+_COUNTS = (r'(?:(?:ea|pcs|pc|p|box|set|cm|mm|m)(?![a-z])'
+           r'|(?:개월|개|매|팩|봉지|봉|박스|세트|병|캔|포|정|캡슐|롤|구|장|통|묶음|단|인분)(?![가-힣]))')
+_SIZE_TOKENS = [
+    re.compile(r'(?<![\d.])' + _NUMBER + _MEASURES),                               # "9g", "500ml", "12입"
+    re.compile(r'(?<=[^\W\d_])\s*' + _NUMBER + _COUNTS),                            # 이름 뒤 "3개", "2단"
+    re.compile(r'(?<![a-z])[x×*]\s*\d+(?:\.\d+)?(?![\d.])'),                      # 남은 배수 "x 3", "*12"
+]
+_PUNCTUATION = re.compile(r'[^\w]+')
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("name matching requires numpy (pip install numpy)")
+
+
+def normalize_name(name):
+    """비교용 품목명: 괄호/규격/포장 토큰과 구두점을 뺀 소문자 문자열 (공백 유지)"""
+    text = unicodedata.normalize('NFKC', str(name or '')).lower()
+    text = _BRACKETS.sub(' ', text)
+    for pattern in _SIZE_TOKENS:
+        text = pattern.sub(' ', text)
+    text = _PUNCTUATION.sub(' ', text).replace('_', ' ')
+    return ' '.join(text.split())
+
+
+def read_names(source, column=None):
+    """업로드 품목명 리스트
+
+    Args:
+        source: 리스트, JSON 배열 문자열, "-"(stdin) 또는 파일 경로
+                (.json: 문자열 배열, .csv: column 열(없으면 첫 열, 첫 줄은 머리글), 그 외: 한 줄에 하나)
+        column: CSV 열 이름
+    """
+    if isinstance(source, list):
+        return [str(name) for name in source]
+    if source == '-':
+        text, kind = sys.stdin.read(), 'csv' if column else 'lines'
+    elif isinstance(source, str) and source.lstrip().startswith('['):
+        text, kind = source, 'json'
+    else:
+        with open(source, encoding='utf-8-sig') as f:
+            text = f.read()
+        extension = source.rsplit('.', 1)[-1].lower()
+        kind = {'json': 'json', 'csv': 'csv'}.get(extension, 'lines')
+    if kind == 'json':
+        return [str(name) for name in json.loads(text)]
+    if kind == 'csv':
+        rows = list(csv.reader(io.StringIO(text)))
+        if not rows:
+            return []
+        position = rows[0].index(column) if column else 0
+        return [row[position] for row in rows[1:] if len(row) > position and row[position].strip()]
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _jamo(text):
+    """한글 음절 -> 자모 (NFD). 그 외 문자는 그대로"""
+    return unicodedata.normalize('NFD', text)
+
+
+def name_grams(name):
+    """정규화 + 자모 분해한 문자열의 3-gram 집합 (앞뒤 경계 표시 포함)"""
+    text = _jamo(normalize_name(name).replace(' ', ''))
+    if not text:
+        return set()
+    padded = PAD + text + PAD
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameMatcher:
+    """카탈로그 3-gram 역색인
+
+    Args:
+        products: [{"prodCd", "prodNm"}, ...]
+    """
+
+    def __init__(self, products):
+        _require_numpy()
+        self.codes = [product.get('prodCd') for product in products]
+        self.names = [product.get('prodNm') or '' for product in products]
+        gram_ids = {}
+        postings = []
+        sizes = np.zeros(len(products), dtype=np.float32)
+        for doc_id, name in enumerate(self.names):
+            grams = name_grams(name)
+            sizes[doc_id] = len(grams)
+            for gram in grams:
+                gram_id = gram_ids.get(gram)
+                if gram_id is None:
+                    gram_id = gram_ids[gram] = len(postings)
+                    postings.append([])
+                postings[gram_id].append(doc_id)
+        self._gram_ids = gram_ids
+        self._postings = [np.asarray(doc_ids, dtype=np.int64) for doc_ids in postings]
+        self._sizes = sizes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def match(self, names, top_k=DEFAULT_TOP_K, threshold=DEFAULT_THRESHOLD):
+        """names 각각의 상위 top_k 후보
+
+        Returns:
+            [{"name", "normalized", "matched", "prodCd", "score", "candidates": [{"prodCd", "prodNm", "score"}]}]
+            prodCd/score는 1순위 후보 (점수가 threshold 미만이면 matched=False)
+        """
+        count = len(self.codes)
+        top_k = max(1, min(int(top_k), count)) if count else 0
+        results = []
+        chunk = max(1, CHUNK_CELLS // max(count, 1))
+        empty = np.zeros(0, dtype=np.int64)
+        for start in range(0, len(names), chunk):
+            batch = names[start:start + chunk]
+            query_sizes = np.zeros(len(batch), dtype=np.float32)
+            rows, docs = [], []
+            for row, name in enumerate(batch):
+                grams = name_grams(name)
+                query_sizes[row] = len(grams)
+                for gram in grams:
+                    gram_id = self._gram_ids.get(gram)
+                    if gram_id is not None:
+                        docs.append(self._postings[gram_id])
+                        rows.append(np.full(len(self._postings[gram_id]), row, dtype=np.int64))
+            if count:
+                flat = np.concatenate(rows) * count + np.concatenate(docs) if docs else empty
+                shared = np.bincount(flat, minlength=len(batch) * count).reshape(len(batch), count).astype(np.float32)
+                union = query_sizes[:, None] + self._sizes[None, :] - shared
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    scores = np.where(union > 0, shared / union, 0.0)
+                top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+                top_scores = np.take_along_axis(scores, top, axis=1)
+                order = np.argsort(-top_scores, axis=1, kind='stable')
+                top = np.take_along_axis(top, order, axis=1)
+                top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for row, name in enumerate(batch):
+                candidates = []
+                if count:
+                    for doc_id, score in zip(top[row].tolist(), top_scores[row].tolist()):
+                        if score > 0:
+                            candidates.append({"prodCd": self.codes[doc_id], "prodNm": self.names[doc_id],
+                                               "score": round(score, 4)})
+                best = candidates[0] if candidates else None
+                results.append({
+                    "name": name,
+                    "normalized": normalize_name(name),
+                    "matched": bool(best and best["score"] >= threshold),
+                    "prodCd": best["prodCd"] if best else None,
+                    "score": best["score"] if best else 0.0,
+                    "candidates": candidates,
+                })
+        return results
@@ -0,0 +1,64 @@
+"""NDJSON 스트리밍 출력
+
+JSON_RESULT_START/END 사이에 결과 전체를 한 번에 출력하는 대신
+행을 받는 즉시 한 줄씩 내보내고, 마지막에 건수와 성공 여부를 담은 trailer를 쓴다.
+
+    ["A00322", "크런치그래놀라(벌크)", ...]
+    ["A00323", ...]
+    {"type": "trailer", "success": true, "count": 2, ...}
+
+행은 JSON 배열(또는 객체), trailer는 "type": "trailer"인 객체이다.
+"""
+import json
+import sys
+import time
+
+
+class NdjsonWriter:
+    """행 단위 NDJSON 출력기
+
+    Args:
+        stream: 바이너리 출력 스트림 (기본값 sys.stdout.buffer)
+        flush_every: 몇 행마다 flush할지 (페이지 단위로는 flush()를 직접 호출)
+    """
+
+    def __init__(self, stream=None, flush_every=200):
+        self.stream = stream if stream is not None else sys.stdout.buffer
+        self.flush_every = flush_every
+        self.count = 0
+        self._started = time.perf_counter()
+        self._first_row_ms = None
+
+    def row(self, value):
+        if self._first_row_ms is None:
+            self._first_row_ms = round((time.perf_counter() - self._started) * 1000, 1)
+        self.stream.write(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+        self.stream.write(b'\n')
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self.stream.flush()
+
+    def rows(self, values):
+        for value in values:
+            self.row(value)
+        self.flush()
+
+    def flush(self):
+        self.stream.flush()
+
+    def trailer(self, success=True, error=None, **meta):
+        """마지막 줄(trailer) 출력 - 소비 측은 이 줄로 스트림 종료와 성공 여부를 판단한다"""
+        record = {
+            "type": "trailer",
+            "success": success,
+            "count": self.count,
+            "firstRowMs": self._first_row_ms,
+            "elapsedMs": round((time.perf_counter() - self._started) * 1000, 1),
+        }
+        if error is not None:
+            record["error"] = error
+        record.update(meta)
+        self.stream.write(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+        self.stream.write(b'\n')
+        self.flush()
+        return record
@@ -0,0 +1,188 @@
+"""ECOUNT API 호출 속도 제한 (엔드포인트별 토큰 버킷)
+
+모든 ECOUNT 호출은 요청을 보내기 전에 RateLimiter.acquire(url)로 토큰을 받는다.
+
+- 버킷은 URL 경로의 마지막 부분(엔드포인트 이름, 예: GetListInventoryBalanceStatus)마다 따로 둔다
+- 버킷 상태는 파일 잠금으로 보호되는 상태 파일에 저장하므로 여러 워커 프로세스가 같은 예산을 나눠 쓴다
+- 우선순위: interactive 요청은 토큰이 없으면 다음 토큰을 예약하고(버킷이 음수가 됨) 그만큼 기다린다.
+  background 요청은 버킷에 실제로 토큰이 있을 때만 가져가므로, 예약된 interactive 요청이 항상 먼저 나간다
+
+설정 형식 (ECOUNT_RATE_LIMITS 환경변수):
+    "default=5/5,OAPILogin=1/1,GetBasicProductsList=1/2"   # 이름=초당 토큰 수/버킷 크기
+"""
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from .locking import file_lock
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+DEFAULT_RATE_LIMITS = {
+    'default': (5.0, 5.0),      # (초당 토큰 수, 버킷 크기)
+    'Zone': (1.0, 1.0),
+    'OAPILogin': (1.0, 1.0),
+}
+
+_priority = contextvars.ContextVar('ecount_rate_priority', default=INTERACTIVE)
+
+
+@contextmanager
+def priority(value):
+    """with 블록 안(같은 컨텍스트)에서 나가는 ECOUNT 호출의 우선순위를 지정"""
+    if value not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {value}")
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+def parse_rate_limits(text):
+    """"name=rate/burst,..." 형식 문자열 -> {name: (rate, burst)}"""
+    limits = {}
+    for part in (text or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, spec = part.partition('=')
+        rate, _, burst = spec.partition('/')
+        rate = float(rate)
+        limits[name.strip()] = (rate, float(burst) if burst else max(1.0, rate))
+    return limits
+
+
+def endpoint_name(url):
+    """URL -> 버킷 이름 (경로의 마지막 부분)"""
+    return urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1] or 'default'
+
+
+def default_state_path(com_code, user_id, use_test=True):
+    """버킷 상태 파일 기본 경로 (세션 캐시와 같은 디렉토리, API 키 단위로 공유)"""
+    directory = os.environ.get('ECOUNT_SESSION_CACHE_DIR') or tempfile.gettempdir()
+    mode = 'test' if use_test else 'prod'
+    return os.path.join(directory, f'ecount_ratelimit_{com_code}_{user_id}_{mode}.json')
+
+
+class RateLimiter:
+    """엔드포인트별 토큰 버킷 (스레드/프로세스 간 공유)
+
+    Args:
+        state_path: 버킷 상태 파일 경로 (같은 파일을 쓰는 프로세스끼리 예산을 공유)
+        limits: {엔드포인트 이름: (초당 토큰 수, 버킷 크기)}, 'default'는 나머지 엔드포인트에 적용.
+                기본값은 DEFAULT_RATE_LIMITS에 ECOUNT_RATE_LIMITS 환경변수를 덮어쓴 것
+    """
+
+    def __init__(self, state_path, limits=None):
+        if limits is None:
+            limits = dict(DEFAULT_RATE_LIMITS)
+            limits.update(parse_rate_limits(os.environ.get('ECOUNT_RATE_LIMITS')))
+        self.limits = limits
+        self.state_path = state_path
+        self.lock_path = state_path + '.lock'
+        self._thread_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+
+    def _limit(self, endpoint):
+        return self.limits.get(endpoint) or self.limits.get('default') or DEFAULT_RATE_LIMITS['default']
+
+    def _read_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_state(self, state):
+        # 잠금을 잡은 상태에서만 쓰므로 제자리 덮어쓰기로 충분하다
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, separators=(',', ':'))
+
+    def _reserve(self, endpoint, priority_value):
+        """토큰 하나를 가져간다. (기다릴 시간, 확정 여부)를 반환
+
+        확정이면 기다릴 시간만큼 잔 뒤 요청을 보내면 되고,
+        확정이 아니면(background이고 토큰이 없음) 기다린 뒤 다시 시도해야 한다.
+        """
+        rate, burst = self._limit(endpoint)
+        with self._thread_lock, file_lock(self.lock_path):
+            state = self._read_state()
+            now = time.time()
+            bucket = state.get(endpoint) or {"tokens": burst, "updated": now}
+            tokens = min(burst, bucket["tokens"] + max(0.0, now - bucket["updated"]) * rate)
+            if priority_value == INTERACTIVE:
+                tokens -= 1
+                wait, granted = max(0.0, -tokens) / rate, True
+            elif tokens >= 1:
+                tokens -= 1
+                wait, granted = 0.0, True
+            else:
+                wait, granted = (1 - tokens) / rate, False
+            state[endpoint] = {"tokens": tokens, "updated": now}
+            self._write_state(state)
+        return wait, granted
+
+    def acquire(self, url_or_endpoint, priority_value=None):
+        """요청 하나를 보낼 수 있을 때까지 기다린다.
+
+        Args:
+            url_or_endpoint: 요청 URL 또는 엔드포인트 이름
+            priority_value: INTERACTIVE/BACKGROUND, 생략하면 priority() 컨텍스트 값
+
+        Returns:
+            기다린 시간(초)
+        """
+        endpoint = endpoint_name(url_or_endpoint) if '/' in url_or_endpoint else url_or_endpoint
+        priority_value = priority_value or current_priority()
+        started = time.perf_counter()
+        while True:
+            wait, granted = self._reserve(endpoint, priority_value)
+            if wait > 0:
+                time.sleep(wait)
+            if granted:
+                break
+        waited = time.perf_counter() - started
+        self._record(endpoint, priority_value, waited)
+        return waited
+
+    def _record(self, endpoint, priority_value, waited):
+        with self._stats_lock:
+            entry = self._stats.setdefault(endpoint, {})
+            stats = entry.setdefault(priority_value, {"acquired": 0, "waited": 0, "waitMs": 0.0, "maxWaitMs": 0.0})
+            stats["acquired"] += 1
+            waited_ms = waited * 1000
+            if waited_ms >= 1:
+                stats["waited"] += 1
+            stats["waitMs"] += waited_ms
+            stats["maxWaitMs"] = max(stats["maxWaitMs"], waited_ms)
+
+    def stats(self):
+        """이 프로세스에서 엔드포인트/우선순위별로 토큰을 기다린 횟수와 시간(ms)"""
+        with self._stats_lock:
+            endpoints = {
+                endpoint: {
+                    priority_value: {**values, "waitMs": round(values["waitMs"], 1), "maxWaitMs": round(values["maxWaitMs"], 1)}
+                    for priority_value, values in entry.items()
+                }
+                for endpoint, entry in self._stats.items()
+            }
+        total_wait = sum(values["waitMs"] for entry in endpoints.values() for values in entry.values())
+        return {
+            "limits": {name: {"rate": rate, "burst": burst} for name, (rate, burst) in self.limits.items()},
+            "endpoints": endpoints,
+            "totalWaitMs": round(total_wait, 1),
+        }
@@ -0,0 +1,199 @@
+"""ECOUNT 조회 응답 디스크 캐시 (SQLite)
+
+키는 (네임스페이스, 호스트+경로, 정규화된 요청 본문)이다. SESSION_ID는 URL 쿼리에 있으므로
+키에 들어가지 않아 재로그인 후에도 캐시가 유지된다.
+
+- 엔드포인트별 TTL (ttls에 없는 엔드포인트는 캐시하지 않음 - Zone, 로그인, 저장 API 등)
+- BASE_DATE가 오늘 이전인 조회는 결과가 바뀌지 않으므로 만료 없이 보관
+- 항목 수가 max_entries를 넘으면 가장 오래 쓰이지 않은 것부터 삭제 (LRU)
+- track()으로 감싼 구간의 적중/실패 횟수를 따로 센다 (JSON 결과의 "cache" 값)
+
+여러 프로세스가 같은 파일을 함께 쓴다 (WAL 모드).
+"""
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_ENTRIES = 2000
+
+# 엔드포인트별 TTL(초)
+# GetBasicProductsList는 스트리밍으로 디코딩하므로 캐시하지 않는다 (재사용은 ecount.catalog_view)
+DEFAULT_TTLS = {
+    'GetListInventoryBalanceStatus': 5 * 60,
+    'GetListInventoryBalanceStatusByLocation': 5 * 60,
+    'GetPurchasesOrderList': 2 * 60,
+}
+
+# 이 필드 값이 오늘 이전 날짜(YYYYMMDD)이면 만료 없이 보관
+IMMUTABLE_DATE_FIELDS = ('BASE_DATE',)
+
+_tracking = contextvars.ContextVar('ecount_cache_tracking', default=())
+
+
+def parse_ttls(text):
+    """"name=seconds,..." 형식 문자열 -> {name: seconds}"""
+    ttls = {}
+    for part in (text or '').split(','):
+        name, _, seconds = part.strip().partition('=')
+        if name and seconds:
+            ttls[name.strip()] = float(seconds)
+    return ttls
+
+
+def normalize_params(payload):
+    """요청 본문 정규화: 키 정렬, 문자열 앞뒤 공백 제거, None은 빈 문자열"""
+    def clean(value):
+        if value is None:
+            return ''
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, dict):
+            return {key: clean(value[key]) for key in sorted(value)}
+        if isinstance(value, (list, tuple)):
+            return [clean(item) for item in value]
+        return value
+    return json.dumps(clean(payload or {}), ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def is_immutable(payload, today=None):
+    """과거 기준일 조회인지 (결과가 다시 바뀌지 않는 요청)"""
+    today = today or datetime.now().strftime('%Y%m%d')
+    for field in IMMUTABLE_DATE_FIELDS:
+        value = str((payload or {}).get(field) or '').strip()
+        if len(value) == 8 and value.isdigit() and value < today:
+            return True
+    return False
+
+
+class ResponseCache:
+    """엔드포인트/요청 본문 단위 응답 캐시
+
+    Args:
+        path: SQLite 파일 경로
+        namespace: 키 앞에 붙는 구분값 (회사코드 등, 같은 호스트를 쓰는 다른 계정과 섞이지 않게)
+        ttls: {엔드포인트 이름: TTL(초)}, 기본값은 DEFAULT_TTLS에 ECOUNT_CACHE_TTLS 환경변수를 덮어쓴 것
+        max_entries: 최대 항목 수 (초과 시 LRU 삭제)
+    """
+
+    def __init__(self, path, namespace='', ttls=None, max_entries=DEFAULT_MAX_ENTRIES):
+        if ttls is None:
+            ttls = dict(DEFAULT_TTLS)
+            ttls.update(parse_ttls(os.environ.get('ECOUNT_CACHE_TTLS')))
+        self.path = path
+        self.namespace = str(namespace)
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, params TEXT NOT NULL, body TEXT NOT NULL,'
+            ' created_at REAL NOT NULL, expires_at REAL, last_access REAL NOT NULL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_endpoint ON responses(endpoint)')
+
+    @staticmethod
+    def endpoint_name(url):
+        return urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1]
+
+    def is_cacheable(self, url):
+        return self.endpoint_name(url) in self.ttls
+
+    def _key(self, url, params):
+        parts = urlsplit(url)
+        raw = f"{self.namespace}\x1f{parts.netloc}{parts.path}\x1f{params}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+            for counters in _tracking.get():
+                if name in counters:
+                    counters[name] += 1
+
+    def get(self, url, payload):
+        """캐시된 응답 본문(text), 없거나 만료되었으면 None"""
+        key = self._key(url, normalize_params(payload))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT body, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and (row[1] is None or row[1] > now):
+                self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            else:
+                row = None
+        self._count("hits" if row is not None else "misses")
+        return row[0] if row is not None else None
+
+    def put(self, url, payload, body):
+        """응답 본문 저장 (정상 응답만 넘길 것)"""
+        endpoint = self.endpoint_name(url)
+        ttl = self.ttls.get(endpoint)
+        if ttl is None:
+            return
+        params = normalize_params(payload)
+        now = time.time()
+        expires_at = None if is_immutable(payload) else now + ttl
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, endpoint, params, body, created_at, expires_at, last_access)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (self._key(url, params), endpoint, params, body, now, expires_at, now))
+            evicted = self._evict()
+        self._count("stores")
+        for _ in range(evicted):
+            self._count("evictions")
+
+    def _evict(self):
+        # 만료된 항목을 먼저 지우고, 그래도 많으면 오래 쓰이지 않은 것부터
+        cursor = self._conn.execute('DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),))
+        evicted = max(0, cursor.rowcount)
+        count = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        if count > self.max_entries:
+            cursor = self._conn.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access LIMIT ?)',
+                (count - self.max_entries,))
+            evicted += max(0, cursor.rowcount)
+        return evicted
+
+    def invalidate(self, endpoint=None):
+        """캐시 삭제 (endpoint를 주면 그 엔드포인트만). 삭제한 항목 수를 반환"""
+        with self._lock:
+            if endpoint:
+                cursor = self._conn.execute('DELETE FROM responses WHERE endpoint = ?', (endpoint,))
+            else:
+                cursor = self._conn.execute('DELETE FROM responses')
+            return max(0, cursor.rowcount)
+
+    @contextmanager
+    def track(self):
+        """with 블록 안(같은 컨텍스트와 복사된 컨텍스트)의 적중/실패 횟수를 dict로 모은다"""
+        counters = {"hits": 0, "misses": 0}
+        token = _tracking.set(_tracking.get() + (counters,))
+        try:
+            yield counters
+        finally:
+            _tracking.reset(token)
+
+    def stats(self):
+        with self._lock:
+            result = dict(self._counters)
+            rows = self._conn.execute(
+                'SELECT endpoint, COUNT(*), SUM(expires_at IS NULL) FROM responses GROUP BY endpoint').fetchall()
+        result["entries"] = {endpoint: {"count": count, "immutable": immutable or 0} for endpoint, count, immutable in rows}
+        result["ttls"] = dict(self.ttls)
+        result["maxEntries"] = self.max_entries
+        return result
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
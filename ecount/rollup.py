@@ -0,0 +1,170 @@
+"""발주서 스트리밍 집계
+
+발주서 행(_order_row 10개 필드)을 페이지 단위로 받아 그룹별 합계만 누적한다.
+행은 저장하지 않으므로 메모리는 그룹 수(거래처 수, 품목 수, 기간 수)에 비례한다.
+
+차원 (by):
+    customer: 거래처명 (CUST_DES)
+    product: 품목명 (PROD_DES)
+    day / week / month: 발주일자 기준 일(YYYYMMDD) / ISO 주(YYYY-Www) / 월(YYYY-MM)
+    "customer+month"처럼 +로 묶으면 조합별로 집계한다.
+
+그룹별 값: lines(행 수), orders(발주서 수), qty, buyAmt, vatAmt, totalAmt,
+           nextDue(오늘 이후 가장 가까운 납기일자), dueSoon(오늘부터 due_days일 안에 납기인 행 수)
+
+발주서 수는 한 발주서의 품목 행이 연달아 온다는 가정으로 그룹별 직전 ORD_NO와 비교해 센다.
+"""
+import heapq
+from datetime import date, datetime, timedelta
+
+ORD_NO, ORD_DATE, CUST_DES, PROD_DES, QTY, BUY_AMT, VAT_AMT, TTL_CTT, TIME_DATE, EDMS_APP_TYPE = range(10)
+
+DIMENSIONS = ('customer', 'product', 'day', 'week', 'month')
+DEFAULT_DUE_DAYS = 7
+DEFAULT_UPCOMING = 20
+
+
+def _number(value):
+    """"1,234.5" 같은 문자열/숫자 -> float (변환 불가는 0)"""
+    if value is None or value == '':
+        return 0.0
+    try:
+        return float(str(value).replace(',', ''))
+    except ValueError:
+        return 0.0
+
+
+def _digits(value):
+    """"2024-01-05", "2024/01/05" 등 -> "20240105" (8자리가 아니면 None)"""
+    digits = ''.join(ch for ch in str(value or '') if ch.isdigit())[:8]
+    return digits if len(digits) == 8 else None
+
+
+def _dimension_key(dimension, row, ord_date):
+    if dimension == 'customer':
+        return row[CUST_DES] or ''
+    if dimension == 'product':
+        return row[PROD_DES] or ''
+    if ord_date is None:
+        return ''
+    if dimension == 'day':
+        return ord_date
+    if dimension == 'month':
+        return f"{ord_date[:4]}-{ord_date[4:6]}"
+    year, week, _ = date(int(ord_date[:4]), int(ord_date[4:6]), int(ord_date[6:])).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def parse_dimensions(by):
+    """"customer,month,customer+month" 또는 리스트 -> [("customer",), ("month",), ("customer", "month")]"""
+    if isinstance(by, str):
+        by = by.split(',')
+    specs = []
+    for spec in by:
+        parts = tuple(part.strip() for part in str(spec).split('+') if part.strip())
+        if not parts:
+            continue
+        unknown = [part for part in parts if part not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown rollup dimension: {', '.join(unknown)} (use {', '.join(DIMENSIONS)})")
+        if parts not in specs:
+            specs.append(parts)
+    return specs
+
+
+class OrderRollup:
+    """발주서 행 스트림 집계기
+
+    Args:
+        by: 차원 목록 (parse_dimensions 참고)
+        today: 납기 계산 기준일 (YYYYMMDD, 기본 오늘)
+        due_days: dueSoon으로 셀 기간(일)
+        upcoming: 납기가 가장 가까운 행을 몇 개까지 보관할지
+    """
+
+    def __init__(self, by=('customer', 'product', 'day'), today=None, due_days=DEFAULT_DUE_DAYS,
+                 upcoming=DEFAULT_UPCOMING):
+        self.specs = parse_dimensions(by)
+        self.today = today or datetime.now().strftime("%Y%m%d")
+        self.due_until = (datetime.strptime(self.today, "%Y%m%d") + timedelta(days=int(due_days))).strftime("%Y%m%d")
+        self.upcoming_limit = int(upcoming)
+        self._groups = {spec: {} for spec in self.specs}
+        self._totals = self._new_group()
+        self._upcoming = []   # (-납기일자 정수, 순번, 항목) 최대 힙 - 가장 먼 납기부터 밀려남
+        self._sequence = 0
+
+    @staticmethod
+    def _new_group():
+        return {"lines": 0, "orders": 0, "qty": 0.0, "buyAmt": 0.0, "vatAmt": 0.0,
+                "nextDue": None, "dueSoon": 0, "_last": None}
+
+    def _accumulate(self, group, row, qty, buy_amt, vat_amt, due):
+        group["lines"] += 1
+        if row[ORD_NO] != group["_last"] or not row[ORD_NO]:
+            group["orders"] += 1
+            group["_last"] = row[ORD_NO]
+        group["qty"] += qty
+        group["buyAmt"] += buy_amt
+        group["vatAmt"] += vat_amt
+        if due is not None and due >= self.today:
+            if group["nextDue"] is None or due < group["nextDue"]:
+                group["nextDue"] = due
+            if due <= self.due_until:
+                group["dueSoon"] += 1
+
+    def add(self, rows):
+        """발주서 행 묶음(한 페이지)을 누적"""
+        for row in rows:
+            ord_date = _digits(row[ORD_DATE])
+            due = _digits(row[TIME_DATE])
+            qty, buy_amt, vat_amt = _number(row[QTY]), _number(row[BUY_AMT]), _number(row[VAT_AMT])
+            self._accumulate(self._totals, row, qty, buy_amt, vat_amt, due)
+            for spec in self.specs:
+                key = tuple(_dimension_key(dimension, row, ord_date) for dimension in spec)
+                groups = self._groups[spec]
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = self._new_group()
+                self._accumulate(group, row, qty, buy_amt, vat_amt, due)
+            if due is not None and due >= self.today and self.upcoming_limit > 0:
+                self._sequence += 1
+                entry = (-int(due), self._sequence, {
+                    "dueDate": due, "ordNo": row[ORD_NO], "ordDate": ord_date, "custDes": row[CUST_DES],
+                    "prodDes": row[PROD_DES], "qty": qty, "status": row[EDMS_APP_TYPE],
+                })
+                if len(self._upcoming) < self.upcoming_limit:
+                    heapq.heappush(self._upcoming, entry)
+                elif entry[0] > self._upcoming[0][0]:
+                    heapq.heapreplace(self._upcoming, entry)
+
+    @staticmethod
+    def _public(group):
+        result = {name: value for name, value in group.items() if name != "_last"}
+        for name in ("qty", "buyAmt", "vatAmt"):
+            result[name] = round(result[name], 4)
+        result["totalAmt"] = round(group["buyAmt"] + group["vatAmt"], 4)
+        return result
+
+    def group_count(self):
+        return sum(len(groups) for groups in self._groups.values())
+
+    def result(self, limit=None):
+        """{"totals", "rollups": {"customer": [...], "customer+month": [...]}, "upcoming": [...]}
+
+        기간 차원만으로 된 집계는 기간 순, 그 외는 totalAmt 내림차순. limit은 차원별 최대 그룹 수.
+        """
+        rollups = {}
+        for spec, groups in self._groups.items():
+            time_only = all(dimension in ('day', 'week', 'month') for dimension in spec)
+            if time_only:
+                keys = sorted(groups)
+            else:
+                keys = sorted(groups, key=lambda key: (-(groups[key]["buyAmt"] + groups[key]["vatAmt"]), key))
+            if limit:
+                keys = keys[:int(limit)]
+            rollups['+'.join(spec)] = [
+                {"key": key[0] if len(key) == 1 else list(key), **self._public(groups[key])} for key in keys
+            ]
+        upcoming = [entry[2] for entry in sorted(self._upcoming, key=lambda entry: (-entry[0], entry[1]))]
+        return {"totals": self._public(self._totals), "rollups": rollups, "upcoming": upcoming,
+                "today": self.today, "dueUntil": self.due_until}
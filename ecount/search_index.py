@@ -0,0 +1,258 @@
+"""품목 검색 인덱스 (한글 초성 검색 지원)
+
+get_materials_management의 카탈로그({prodCd, prodNm})로 미리 만들어 두는 검색 인덱스.
+
+- prodCd 접두어: 정렬된 코드 배열 + 이분 탐색 (배열 형태로 펼친 트라이와 같은 역할)
+- prodNm 부분 문자열: 정규화된 품목명의 문자 1-gram/2-gram 역색인
+- 초성 검색: 한글 음절을 초성으로 바꾼 문자열("허브큐어" -> "ㅎㅂㅋㅇ")의 1-gram/2-gram 역색인
+
+문서 번호는 (정규화된 품목명 길이, 코드) 순으로 매기므로 게시 목록을 앞에서부터 읽는 순서가
+곧 같은 순위 안의 정렬 순서이다. 질의의 n-gram 중 게시 목록이 가장 짧은 것을 앞에서부터 읽으며
+부분 문자열 검사로 확정하고, 결과가 limit개 모이면 바로 멈추므로 카탈로그 크기와 거의 무관하게 빠르다.
+인덱스는 zlib으로 압축한 JSON(게시 목록은 차분 인코딩)으로 저장한다.
+"""
+import json
+import os
+import tempfile
+import unicodedata
+import zlib
+from bisect import bisect_left
+
+INDEX_FORMAT_VERSION = 1
+
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+CHOSEONG_SET = frozenset(CHOSEONG)
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+JUNGSEONG_JONGSEONG = 21 * 28
+
+# 순위 (작을수록 우선)
+RANK_CODE_EXACT = 0
+RANK_CODE_PREFIX = 1
+RANK_NAME_PREFIX = 2
+RANK_CHOSEONG_PREFIX = 3
+RANK_NAME_CONTAINS = 4
+RANK_CHOSEONG_CONTAINS = 5
+
+
+def normalize(text):
+    """검색용 정규화: NFC, 소문자, 공백 제거
+
+    NFKC는 호환용 자모(ㄱ, ㅎ 등)를 첫가끝 자모로 바꿔 초성 질의를 깨뜨리므로 NFC를 쓴다.
+    """
+    return ''.join(unicodedata.normalize('NFC', text or '').lower().split())
+
+
+def to_choseong(text):
+    """한글 음절을 초성으로 바꾼다 (그 외 문자는 그대로). 입력은 normalize된 문자열."""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            chars.append(CHOSEONG[(code - HANGUL_BASE) // JUNGSEONG_JONGSEONG])
+        else:
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def is_choseong_query(text):
+    """질의가 초성(ㄱ~ㅎ)으로만 이루어졌는지"""
+    return bool(text) and all(ch in CHOSEONG_SET for ch in text)
+
+
+PREFIX_MARK = '\x00'   # 접두어 n-gram 표시 (예: "\x00허브"는 "허브"로 시작하는 품목)
+
+
+def _grams(text):
+    """1-gram, 2-gram과 접두어 1-gram/2-gram 집합"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    if text:
+        grams.add(PREFIX_MARK + text[:1])
+        grams.add(PREFIX_MARK + text[:2])
+    return grams
+
+
+def _build_postings(texts):
+    postings = {}
+    for doc_id, text in enumerate(texts):
+        for gram in _grams(text):
+            postings.setdefault(gram, []).append(doc_id)
+    return postings
+
+
+def _encode_postings(postings):
+    encoded = {}
+    for gram, doc_ids in postings.items():
+        previous = 0
+        deltas = []
+        for doc_id in doc_ids:
+            deltas.append(doc_id - previous)
+            previous = doc_id
+        encoded[gram] = deltas
+    return encoded
+
+
+def _decode_postings(encoded):
+    postings = {}
+    for gram, deltas in encoded.items():
+        doc_id = 0
+        doc_ids = []
+        for delta in deltas:
+            doc_id += delta
+            doc_ids.append(doc_id)
+        postings[gram] = doc_ids
+    return postings
+
+
+class ProductSearchIndex:
+    """품목코드/품목명/초성 검색 인덱스"""
+
+    def __init__(self, codes, names, name_postings=None, choseong_postings=None):
+        # codes/names는 build()가 정한 문서 순서((품목명 길이, 코드) 순)를 그대로 따라야 한다
+        self.codes = list(codes)
+        self.names = list(names)
+        self._norm_names = [normalize(name) for name in self.names]
+        self._choseong_names = [to_choseong(name) for name in self._norm_names]
+        self._name_postings = name_postings if name_postings is not None else _build_postings(self._norm_names)
+        self._choseong_postings = choseong_postings if choseong_postings is not None else \
+            _build_postings(self._choseong_names)
+        # 코드 접두어 검색용 정렬 배열
+        order = sorted(range(len(self.codes)), key=lambda i: self.codes[i].lower())
+        self._sorted_codes = [self.codes[i].lower() for i in order]
+        self._sorted_code_ids = order
+
+    @classmethod
+    def build(cls, products):
+        """[{prodCd, prodNm}, ...]로 인덱스를 만든다 (prodCd 중복은 처음 것만)"""
+        entries = {}
+        for product in products:
+            prod_cd = product.get('prodCd')
+            if prod_cd and prod_cd not in entries:
+                entries[prod_cd] = product.get('prodNm') or ''
+        ordered = sorted(entries.items(), key=lambda item: (len(normalize(item[1])), item[0].lower()))
+        return cls([code for code, _ in ordered], [name for _, name in ordered])
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _code_prefix(self, query, limit):
+        """코드가 query로 시작하는 문서를 코드 순으로 최대 limit개 (코드 일치가 있으면 항상 맨 앞)"""
+        start = bisect_left(self._sorted_codes, query)
+        matches = []
+        for position in range(start, min(start + limit, len(self._sorted_codes))):
+            if not self._sorted_codes[position].startswith(query):
+                break
+            matches.append(self._sorted_code_ids[position])
+        return matches
+
+    @staticmethod
+    def _scan(postings, texts, query, prefix, limit, seen):
+        """query를 접두어(prefix=True) 또는 부분 문자열로 가진 문서를 문서 순서대로 최대 limit개 찾는다."""
+        if prefix:
+            doc_ids = postings.get(PREFIX_MARK + query[:2], [])
+            verify = len(query) > 2
+        elif len(query) == 1:
+            doc_ids = postings.get(query, [])
+            verify = False
+        else:
+            doc_ids = None
+            for i in range(len(query) - 1):
+                candidates = postings.get(query[i:i + 2])
+                if not candidates:
+                    return []
+                if doc_ids is None or len(candidates) < len(doc_ids):
+                    doc_ids = candidates
+            verify = len(query) > 2
+
+        found = []
+        for doc_id in doc_ids:
+            if doc_id in seen:
+                continue
+            text = texts[doc_id]
+            if verify and not (text.startswith(query) if prefix else query in text):
+                continue
+            seen.add(doc_id)
+            found.append(doc_id)
+            if len(found) >= limit:
+                break
+        return found
+
+    def search(self, query, limit=15):
+        """순위가 매겨진 검색 결과
+
+        순위: 코드 일치 > 코드 접두어 > 품목명 접두어 > 초성 접두어 > 품목명 포함 > 초성 포함,
+        같은 순위에서는 코드 접두어는 코드 순, 나머지는 품목명이 짧은 것, 코드 순.
+
+        Returns:
+            [{"prodCd", "prodNm", "rank"}, ...]
+        """
+        norm_query = normalize(query)
+        if not norm_query or limit <= 0:
+            return []
+
+        results = []
+        seen = set()
+
+        for doc_id in self._code_prefix(norm_query, limit):
+            seen.add(doc_id)
+            rank = RANK_CODE_EXACT if self.codes[doc_id].lower() == norm_query else RANK_CODE_PREFIX
+            results.append((doc_id, rank))
+
+        choseong = is_choseong_query(norm_query)
+        phases = [
+            (self._name_postings, self._norm_names, True, RANK_NAME_PREFIX),
+            (self._choseong_postings, self._choseong_names, True, RANK_CHOSEONG_PREFIX) if choseong else None,
+            (self._name_postings, self._norm_names, False, RANK_NAME_CONTAINS),
+            (self._choseong_postings, self._choseong_names, False, RANK_CHOSEONG_CONTAINS) if choseong else None,
+        ]
+        for phase in phases:
+            if phase is None or len(results) >= limit:
+                continue
+            postings, texts, prefix, rank = phase
+            for doc_id in self._scan(postings, texts, norm_query, prefix, limit - len(results), seen):
+                results.append((doc_id, rank))
+
+        return [
+            {"prodCd": self.codes[doc_id], "prodNm": self.names[doc_id], "rank": rank}
+            for doc_id, rank in results
+        ]
+
+    def to_bytes(self):
+        payload = {
+            "format": INDEX_FORMAT_VERSION,
+            "codes": self.codes,
+            "names": self.names,
+            "namePostings": _encode_postings(self._name_postings),
+            "choseongPostings": _encode_postings(self._choseong_postings),
+        }
+        return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 6)
+
+    @classmethod
+    def from_bytes(cls, data):
+        payload = json.loads(zlib.decompress(data).decode('utf-8'))
+        if payload.get("format") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported search index format: {payload.get('format')}")
+        return cls(
+            payload["codes"],
+            payload["names"],
+            _decode_postings(payload["namePostings"]),
+            _decode_postings(payload["choseongPostings"]),
+        )
+
+    def save(self, path):
+        directory = os.path.dirname(path) or '.'
+        fd, tmp_path = tempfile.mkstemp(prefix='.products_search_', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.to_bytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
@@ -0,0 +1,212 @@
+"""ECOUNT 세션(ZONE, SESSION_ID) 디스크 캐시
+
+Zone 조회와 로그인 결과를 파일에 저장해 두고 여러 Python 프로세스가 함께 사용한다.
+세션이 만료되었거나 ECOUNT가 세션을 거부한 경우에만 다시 로그인한다.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+from .locking import file_lock
+
+DEFAULT_SESSION_TTL = 20 * 60   # 초, ECOUNT 세션 만료 시간보다 짧게 잡는다
+
+# 세션 만료/미로그인 응답을 구분하기 위한 오류 코드·메시지 키워드
+SESSION_ERROR_MARKERS = ('SESSION', '세션', 'LOGIN', '로그인')
+
+
+class SessionExpiredError(RuntimeError):
+    """ECOUNT가 SESSION_ID를 거부했을 때 발생"""
+
+
+class ApiStatusError(RuntimeError):
+    """ECOUNT가 세션 외의 이유로 오류 Status를 돌려줬을 때 발생 (결과가 비어 있다고 보면 안 되는 호출용)"""
+
+
+def is_session_error(contents):
+    """API 응답이 세션 만료/무효로 인한 실패인지 판단"""
+    if not isinstance(contents, dict) or contents.get('Status') == '200':
+        return False
+    error = contents.get('Error') or {}
+    text = f"{error.get('Code') or ''} {error.get('Message') or ''}".upper()
+    return any(marker in text for marker in SESSION_ERROR_MARKERS)
+
+
+def check_session(contents):
+    """세션 오류 응답이면 SessionExpiredError를 발생시킨다"""
+    if is_session_error(contents):
+        error = contents.get('Error') or {}
+        raise SessionExpiredError(
+            f"Session rejected: Status={contents.get('Status')}, Code={error.get('Code')}, Message={error.get('Message')}")
+
+
+def check_status(contents, api_name):
+    """Status가 200이 아니면 ApiStatusError를 발생시킨다 (세션 오류는 check_session이 먼저 걸러야 한다)"""
+    if not isinstance(contents, dict) or contents.get('Status') != '200':
+        contents = contents if isinstance(contents, dict) else {}
+        error = contents.get('Error') or {}
+        raise ApiStatusError(
+            f"{api_name} API error: Status={contents.get('Status')}, Code={error.get('Code')}, "
+            f"Message={error.get('Message')}")
+
+
+def default_cache_path(com_code, user_id, use_test=True):
+    """세션 캐시 파일 기본 경로 (ECOUNT_SESSION_CACHE_DIR 환경변수로 디렉토리 변경 가능)"""
+    directory = os.environ.get('ECOUNT_SESSION_CACHE_DIR') or tempfile.gettempdir()
+    mode = 'test' if use_test else 'prod'
+    return os.path.join(directory, f'ecount_session_{com_code}_{user_id}_{mode}.json')
+
+
+class SessionManager:
+    """회사코드/사용자별 ECOUNT 세션을 디스크에 캐시하고 재사용한다.
+
+    Args:
+        com_code, user_id, api_cert_key: 로그인 정보
+        default_zone: Zone API 실패 시 사용할 Zone
+        zone_lookup: get_zone_info(com_code, use_test=...) 형태의 함수
+        login: api_login_oapilogin(com_code, user_id, key, zone, use_test=...) 형태의 함수
+        use_test: True면 sboapi(테스트) 사용
+        ttl: 세션 유효 시간(초), 기본값은 ECOUNT_SESSION_TTL 환경변수 또는 DEFAULT_SESSION_TTL
+        cache_path: 캐시 파일 경로
+    """
+
+    def __init__(self, com_code, user_id, api_cert_key, default_zone, zone_lookup, login,
+                 use_test=True, ttl=None, cache_path=None):
+        self.com_code = com_code
+        self.user_id = user_id
+        self.api_cert_key = api_cert_key
+        self.default_zone = default_zone
+        self.zone_lookup = zone_lookup
+        self.login = login
+        self.use_test = use_test
+        if ttl is None:
+            ttl = float(os.environ.get('ECOUNT_SESSION_TTL') or DEFAULT_SESSION_TTL)
+        self.ttl = ttl
+        self.cache_path = cache_path or default_cache_path(com_code, user_id, use_test)
+        self.lock_path = self.cache_path + '.lock'
+        self._entry = None   # 프로세스 내 캐시 (파일 재조회 생략용)
+        self._zone = None    # 세션을 폐기해도 Zone은 재사용
+        self._thread_lock = threading.Lock()   # 워커 스레드들이 동시에 로그인하지 않도록
+
+    def _is_valid(self, entry):
+        return (
+            isinstance(entry, dict)
+            and entry.get('SESSION_ID')
+            and entry.get('ZONE')
+            and str(entry.get('COM_CODE')) == str(self.com_code)
+            and entry.get('USER_ID') == self.user_id
+            and entry.get('USE_TEST') == self.use_test
+            and entry.get('EXPIRES_AT', 0) > time.time()
+        )
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, entry):
+        directory = os.path.dirname(self.cache_path) or '.'
+        fd, tmp_path = tempfile.mkstemp(prefix='.ecount_session_', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _remove_cache(self):
+        try:
+            os.remove(self.cache_path)
+        except FileNotFoundError:
+            pass
+
+    def get(self, force_login=False):
+        """유효한 (session_id, zone)을 반환한다. 필요할 때만 로그인한다."""
+        if not force_login and self._is_valid(self._entry):
+            return self._entry['SESSION_ID'], self._entry['ZONE']
+
+        with self._thread_lock, file_lock(self.lock_path):
+            # 잠금 대기 중 다른 프로세스가 로그인했을 수 있으므로 다시 확인
+            entry = self._read_cache()
+            if not force_login and self._is_valid(entry):
+                self._entry = entry
+                self._zone = entry['ZONE']
+                print(f"Session cache hit. SESSION_ID prefix: {entry['SESSION_ID'][:8]}...")
+                return entry['SESSION_ID'], entry['ZONE']
+
+            # Zone은 거의 바뀌지 않으므로 이전 캐시의 값을 재사용한다
+            zone_value = (entry.get('ZONE') if isinstance(entry, dict) else None) or self._zone
+            if not zone_value:
+                zone_info = self.zone_lookup(self.com_code, use_test=self.use_test)
+                zone_value = zone_info.get('ZONE') if zone_info.get('ZONE') else self.default_zone
+
+            session_id = self.login(self.com_code, self.user_id, self.api_cert_key, zone_value, use_test=self.use_test)
+            now = time.time()
+            entry = {
+                'COM_CODE': self.com_code,
+                'USER_ID': self.user_id,
+                'USE_TEST': self.use_test,
+                'ZONE': zone_value,
+                'SESSION_ID': session_id,
+                'LOGGED_IN_AT': now,
+                'EXPIRES_AT': now + self.ttl,
+            }
+            self._write_cache(entry)
+            self._entry = entry
+            self._zone = zone_value
+        return session_id, zone_value
+
+    def invalidate(self, session_id=None):
+        """캐시된 세션을 폐기한다.
+
+        session_id가 주어지면 캐시가 아직 그 세션일 때만 지운다
+        (다른 프로세스가 이미 새로 로그인한 세션을 지우지 않기 위함).
+        """
+        if session_id is None or (self._entry and self._entry.get('SESSION_ID') == session_id):
+            self._entry = None
+        with file_lock(self.lock_path):
+            entry = self._read_cache()
+            if session_id is None or (isinstance(entry, dict) and entry.get('SESSION_ID') == session_id):
+                self._remove_cache()
+
+    def call(self, func, *args, **kwargs):
+        """func(session_id, zone, *args, **kwargs)를 캐시된 세션으로 호출한다.
+
+        SessionExpiredError가 발생하면 세션을 폐기하고 한 번만 재로그인 후 다시 호출한다.
+        """
+        session_id, zone = self.get()
+        try:
+            return func(session_id, zone, *args, **kwargs)
+        except SessionExpiredError as e:
+            print(f"Session expired, logging in again: {e}")
+            self.invalidate(session_id)
+            session_id, zone = self.get()
+            return func(session_id, zone, *args, **kwargs)
+
+    def iterate(self, func, *args, **kwargs):
+        """func(session_id, zone, *args, **kwargs)가 돌려주는 이터레이터를 캐시된 세션으로 순회한다.
+
+        이미 내보낸 항목을 다시 내보내지 않도록, 첫 항목이 나오기 전에 세션이 거부된 경우에만
+        재로그인 후 처음부터 다시 시도한다.
+        """
+        session_id, zone = self.get()
+        yielded = False
+        try:
+            for item in func(session_id, zone, *args, **kwargs):
+                yielded = True
+                yield item
+            return
+        except SessionExpiredError as e:
+            if yielded:
+                raise
+            print(f"Session expired, logging in again: {e}")
+            self.invalidate(session_id)
+        session_id, zone = self.get()
+        yield from func(session_id, zone, *args, **kwargs)
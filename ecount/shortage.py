@@ -0,0 +1,115 @@
+"""안전재고 부족 분석 (NumPy)
+
+품목 마스터(SAFE_QTY, MIN_QTY)와 재고현황(BAL_QTY)을 품목코드로 조인해
+안전재고 대비 부족 수량, 최소구매단위로 올림한 발주 제안 수량, 일평균 수요 기준 재고 일수를 계산한다.
+
+조인은 정렬된 품목코드 배열에 searchsorted로 위치를 찾는 방식이라 행 단위 반복이 없다.
+numpy는 선택 의존성이며 이 모듈을 쓸 때만 필요하다.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy가 없는 환경
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("shortage analysis requires numpy (pip install numpy)")
+
+
+def _to_float_array(values):
+    """숫자/문자열/None 리스트 또는 버퍼 -> float64 배열 (변환 불가는 NaN)"""
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    if isinstance(values, memoryview):
+        return np.frombuffer(values, dtype=np.float64)
+    result = np.empty(len(values), dtype=np.float64)
+    for i, value in enumerate(values):
+        try:
+            result[i] = float(value)
+        except (TypeError, ValueError):
+            result[i] = np.nan
+    return result
+
+
+def _lookup(sorted_codes, codes):
+    """codes 각각의 sorted_codes 내 위치와 일치 여부"""
+    positions = np.searchsorted(sorted_codes, codes)
+    positions = np.minimum(positions, max(len(sorted_codes) - 1, 0))
+    matched = sorted_codes[positions] == codes if len(sorted_codes) else np.zeros(len(codes), dtype=bool)
+    return positions, matched
+
+
+def shortage_report(prod_codes, safe_qty, min_qty, balance_codes, balance_qty,
+                    demand=None, names=None, include_all=False, limit=None):
+    """안전재고 부족 보고서
+
+    Args:
+        prod_codes: 품목 마스터 품목코드 리스트
+        safe_qty, min_qty: 품목별 안전재고수량, 최소구매단위 (리스트, ndarray 또는 float64 memoryview)
+        balance_codes, balance_qty: 재고현황 품목코드/재고수량 (같은 품목이 여러 창고에 있으면 합산)
+        demand: {품목코드: 일평균 수요} - 주어지면 재고 일수(daysOfCover) 계산
+        names: 품목명 리스트 (prod_codes와 같은 순서)
+        include_all: True면 부족하지 않은 품목도 포함
+        limit: 최대 행 수
+
+    Returns:
+        (rows, summary) - rows는 재고 일수 오름차순, 같으면 부족 수량 내림차순
+    """
+    _require_numpy()
+    codes = np.asarray(prod_codes, dtype=str)
+    count = len(codes)
+    safe = np.nan_to_num(_to_float_array(safe_qty), nan=0.0)
+    minimum = np.nan_to_num(_to_float_array(min_qty), nan=0.0)
+
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+
+    # 재고 합산 (품목 마스터에 없는 재고 품목은 버림)
+    balance = np.zeros(count, dtype=np.float64)
+    bal_codes = np.asarray(balance_codes, dtype=str)
+    if len(bal_codes):
+        positions, matched = _lookup(sorted_codes, bal_codes)
+        quantities = np.nan_to_num(_to_float_array(balance_qty), nan=0.0)
+        balance = np.bincount(order[positions[matched]], weights=quantities[matched], minlength=count)
+
+    shortfall = np.maximum(safe - balance, 0.0)
+    # 최소구매단위로 올림 (단위가 없으면 부족 수량 그대로)
+    units = np.where(minimum > 0, minimum, 1.0)
+    order_qty = np.where(minimum > 0, np.ceil(shortfall / units) * units, shortfall)
+
+    daily = np.zeros(count, dtype=np.float64)
+    if demand:
+        demand_codes = np.asarray(list(demand.keys()), dtype=str)
+        demand_values = _to_float_array(list(demand.values()))
+        positions, matched = _lookup(sorted_codes, demand_codes)
+        daily[order[positions[matched]]] = np.nan_to_num(demand_values[matched], nan=0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cover = np.where(daily > 0, balance / daily, np.inf)
+
+    selected = np.arange(count) if include_all else np.flatnonzero(shortfall > 0)
+    ranking = np.lexsort((-shortfall[selected], cover[selected]))
+    selected = selected[ranking]
+    if limit:
+        selected = selected[:int(limit)]
+
+    rows = []
+    for i in selected.tolist():
+        rows.append({
+            "prodCd": str(codes[i]),
+            "prodNm": names[i] if names is not None else None,
+            "balQty": float(balance[i]),
+            "safeQty": float(safe[i]),
+            "minQty": float(minimum[i]),
+            "shortfall": float(shortfall[i]),
+            "orderQty": float(order_qty[i]),
+            "dailyDemand": float(daily[i]) if daily[i] > 0 else None,
+            "daysOfCover": round(float(cover[i]), 2) if np.isfinite(cover[i]) else None,
+        })
+    summary = {
+        "products": count,
+        "shortProducts": int(np.count_nonzero(shortfall > 0)),
+        "totalShortfall": float(shortfall.sum()),
+        "totalOrderQty": float(order_qty.sum()),
+    }
+    return rows, summary
@@ -0,0 +1,84 @@
+"""동시에 들어온 같은 조회 합치기 (single-flight)
+
+같은 키(엔드포인트 + 정규화된 요청 본문)의 호출이 이미 진행 중이면 새 호출은 요청을 보내지 않고
+진행 중인 호출(leader)이 끝나기를 기다려 같은 결과를 받는다. leader가 예외로 끝나면 기다리던
+호출도 같은 예외를 받는다 (세션 만료라면 각자 재로그인 후 다시 시도하고, 그 재시도끼리 다시 합쳐진다).
+
+끝난 결과는 보관하지 않는다. 시간 단위 재사용은 응답 캐시(ecount.response_cache)가 맡고,
+여기서는 "같은 순간"에 겹친 요청만 하나로 만든다. 결과 객체는 호출들이 함께 쓰므로 고치지 않는다.
+
+한 프로세스 안(상주 워커의 요청 스레드들)에서만 합쳐진다.
+"""
+import threading
+import time
+
+from ecount.timings import phase
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters', 'started')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+        self.started = time.monotonic()
+
+
+class SingleFlight:
+    """키별 진행 중 호출 테이블 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {"calls": 0, "leaders": 0, "shared": 0, "errors": 0}
+
+    def do(self, key, func, *args, **kwargs):
+        """key로 진행 중인 호출이 있으면 그 결과를, 없으면 func(*args, **kwargs)를 실행한 결과를 반환"""
+        with self._lock:
+            self._counters["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters["leaders"] += 1
+            else:
+                call.waiters += 1
+                self._counters["shared"] += 1
+
+        if not leader:
+            with phase("wait"):
+                call.done.wait()
+            with self._lock:
+                call.waiters -= 1
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """{"inFlight": 진행 중 키 수, "waiters": 기다리는 호출 수, "calls", "leaders", "shared", "errors", "oldestMs"}
+
+        shared / calls가 합쳐서 줄어든 요청 비율이다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            calls = list(self._calls.values())
+            result = dict(self._counters)
+            result["inFlight"] = len(calls)
+            result["waiters"] = sum(call.waiters for call in calls)
+            result["oldestMs"] = round(max((now - call.started for call in calls), default=0.0) * 1000, 1)
+        return result
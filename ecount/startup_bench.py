@@ -0,0 +1,132 @@
+"""CLI 시작 시간 벤치마크
+
+명령마다 새 인터프리터를 `python -X importtime cli.py <명령>`으로 띄워서 잰다.
+
+- firstByteMs: 프로세스 시작부터 stdout 첫 바이트까지 (Node가 결과를 받기 시작하는 시점)
+- totalMs: 프로세스 종료까지
+- importMs: 전체 import 시간 (-X importtime 최상위 항목의 누적 시간 합)
+- slowestImports: 누적 import 시간이 큰 모듈 (최상위와 그 바로 아래 단계)
+- baselineMs: 아무것도 하지 않는 인터프리터(`python -c pass`)의 시작~종료 시간
+
+--max-ms를 주면 firstByteMs 중앙값이 그보다 큰 명령이 있을 때 종료 코드 1로 끝난다 (시작 시간 회귀 검사).
+
+사용:
+    python -m ecount.startup_bench
+    python -m ecount.startup_bench --runs 10 --max-ms 250 --command "product_search_json 새우 5"
+    python -m ecount.startup_bench --entry test.py   # 진입점 비교
+"""
+import argparse
+import json
+import os
+import re
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# ECOUNT를 호출하지 않는(로컬 파일만 쓰는) 명령 - 네트워크 시간 없이 시작 비용만 보인다
+DEFAULT_COMMANDS = ["product_search_json 새우 5", "mirror_products_json", "inventory_history_json"]
+DEFAULT_RUNS = 5
+TOP_IMPORTS = 8
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 -> (전체 import 시간 ms, [(모듈, 누적 ms)] 큰 순)
+
+    전체 시간은 최상위 import(site 포함)의 누적 시간 합이고,
+    모듈 목록은 최상위와 그 바로 아래 단계(test.py가 import한 ecount 모듈 등)만 포함한다.
+    """
+    total_ms = 0.0
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        depth = (len(match.group(3)) - 1) // 2
+        cumulative_ms = int(match.group(2)) / 1000
+        if depth == 0:
+            total_ms += cumulative_ms
+        if depth <= 1:
+            modules.append((match.group(4), round(cumulative_ms, 1)))
+    modules.sort(key=lambda item: item[1], reverse=True)
+    return round(total_ms, 1), modules
+
+
+def _run_once(argv, env):
+    started = time.perf_counter()
+    process = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=ROOT_DIR, env=env)
+    first = process.stdout.read(1)
+    first_byte_ms = (time.perf_counter() - started) * 1000 if first else None
+    _, stderr = process.communicate()
+    total_ms = (time.perf_counter() - started) * 1000
+    return first_byte_ms, total_ms, stderr.decode('utf-8', errors='replace'), process.returncode
+
+
+def _median(values):
+    values = [value for value in values if value is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def bench_command(command, entry, runs=DEFAULT_RUNS):
+    """명령 하나를 runs번 새 프로세스로 실행한 결과"""
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    argv = [sys.executable, '-X', 'importtime', entry] + shlex.split(command)
+    first_bytes, totals, import_totals = [], [], []
+    imports = []
+    returncode = 0
+    for _ in range(runs):
+        first_byte_ms, total_ms, stderr, returncode = _run_once(argv, env)
+        first_bytes.append(first_byte_ms)
+        totals.append(total_ms)
+        import_ms, imports = parse_importtime(stderr)
+        import_totals.append(import_ms)
+    return {
+        "command": command,
+        "runs": runs,
+        "firstByteMs": _median(first_bytes),
+        "firstByteMinMs": round(min(value for value in first_bytes if value is not None), 1)
+        if any(value is not None for value in first_bytes) else None,
+        "totalMs": _median(totals),
+        "importMs": _median(import_totals),
+        "slowestImports": dict(imports[:TOP_IMPORTS]),   # 마지막 실행 기준
+        "exitCode": returncode,
+    }
+
+
+def bench_baseline(runs=DEFAULT_RUNS):
+    totals = []
+    for _ in range(runs):
+        _, total_ms, _, _ = _run_once([sys.executable, '-c', 'pass'], dict(os.environ))
+        totals.append(total_ms)
+    return _median(totals)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ecount.startup_bench")
+    parser.add_argument("--command", action="append", help="벤치마크할 명령 (여러 번 지정 가능, 기본: 로컬 명령들)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="명령당 실행 횟수 (중앙값 사용)")
+    parser.add_argument("--entry", default="cli.py", help="진입 스크립트 (저장소 루트 기준)")
+    parser.add_argument("--max-ms", type=float, help="firstByteMs 중앙값 상한, 넘으면 종료 코드 1")
+    options = parser.parse_args(argv)
+
+    entry = os.path.join(ROOT_DIR, options.entry)
+    results = [bench_command(command, entry, options.runs) for command in options.command or DEFAULT_COMMANDS]
+    report = {"entry": options.entry, "python": sys.version.split()[0],
+              "baselineMs": bench_baseline(options.runs), "commands": results}
+
+    failed = []
+    if options.max_ms is not None:
+        failed = [result["command"] for result in results
+                  if result["firstByteMs"] is None or result["firstByteMs"] > options.max_ms]
+        report["maxMs"] = options.max_ms
+        report["failed"] = failed
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""큰 조회 응답의 스트리밍 디코더
+
+응답 본문을 바이트 청크 단위로 받아 item(Data.Result 배열의 원소)을 하나씩 yield 한다.
+본문 전체를 str로 만들거나 json.loads로 한 번에 파싱하지 않으므로,
+메모리에는 청크 몇 개와 item 하나, 그리고 호출 측이 남기는 결과만 있다.
+
+- 바깥 객체(Status, Error, Data 등)는 키 단위로 훑고, item 배열만 원소 단위로 디코딩한다
+- GetBasicProductsList처럼 Data.Result가 "JSON 배열을 담은 문자열"이면
+  문자열 이스케이프를 조각 단위로 풀면서 바로 안쪽 배열 디코더에 넘긴다 (안쪽 문자열 전체를 만들지 않음)
+- fields를 주면 item마다 그 필드만 남긴 dict를 만든다 (원본 item dict는 바로 버려진다)
+- item 하나와 바깥 스칼라 값은 json.JSONDecoder.raw_decode(C 구현)로 디코딩한다
+
+Status/Error 등 item 배열 밖의 값은 다 읽은 뒤 ResponseStream.envelope에서 볼 수 있다.
+ECOUNT 응답은 Data가 Status보다 먼저 오므로 세션 오류 확인은 반복이 끝난 뒤에 한다
+(오류 응답은 Data가 null이라 그 전에 나오는 item은 없다).
+"""
+import codecs
+import json
+import re
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Data 아래에서 item 배열로 보는 키 (앞쪽이 우선, Result만 문자열로 인코딩된 배열 허용)
+ITEM_KEYS = ('Result', 'Datas', 'List', 'Items', 'rows', 'Row')
+# 품목 기본정보 행에 쓰는 필드 (test.py _product_row 순서)
+PRODUCT_FIELDS = (
+    'PROD_CD',      # 품목코드
+    'PROD_DES',     # 품목명
+    'SIZE_DES',     # 규격명
+    'UNIT',         # 단위
+    'PROD_TYPE',    # 품목구분 (0:원재료, 1:제품, 2:반제품, 3:상품, 4:부재료, 7:무형상품)
+    'IN_PRICE',     # 입고단가
+    'OUT_PRICE',    # 출고단가
+    'BAL_FLAG',     # 재고수량관리여부 (0:제외, 1:대상)
+    'SET_FLAG',     # 세트여부
+    'CLASS_CD',     # 그룹코드1
+    'CLASS_CD2',    # 그룹코드2
+    'BAR_CODE',     # 바코드
+    'VAT_YN',       # 부가세율구분
+    'SAFE_QTY',     # 안전재고수량
+    'MIN_QTY',      # 최소구매단위
+)
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_MAX_ESCAPE = 12   # 가장 긴 이스케이프: 서로게이트 쌍 \uXXXX\uXXXX
+_decoder = json.JSONDecoder()
+
+
+def text_chunks(text, size=DEFAULT_CHUNK_SIZE):
+    """이미 str로 있는 본문(캐시 등)을 청크로 나눈다"""
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def _decoded(chunks):
+    """bytes(UTF-8) 또는 str 청크 -> str 청크"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            yield chunk
+        elif chunk:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+class _Reader:
+    """str 조각 스트림 위의 JSON 토큰 리더 (읽은 앞부분은 버퍼에서 버린다)"""
+
+    def __init__(self, pieces):
+        self._pieces = iter(pieces)
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """다음 조각을 버퍼에 붙인다 (더 없으면 False)"""
+        if self.eof:
+            return False
+        piece = next(self._pieces, None)
+        if piece is None:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + piece
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """공백을 건너뛴 다음 문자 (끝이면 '')"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r} in response body")
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값 하나 (값이 버퍼에 다 들어올 때까지 조각을 더 읽는다)"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self.fill():
+                    continue
+                raise ValueError(f"Invalid JSON in response body: {e.msg}") from None
+            # 숫자/리터럴이 버퍼 끝에서 끝났으면 다음 조각에 이어질 수 있다
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self):
+        """객체의 키를 하나씩 yield (호출 측이 yield 사이에 값을 읽어야 한다)"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError("Expected object key in response body")
+            key = self.value()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' but found {separator!r} in response body")
+
+    def items(self):
+        """배열 원소를 하나씩 yield"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' but found {separator!r} in response body")
+
+    def string_pieces(self):
+        """문자열 값을 이스케이프를 푼 조각으로 yield (문자열 전체를 한 번에 만들지 않는다)
+
+        조각은 쉼표 바로 뒤에서 자른다. 쉼표는 이스케이프(\\" \\uXXXX 등)의 일부가 될 수 없으므로
+        이스케이프나 서로게이트 쌍이 조각 사이에서 갈라지지 않는다.
+        """
+        self.expect('"')
+        while True:
+            try:
+                piece, self.pos = json.decoder.scanstring(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # 닫는 따옴표가 아직 안 왔거나 버퍼 끝에서 이스케이프가 잘린 경우만 이어 읽는다
+                if not e.msg.startswith('Unterminated string') and e.pos < len(self.buf) - _MAX_ESCAPE:
+                    raise ValueError(f"Invalid JSON string in response body: {e.msg}") from None
+            else:
+                if piece:
+                    yield piece
+                return
+            cut = self.buf.rfind(',', self.pos)
+            if cut >= 0:
+                piece, _ = json.decoder.scanstring(self.buf[self.pos:cut + 1] + '"', 0)
+                self.pos = cut + 1
+                yield piece
+            if not self.fill():
+                raise ValueError("Unterminated string in response body")
+
+
+class ResponseStream:
+    """ECOUNT 조회 응답 본문 -> item iterator
+
+    Args:
+        chunks: 본문 청크 iterable (bytes 또는 str, 예: response.iter_content(DEFAULT_CHUNK_SIZE))
+        fields: item마다 남길 필드 (None이면 원본 item 그대로)
+
+    반복이 끝나면 envelope에 item 배열을 뺀 응답({"Status", "Error", "Data": {...}, ...})이,
+    result_error에 Result 문자열이 JSON 배열이 아니었을 때의 오류 메시지가 남는다.
+    """
+
+    def __init__(self, chunks, fields=None):
+        self._reader = _Reader(_decoded(chunks))
+        self.fields = tuple(fields) if fields is not None else None
+        self.envelope = {}
+        self.result_error = None
+        self.count = 0
+
+    def _project(self, item):
+        if self.fields is None or not isinstance(item, dict):
+            return item
+        return {name: item.get(name) for name in self.fields}
+
+    def _array(self, reader):
+        for item in reader.items():
+            self.count += 1
+            yield self._project(item)
+
+    def _encoded_array(self):
+        # Result가 문자열: 이스케이프를 푼 조각을 안쪽 리더에 흘려 보낸다
+        pieces = self._reader.string_pieces()
+        inner = _Reader(pieces)
+        first = inner.peek()
+        if first == '[':
+            yield from self._array(inner)
+        elif first:
+            self.result_error = "Result is not a JSON array"
+        for _ in pieces:  # 바깥 문자열의 남은 부분(닫는 따옴표까지) 소비
+            pass
+
+    def _data(self):
+        reader = self._reader
+        first = reader.peek()
+        if first == '[':
+            yield from self._array(reader)
+            return None
+        if first != '{':
+            return reader.value()
+        data, found = {}, False
+        for key in reader.members():
+            following = reader.peek()
+            if not found and key in ITEM_KEYS and (following == '[' or (following == '"' and key == 'Result')):
+                found = True
+                yield from (self._array(reader) if following == '[' else self._encoded_array())
+            else:
+                data[key] = reader.value()
+        return data
+
+    def __iter__(self):
+        reader = self._reader
+        if reader.peek() != '{':
+            raise ValueError("Response body is not a JSON object")
+        for key in reader.members():
+            if key == 'Data':
+                self.envelope[key] = yield from self._data()
+            else:
+                self.envelope[key] = reader.value()
+
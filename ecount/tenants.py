@@ -0,0 +1,138 @@
+"""여러 회사코드(테넌트) 설정
+
+한 프로세스에서 여러 ECOUNT 계정을 다룰 수 있도록 테넌트 키 -> 로그인 정보를 관리한다.
+세션, Zone, 연결 풀, 속도 제한 예산은 호출 측(test.py)이 테넌트 키마다 따로 만든다.
+
+현재 테넌트는 contextvars로 전달되므로 use_tenant() 블록 안에서 시작된 페이지/구간 조회 스레드와
+asyncio.to_thread 호출도 같은 테넌트로 실행된다.
+
+설정 (ECOUNT_TENANTS 환경변수: JSON 파일 경로 또는 JSON 문자열):
+    {"default": "main",
+     "tenants": {"main": {"COM_CODE": "61813", "USER_ID": "...", "API_CERT_KEY": "...", "ZONE": "CB",
+                          "USE_TEST_API": true, "RATE_LIMITS": "default=5/5"},
+                 "second": {...}}}
+"""
+import contextvars
+import json
+import os
+from contextlib import contextmanager
+
+DEFAULT_TENANT_KEY = 'default'
+
+_current = contextvars.ContextVar('ecount_tenant', default=None)
+
+
+class Tenant:
+    """ECOUNT 계정 하나의 설정"""
+
+    def __init__(self, key, com_code, user_id, api_cert_key, default_zone, use_test=True, rate_limits=None):
+        self.key = key
+        self.com_code = com_code
+        self.user_id = user_id
+        self.api_cert_key = api_cert_key
+        self.default_zone = default_zone
+        self.use_test = use_test
+        self.rate_limits = rate_limits   # "name=rate/burst,..." 또는 None(기본값)
+
+    @classmethod
+    def from_config(cls, key, config):
+        missing = [name for name in ('COM_CODE', 'USER_ID', 'API_CERT_KEY') if not config.get(name)]
+        if missing:
+            raise ValueError(f"Tenant '{key}' is missing {', '.join(missing)}")
+        return cls(
+            key,
+            config['COM_CODE'],
+            config['USER_ID'],
+            config['API_CERT_KEY'],
+            config.get('ZONE') or '',
+            use_test=bool(config.get('USE_TEST_API', True)),
+            rate_limits=config.get('RATE_LIMITS'),
+        )
+
+    def describe(self):
+        """API 키를 뺀 공개 정보"""
+        return {"key": self.key, "comCode": self.com_code, "userId": self.user_id,
+                "zone": self.default_zone, "useTest": self.use_test}
+
+
+class TenantRegistry:
+    """테넌트 키 -> Tenant
+
+    Args:
+        tenants: Tenant 리스트
+        default_key: 테넌트를 지정하지 않았을 때 쓸 키
+    """
+
+    def __init__(self, tenants, default_key=DEFAULT_TENANT_KEY):
+        self._tenants = {tenant.key: tenant for tenant in tenants}
+        if default_key not in self._tenants:
+            raise ValueError(f"Unknown default tenant: {default_key}")
+        self.default_key = default_key
+
+    @classmethod
+    def load(cls, source=None, fallback=None):
+        """설정(파일 경로 또는 JSON 문자열)으로 레지스트리를 만든다.
+
+        fallback Tenant는 설정에 같은 키가 없으면 그대로 추가된다 (기존 단일 계정 설정).
+        """
+        tenants = {}
+        default_key = fallback.key if fallback is not None else None
+        if source:
+            if source.lstrip().startswith('{'):
+                config = json.loads(source)
+            else:
+                with open(source, encoding='utf-8') as f:
+                    config = json.load(f)
+            for key, tenant_config in (config.get('tenants') or {}).items():
+                tenants[key] = Tenant.from_config(key, tenant_config)
+            default_key = config.get('default') or default_key
+        if fallback is not None and fallback.key not in tenants:
+            tenants[fallback.key] = fallback
+        if default_key is None and tenants:
+            default_key = next(iter(tenants))
+        return cls(list(tenants.values()), default_key)
+
+    def keys(self):
+        return list(self._tenants)
+
+    def get(self, key=None):
+        key = key or self.default_key
+        tenant = self._tenants.get(key)
+        if tenant is None:
+            raise ValueError(f"Unknown tenant: {key}")
+        return tenant
+
+    def current(self):
+        """현재 컨텍스트의 테넌트 (지정하지 않았으면 기본 테넌트)"""
+        return self.get(_current.get())
+
+
+@contextmanager
+def use_tenant(key):
+    """with 블록 안(같은 컨텍스트)의 ECOUNT 호출을 key 테넌트로 실행 (None이면 바꾸지 않음)"""
+    if not key:
+        yield
+        return
+    token = _current.set(key)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def select_tenant(key):
+    """현재 컨텍스트의 테넌트를 바꾼다 (CLI 진입점처럼 with 블록으로 감쌀 수 없는 곳용)"""
+    _current.set(key or None)
+
+
+def current_tenant_key():
+    return _current.get()
+
+
+def tenant_path(path, key, default_key):
+    """테넌트별 파일 경로: 기본 테넌트는 path 그대로, 그 외는 같은 디렉토리의 tenant_data/<key>/ 아래"""
+    if key == default_key:
+        return path
+    directory = os.path.join(os.path.dirname(path), 'tenant_data', key)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, os.path.basename(path))
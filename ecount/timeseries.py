@@ -0,0 +1,240 @@
+"""일별 재고 스냅샷 시계열 저장소
+
+하루치 재고현황([PROD_CD, BAL_QTY, WH_CD] 행)을 추가 전용 로그 파일에 기록한다.
+
+- 전날(바로 앞 기록일) 대비 값이 바뀐 (창고, 품목)만 기록한다 (차분 인코딩)
+- 레코드는 같은 (창고, 품목)의 이전 레코드 위치를 가리키므로, 한 품목의 시계열은
+  그 품목의 변경 레코드만 따라가면 된다 (모든 스냅샷을 읽지 않음)
+- 인덱스 파일에 키 목록, 키별 마지막 레코드 위치(head), 최근 값, 기록된 날짜를 둔다
+
+레코드 형식 (24바이트): key_id uint32 | date int32 (YYYYMMDD) | value float64 (NaN=그날 없음) | prev int64
+
+과거 날짜를 나중에 기록하면(백필) 바로 다음 기록일의 값이 새 날짜 기준으로도 맞도록
+달라지는 키에 대해 다음 기록일 레코드를 다시 쓴다. 같은 (키, 날짜) 레코드가 여러 개면 나중 것이 우선한다.
+"""
+import json
+import math
+import os
+import struct
+import tempfile
+from bisect import bisect_left, bisect_right
+
+from .locking import file_lock
+
+RECORD = struct.Struct('<Iidq')
+INDEX_FORMAT_VERSION = 1
+
+
+def _same(a, b):
+    if a is None or b is None:
+        return a is b
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return a == b
+
+
+def _to_value(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class InventorySeries:
+    """재고 시계열 저장소
+
+    Args:
+        directory: 저장 디렉토리 (data.log, index.json, lock 파일 생성)
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.data_path = os.path.join(directory, 'data.log')
+        self.index_path = os.path.join(directory, 'index.json')
+        self.lock_path = os.path.join(directory, 'lock')
+
+    # --- 인덱스 ---
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            index = {"format": INDEX_FORMAT_VERSION, "keys": [], "heads": [], "latest": [], "dates": [], "size": 0}
+        if index.get("format") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported series index format: {index.get('format')}")
+        index["key_ids"] = {tuple(key): key_id for key_id, key in enumerate(index["keys"])}
+        return index
+
+    def _save_index(self, index):
+        payload = {name: value for name, value in index.items() if name != "key_ids"}
+        fd, tmp_path = tempfile.mkstemp(prefix='.index_', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _key_id(index, key):
+        key_id = index["key_ids"].get(key)
+        if key_id is None:
+            key_id = len(index["keys"])
+            index["keys"].append(list(key))
+            index["heads"].append(-1)
+            index["latest"].append(None)
+            index["key_ids"][key] = key_id
+        return key_id
+
+    # --- 레코드 읽기 ---
+
+    def _chain(self, f, head):
+        """키 하나의 레코드를 뒤에서부터 따라가며 {date: value} (같은 날짜는 나중 레코드 우선)"""
+        values = {}
+        offset = head
+        while offset >= 0:
+            f.seek(offset)
+            _, date, value, offset = RECORD.unpack(f.read(RECORD.size))
+            values.setdefault(date, value)
+        return sorted(values.items())
+
+    def _all_changes(self, index):
+        """모든 키의 변경 기록 {key_id: [(date, value), ...]} (파일을 한 번 순차로 읽음)"""
+        changes = {}
+        if not os.path.exists(self.data_path):
+            return changes
+        with open(self.data_path, 'rb') as f:
+            data = f.read(index["size"])
+        for key_id, date, value, _ in RECORD.iter_unpack(data):
+            changes.setdefault(key_id, {})[date] = value   # 나중 레코드가 덮어씀
+        return {key_id: sorted(values.items()) for key_id, values in changes.items()}
+
+    @staticmethod
+    def _value_at(changes, date):
+        """date 이하 마지막 변경값 (없으면 None)"""
+        position = bisect_right(changes, (date, math.inf)) - 1
+        return changes[position][1] if position >= 0 else None
+
+    # --- 기록 ---
+
+    def dates(self):
+        return [str(date) for date in self._load_index()["dates"]]
+
+    def record(self, base_date, rows):
+        """하루치 스냅샷 기록 (rows: [[PROD_CD, BAL_QTY, WH_CD], ...])"""
+        return self.record_many({base_date: rows})[base_date]
+
+    def record_many(self, snapshots):
+        """여러 날짜 스냅샷을 날짜 순으로 기록. {date: 기록한 레코드 수}를 반환"""
+        written = {}
+        with file_lock(self.lock_path):
+            index = self._load_index()
+            changes = None
+            with open(self.data_path, 'ab') as f:
+                for base_date in sorted(snapshots):
+                    date = int(base_date)
+                    state = {}
+                    for row in snapshots[base_date]:
+                        if row and row[0]:
+                            state[self._key_id(index, (row[2] or '', row[0]))] = _to_value(row[1])
+                    dates = index["dates"]
+                    if not dates or date > dates[-1]:
+                        previous = index["latest"]
+                        fixups = {}
+                    else:
+                        # 과거(또는 이미 기록한) 날짜: 그날의 현재 값과 비교하고,
+                        # 다음 기록일에 자기 레코드가 없어 값이 바뀌게 되는 키는 다음 기록일 레코드를 다시 쓴다
+                        if changes is None:
+                            f.flush()
+                            changes = self._all_changes(index)
+                        after = bisect_right(dates, date)
+                        next_date = dates[after] if after < len(dates) else None
+                        previous = [None] * len(index["keys"])
+                        fixups = {}
+                        for key_id in range(len(index["keys"])):
+                            key_changes = changes.get(key_id, [])
+                            previous[key_id] = self._value_at(key_changes, date)
+                            if next_date is not None and not any(change_date == next_date for change_date, _ in key_changes):
+                                next_value = self._value_at(key_changes, next_date)
+                                fixups[key_id] = math.nan if next_value is None else next_value
+
+                    records = []
+                    for key_id in range(len(index["keys"])):
+                        value = state.get(key_id, math.nan)
+                        old = previous[key_id] if key_id < len(previous) else None
+                        if _same(old, value) or (old is None and math.isnan(value)):
+                            continue
+                        records.append((key_id, date, value))
+                        # 다음 기록일이 이 레코드 값을 물려받지 않도록 원래 값을 다시 쓴다
+                        if key_id in fixups and not _same(fixups[key_id], value):
+                            records.append((key_id, next_date, fixups[key_id]))
+
+                    for key_id, record_date, value in records:
+                        offset = index["size"]
+                        f.write(RECORD.pack(key_id, record_date, value, index["heads"][key_id]))
+                        index["heads"][key_id] = offset
+                        index["size"] += RECORD.size
+                        if changes is not None:
+                            key_changes = dict(changes.get(key_id, []))
+                            key_changes[record_date] = value
+                            changes[key_id] = sorted(key_changes.items())
+
+                    if date not in dates:
+                        dates.insert(bisect_left(dates, date), date)
+                    if date == dates[-1]:
+                        index["latest"] = [state.get(key_id, math.nan) for key_id in range(len(index["keys"]))]
+                    written[base_date] = len(records)
+                f.flush()
+                os.fsync(f.fileno())
+            # NaN은 JSON에 쓸 수 없으므로 None으로 (None은 "그날 없음"과 같게 취급)
+            index["latest"] = [None if value is None or math.isnan(value) else value for value in index["latest"]]
+            self._save_index(index)
+        return written
+
+    # --- 조회 ---
+
+    def series(self, prod_cd=None, wh_cd=None, date_from=None, date_to=None):
+        """(창고, 품목)별 일별 재고 시계열
+
+        Args:
+            prod_cd, wh_cd: 코드 리스트 (비면 전체)
+            date_from, date_to: YYYYMMDD 범위 (비면 전체)
+
+        Returns:
+            [{"whCd", "prodCd", "points": [[YYYYMMDD, qty], ...]}] - 기록된 날짜마다 값 (없으면 None)
+        """
+        index = self._load_index()
+        low = int(date_from) if date_from else 0
+        high = int(date_to) if date_to else 99999999
+        dates = [date for date in index["dates"] if low <= date <= high]
+        products = set(prod_cd or [])
+        warehouses = set(wh_cd or [])
+        result = []
+        if not dates or not os.path.exists(self.data_path):
+            return result
+        with open(self.data_path, 'rb') as f:
+            for key_id, (wh, prod) in enumerate(index["keys"]):
+                if (products and prod not in products) or (warehouses and wh not in warehouses):
+                    continue
+                changes = self._chain(f, index["heads"][key_id])
+                points = []
+                for date in dates:
+                    value = self._value_at(changes, date)
+                    points.append([str(date), None if value is None or math.isnan(value) else value])
+                result.append({"whCd": wh, "prodCd": prod, "points": points})
+        return result
+
+    def stats(self):
+        index = self._load_index()
+        return {
+            "dates": len(index["dates"]),
+            "firstDate": str(index["dates"][0]) if index["dates"] else None,
+            "lastDate": str(index["dates"][-1]) if index["dates"] else None,
+            "keys": len(index["keys"]),
+            "records": index["size"] // RECORD.size,
+            "bytes": index["size"],
+        }
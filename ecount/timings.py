@@ -0,0 +1,281 @@
+"""명령별 단계 시간 측정과 프로파일러
+
+명령 하나(CLI 실행 또는 워커 요청 하나)를 track()으로 감싸면 그 안의 phase() 구간 시간이 단계별로 모인다.
+
+단계 (PHASES):
+    zone: Zone API 조회
+    login: 로그인 API
+    wait: 속도 제한 토큰 대기, 재시도 백오프
+    request: HTTP 요청/응답 수신 (스트리밍 응답은 본문 청크를 받는 시간 포함)
+    decode: 응답 본문 JSON 디코딩
+    extract: 응답에서 item/행 추출 (candidate_keys 탐색 포함)
+    serialize: 결과 JSON/NDJSON 직렬화
+
+단계 시간은 자기 시간(self time)이다. 같은 스레드에서 단계 안에 다른 단계가 열리면
+(login 안의 request 등) 안쪽 시간은 바깥 단계에서 빠진다. 페이지 병렬 조회처럼 여러 스레드에서
+측정한 시간은 합산되므로 단계 합이 전체 시간보다 클 수 있다.
+
+현재 측정기와 단계 스택은 contextvars로 전달되므로 copy_context()로 넘긴 스레드에서도 같은 명령에 모인다.
+측정 중이 아니면 phase()는 아무것도 하지 않는다.
+
+결과는 summary() dict({"totalMs", "phases": {단계: ms}, "calls": {단계: 횟수}, "otherMs"})와
+Prometheus 텍스트 형식 지표 파일(record_metrics)로 남긴다. 지표 파일에는 명령/테넌트별 누적 카운터와
+실행 시간 히스토그램이 있고, 실행마다 값을 더해 파일 전체를 원자적으로 다시 쓴다 (node_exporter textfile collector용).
+"""
+import contextvars
+import functools
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+PHASES = ('zone', 'login', 'wait', 'request', 'decode', 'extract', 'serialize')
+DEFAULT_PROFILE_SORT = 'cumulative'
+DEFAULT_PROFILE_LIMIT = 40
+
+_recorders = contextvars.ContextVar('ecount_phase_recorders', default=())
+_stack = contextvars.ContextVar('ecount_phase_stack', default=())
+
+
+class PhaseRecorder:
+    """명령 하나의 단계별 시간 누적기 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seconds = {}
+        self.calls = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def total_seconds(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self):
+        """{"totalMs", "phases": {단계: ms}, "calls": {단계: 횟수}, "otherMs": 단계에 속하지 않은 시간}"""
+        with self._lock:
+            names = [name for name in PHASES if name in self.seconds]
+            names += sorted(name for name in self.seconds if name not in PHASES)
+            phases = {name: round(self.seconds[name] * 1000, 1) for name in names}
+            calls = {name: self.calls[name] for name in names}
+        total_ms = round(self.total_seconds() * 1000, 1)
+        return {"totalMs": total_ms, "phases": phases, "calls": calls,
+                "otherMs": round(max(0.0, total_ms - sum(phases.values())), 1)}
+
+
+@contextmanager
+def track():
+    """with 블록(같은 컨텍스트와 넘겨받은 스레드)의 단계 시간을 새 PhaseRecorder에 모은다"""
+    recorder = PhaseRecorder()
+    recorders_token = _recorders.set(_recorders.get() + (recorder,))
+    stack_token = _stack.set(())
+    try:
+        yield recorder
+    finally:
+        recorder.finished = time.perf_counter()
+        _stack.reset(stack_token)
+        _recorders.reset(recorders_token)
+
+
+def current():
+    """가장 안쪽 track()의 PhaseRecorder (측정 중이 아니면 None)"""
+    recorders = _recorders.get()
+    return recorders[-1] if recorders else None
+
+
+class phase:
+    """with 블록 시간을 name 단계로 기록 (안쪽 단계 시간은 빼고)
+
+    스트리밍 디코딩처럼 item마다 들어가는 곳이 있어 @contextmanager 대신 클래스로 둔다.
+    """
+    __slots__ = ('name', '_recorders', '_parent', '_frame', '_token', '_started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._recorders = _recorders.get()
+        if self._recorders:
+            self._parent = _stack.get()
+            self._frame = [threading.get_ident(), 0.0]   # [스레드, 같은 스레드 안쪽 단계 시간]
+            self._token = _stack.set(self._parent + (self._frame,))
+            self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self._recorders:
+            return False
+        elapsed = time.perf_counter() - self._started
+        _stack.reset(self._token)
+        frame, parent = self._frame, self._parent
+        if parent and parent[-1][0] == frame[0]:
+            parent[-1][1] += elapsed
+        for recorder in self._recorders:
+            recorder.add(self.name, elapsed - frame[1])
+        return False
+
+
+def timed(name):
+    """함수 호출 전체를 name 단계로 기록하는 데코레이터"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed_iter(iterable, name):
+    """iterable의 다음 값을 받는 시간만 name 단계로 기록 (yield된 값을 쓰는 시간은 제외)"""
+    iterator = iter(iterable)
+    end = object()
+    while True:
+        with phase(name):
+            value = next(iterator, end)
+        if value is end:
+            return
+        yield value
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# ecount_command_duration_seconds 히스토그램 구간 상한(초)
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# (이름, 종류, 설명) - 지표 파일에 이 순서로 쓴다
+_FAMILIES = (
+    ('ecount_command_runs_total', 'counter', 'Number of command runs.'),
+    ('ecount_command_duration_seconds', 'histogram', 'Wall time of command runs.'),
+    ('ecount_command_phase_seconds_total', 'counter', 'Self time spent in a phase, summed over command runs.'),
+    ('ecount_command_phase_calls_total', 'counter', 'Number of times a phase was entered, summed over command runs.'),
+)
+_HISTOGRAM_SUFFIXES = ('_bucket', '_sum', '_count')
+_LE = re.compile(r',?le="([^"]*)"')
+
+
+def metric_samples(summary, labels):
+    """summary() 한 번분 -> {시계열('이름{레이블}'): 더할 값}"""
+    base = ','.join(f'{name}="{_label(value)}"' for name, value in labels.items())
+    seconds = summary["totalMs"] / 1000
+    samples = {f'ecount_command_runs_total{{{base}}}': 1}
+    for bound in DURATION_BUCKETS:
+        samples[f'ecount_command_duration_seconds_bucket{{{base},le="{bound:g}"}}'] = 1 if seconds <= bound else 0
+    samples[f'ecount_command_duration_seconds_bucket{{{base},le="+Inf"}}'] = 1
+    samples[f'ecount_command_duration_seconds_sum{{{base}}}'] = seconds
+    samples[f'ecount_command_duration_seconds_count{{{base}}}'] = 1
+    for name, ms in summary["phases"].items():
+        samples[f'ecount_command_phase_seconds_total{{{base},phase="{name}"}}'] = ms / 1000
+        samples[f'ecount_command_phase_calls_total{{{base},phase="{name}"}}'] = summary["calls"][name]
+    return samples
+
+
+def parse_metrics(text):
+    """지표 파일 본문 -> {시계열: 값} (주석과 빈 줄은 건너뜀)"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            series, _, value = line.rpartition(' ')
+            samples[series] = float(value)
+    return samples
+
+
+def _family(series):
+    name = series.partition('{')[0]
+    for family, kind, _ in _FAMILIES:
+        if name == family or (kind == 'histogram' and name in [family + suffix for suffix in _HISTOGRAM_SUFFIXES]):
+            return family
+    return None
+
+
+def _series_order(series):
+    """같은 레이블의 히스토그램 _bucket(le 순), _sum, _count가 이어지도록 정렬 키"""
+    name, _, labels = series.partition('{')
+    le = _LE.search(labels)
+    bound = float(le.group(1)) if le else 0.0
+    suffix = next((rank for rank, suffix in enumerate(_HISTOGRAM_SUFFIXES) if name.endswith(suffix)), 0)
+    return _LE.sub('', labels), suffix, bound
+
+
+def format_metrics(samples):
+    """{시계열: 값} -> Prometheus 텍스트 형식 본문 (지표마다 HELP/TYPE 다음에 그 시계열만 모아서)"""
+    grouped = {}
+    for series, value in samples.items():
+        family = _family(series)
+        if family is not None:
+            grouped.setdefault(family, []).append(series)
+    lines = []
+    for family, kind, help_text in _FAMILIES:
+        if family not in grouped:
+            continue
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {kind}')
+        for series in sorted(grouped[family], key=_series_order):
+            lines.append(f'{series} {float(samples[series])!r}')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def record_metrics(path, summary, labels):
+    """한 실행분을 지표 파일의 누적 카운터/히스토그램에 더하고 파일 전체를 다시 쓴다
+
+    잠금 파일(path + ".lock")로 여러 프로세스(CLI, 워커)의 갱신을 한 줄로 세우고, 같은 디렉토리의 임시 파일에 쓴 뒤
+    os.replace로 바꾸므로 node_exporter textfile collector가 쓰다 만 파일을 읽지 않는다.
+    시계열은 명령 x 테넌트 x 단계마다 하나라 실행 횟수가 늘어도 파일은 커지지 않는다.
+    """
+    import tempfile
+    from .locking import file_lock
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    with file_lock(path + '.lock'):
+        try:
+            with open(path, encoding='utf-8') as f:
+                samples = parse_metrics(f.read())
+        except FileNotFoundError:
+            samples = {}
+        for series, value in metric_samples(summary, labels).items():
+            samples[series] = samples.get(series, 0) + value
+        fd, tmp_path = tempfile.mkstemp(prefix='.ecount_metrics_', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(format_metrics(samples))
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+@contextmanager
+def profiled(output=None, sort=DEFAULT_PROFILE_SORT, limit=DEFAULT_PROFILE_LIMIT, stream=None):
+    """with 블록을 cProfile로 실행하고 정렬된 통계를 stream(기본 stderr)에 출력
+
+    Args:
+        output: 원본 통계(.prof)를 저장할 경로 (snakeviz, pstats로 다시 열기용)
+        sort: pstats 정렬 기준 (cumulative, tottime 등)
+        limit: 출력할 함수 수
+    """
+    import cProfile
+    import pstats
+    import sys
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        stream = stream or sys.stderr
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(sort).print_stats(limit)
+        if output:
+            stats.dump_stats(output)
+            print(f"Profile saved to {output}", file=stream)
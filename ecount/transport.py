@@ -0,0 +1,158 @@
+"""ECOUNT API 공용 HTTP 전송 계층
+
+- Zone 호스트(sboapiCB.ecount.com 등)별 requests.Session과 keep-alive 연결 풀
+- connect/read 타임아웃 (요청이 무한정 걸려 있지 않도록)
+- 조회성 요청은 지터가 들어간 지수 백오프로 재시도
+- 연결 재사용 통계
+- rate_limiter가 주어지면 매 요청(재시도 포함) 전에 토큰을 받는다
+- 토큰 대기/백오프는 "wait", 요청은 "request" 단계로 기록 (ecount.timings)
+
+requests는 첫 연결 풀을 만들 때 import한다 (로컬 데이터만 쓰는 명령의 시작 시간을 줄이기 위해).
+"""
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from ecount.timings import phase
+
+DEFAULT_CONNECT_TIMEOUT = 5.0    # 초
+DEFAULT_READ_TIMEOUT = 60.0      # 초, 전체 품목 조회처럼 응답이 큰 요청 고려
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5       # 초
+DEFAULT_BACKOFF_MAX = 8.0        # 초
+DEFAULT_POOL_SIZE = 16
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TransportError(RuntimeError):
+    """재시도 후에도 요청이 실패했을 때 발생"""
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+class Transport:
+    """호스트별 연결 풀을 가진 POST 전송기 (스레드 안전)
+
+    Args:
+        connect_timeout, read_timeout: 타임아웃(초), 기본값은 ECOUNT_CONNECT_TIMEOUT / ECOUNT_READ_TIMEOUT 환경변수
+        max_retries: 조회성 요청 최대 재시도 횟수, 기본값은 ECOUNT_MAX_RETRIES 환경변수
+        backoff_base, backoff_max: 재시도 대기 시간 (base * 2^n, 최대 backoff_max, full jitter)
+        pool_size: 호스트당 최대 연결 수
+        rate_limiter: acquire(url)를 가진 속도 제한기 (ecount.ratelimit.RateLimiter)
+    """
+
+    def __init__(self, connect_timeout=None, read_timeout=None, max_retries=None,
+                 backoff_base=DEFAULT_BACKOFF_BASE, backoff_max=DEFAULT_BACKOFF_MAX, pool_size=DEFAULT_POOL_SIZE,
+                 rate_limiter=None):
+        self.connect_timeout = connect_timeout if connect_timeout is not None else \
+            _env_float('ECOUNT_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT)
+        self.read_timeout = read_timeout if read_timeout is not None else \
+            _env_float('ECOUNT_READ_TIMEOUT', DEFAULT_READ_TIMEOUT)
+        self.max_retries = max_retries if max_retries is not None else \
+            int(_env_float('ECOUNT_MAX_RETRIES', DEFAULT_MAX_RETRIES))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _session_for(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    def _backoff(self, attempt):
+        # full jitter: 0 ~ min(max, base * 2^attempt)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def post(self, url, payload, idempotent=True, timeout=None, stream=False):
+        """JSON POST 요청
+
+        Args:
+            url: 요청 URL
+            payload: JSON 본문
+            idempotent: True면 연결 오류/타임아웃/일시적 HTTP 오류 시 재시도 (조회 API)
+            timeout: (connect, read) 튜플로 기본 타임아웃 대체
+            stream: True면 본문을 미리 읽지 않는다 (호출 측이 iter_content로 읽고 close)
+        """
+        import requests
+
+        session = self._session_for(url)
+        timeout = timeout or (self.connect_timeout, self.read_timeout)
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        last_error = None
+        for attempt in range(attempts):
+            with phase("wait"):
+                if attempt:
+                    self._count("retries")
+                    time.sleep(self._backoff(attempt - 1))
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(url)
+            self._count("requests")
+            try:
+                with phase("request"):
+                    response = session.post(url, json=payload, timeout=timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                continue
+            if response.status_code in RETRY_STATUS_CODES and attempt + 1 < attempts:
+                last_error = TransportError(f"HTTP {response.status_code}")
+                response.close()
+                continue
+            return response
+        self._count("failures")
+        raise TransportError(f"Request to {urlsplit(url).path} failed after {attempts} attempt(s): {last_error}")
+
+    def stats(self):
+        """요청/재시도/실패 횟수와 호스트별 연결 재사용 통계"""
+        with self._lock:
+            result = dict(self._counters)
+            sessions = dict(self._sessions)
+        hosts = {}
+        for host, session in sessions.items():
+            new_connections = 0
+            pooled_requests = 0
+            adapter = session.get_adapter('https://')
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                new_connections += pool.num_connections
+                pooled_requests += pool.num_requests
+            hosts[host] = {
+                "requests": pooled_requests,
+                "newConnections": new_connections,
+                "reusedConnections": max(0, pooled_requests - new_connections),
+            }
+        result["hosts"] = hosts
+        return result
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
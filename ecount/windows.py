@@ -0,0 +1,36 @@
+"""조회 기간 분할
+
+ECOUNT 목록 API 중에는 검색 기간을 최대 30일로 제한하는 것들이 있다 (예: GetPurchasesOrderList).
+임의의 기간을 제한에 맞는 구간들로 나눈다.
+"""
+from datetime import datetime, timedelta
+
+DATE_FORMAT = "%Y%m%d"
+MAX_WINDOW_DAYS = 30   # 시작일 포함 30일 (BASE_DATE_TO <= BASE_DATE_FROM + 29일)
+
+
+def split_date_range(date_from, date_to, max_days=MAX_WINDOW_DAYS):
+    """[date_from, date_to] 기간을 max_days일 이하 구간들로 나눈다.
+
+    Args:
+        date_from: 시작일 (YYYYMMDD)
+        date_to: 종료일 (YYYYMMDD, 포함)
+        max_days: 구간당 최대 일수 (시작일 포함)
+
+    Returns:
+        [(구간 시작일, 구간 종료일), ...] 시간순, 구간끼리 겹치지 않음
+    """
+    start = datetime.strptime(date_from, DATE_FORMAT)
+    end = datetime.strptime(date_to, DATE_FORMAT)
+    if start > end:
+        raise ValueError(f"date_from({date_from}) is after date_to({date_to})")
+    if max_days < 1:
+        raise ValueError("max_days must be at least 1")
+
+    windows = []
+    window_start = start
+    while window_start <= end:
+        window_end = min(window_start + timedelta(days=max_days - 1), end)
+        windows.append((window_start.strftime(DATE_FORMAT), window_end.strftime(DATE_FORMAT)))
+        window_start = window_end + timedelta(days=1)
+    return windows
@@ -0,0 +1,168 @@
+"""상주 Python 워커
+
+요청마다 인터프리터를 새로 띄우지 않고, 한 프로세스가 stdin 또는 Unix 소켓으로
+줄 단위 JSON 명령을 받아 처리한다. 세션과 HTTP 연결은 프로세스 안에서 계속 재사용된다.
+
+요청 (한 줄에 하나):  {"id": "1", "command": "product_basic_json", "args": ["", "1"]}
+응답 (한 줄에 하나):  {"id": "1", "success": true, "result": {...}}
+                      {"id": "1", "success": false, "error": "..."}
+
+args는 위치 인자 리스트 또는 키워드 인자 dict 모두 가능하다.
+"tenant": "키"를 넣으면 그 테넌트(회사코드) 설정으로 실행한다 (scope로 처리, 없으면 기본 테넌트).
+응답은 처리가 끝나는 순서대로 나가므로 호출 측은 id로 요청과 짝을 맞춘다.
+"""
+import json
+import os
+import socket
+import sys
+import threading
+import traceback
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def _encode(message):
+    # ensure_ascii=False여도 JSON 문자열 안의 개행은 이스케이프되므로 한 줄이 보장된다
+    return (json.dumps(message, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+
+
+def handle_request(handlers, request, scope=None):
+    """요청 하나를 처리하여 응답 dict를 반환한다.
+
+    scope(request)가 주어지면 그 반환값(컨텍스트 매니저) 안에서 명령을 실행한다.
+    """
+    request_id = request.get('id') if isinstance(request, dict) else None
+    try:
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        command = request.get('command')
+        if command == 'ping':
+            return {'id': request_id, 'success': True, 'result': {'pong': True, 'pid': os.getpid()}}
+        handler = handlers.get(command)
+        if handler is None:
+            raise ValueError(f"Unknown command: {command}")
+        args = request.get('args')
+        if args is not None and not isinstance(args, (dict, list)):
+            raise ValueError("args must be a list or an object")
+        with scope(request) if scope is not None else nullcontext():
+            if args is None:
+                result = handler()
+            elif isinstance(args, dict):
+                result = handler(**args)
+            else:
+                result = handler(*args)
+        return {'id': request_id, 'success': True, 'result': result}
+    except Exception as e:
+        print(traceback.format_exc(), file=sys.stderr)
+        return {'id': request_id, 'success': False, 'error': str(e)}
+
+
+class _Connection:
+    """한 입력 스트림의 요청을 스레드 풀로 처리하고 응답을 직렬화해서 쓴다."""
+
+    def __init__(self, handlers, executor, write, scope=None):
+        self.handlers = handlers
+        self.scope = scope
+        self.executor = executor
+        self._write = write
+        self._write_lock = threading.Lock()
+
+    def send(self, message):
+        data = _encode(message)
+        with self._write_lock:
+            self._write(data)
+
+    def _run(self, request):
+        self.send(handle_request(self.handlers, request, self.scope))
+
+    def feed_line(self, line):
+        """한 줄을 처리한다. shutdown 명령이면 False를 반환한다."""
+        line = line.strip()
+        if not line:
+            return True
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            self.send({'id': None, 'success': False, 'error': f"Invalid JSON: {e}"})
+            return True
+        if isinstance(request, dict) and request.get('command') == 'shutdown':
+            self.send({'id': request.get('id'), 'success': True, 'result': {'shutdown': True}})
+            return False
+        self.executor.submit(self._run, request)
+        return True
+
+
+def _warm_up(warmup):
+    if warmup is None:
+        return
+    try:
+        warmup()
+    except Exception as e:
+        print(f"Worker warm-up failed: {e}", file=sys.stderr)
+
+
+def serve_stdio(handlers, max_workers=DEFAULT_MAX_WORKERS, warmup=None, scope=None):
+    """stdin에서 요청을 읽고 stdout으로 응답한다.
+
+    조회 함수들이 찍는 디버그 출력이 프로토콜을 깨지 않도록 sys.stdout은 stderr로 돌린다.
+    warmup은 ready 응답 전에 한 번 호출된다 (예: 세션 미리 확보).
+    scope는 handle_request 참고.
+    """
+    out = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    _warm_up(warmup)
+
+    def write(data):
+        out.write(data)
+        out.flush()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        conn = _Connection(handlers, executor, write, scope)
+        conn.send({'id': None, 'success': True, 'result': {'ready': True, 'pid': os.getpid()}})
+        for raw in sys.stdin.buffer:
+            if not conn.feed_line(raw.decode('utf-8')):
+                break
+
+
+def serve_unix(path, handlers, max_workers=DEFAULT_MAX_WORKERS, warmup=None, scope=None):
+    """Unix 도메인 소켓으로 요청을 받는다. 여러 클라이언트 연결이 같은 스레드 풀을 공유한다."""
+    sys.stdout = sys.stderr
+    _warm_up(warmup)
+    if os.path.exists(path):
+        os.remove(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    os.chmod(path, 0o600)
+    server.listen()
+    stop = threading.Event()
+
+    def client_loop(client, executor):
+        with client, client.makefile('rb') as reader:
+            conn = _Connection(handlers, executor, client.sendall, scope)
+            for raw in reader:
+                if not conn.feed_line(raw.decode('utf-8')):
+                    stop.set()
+                    break
+        if stop.is_set():
+            # accept() 대기를 깨우기 위해 자기 자신에게 접속
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                    s.connect(path)
+            except OSError:
+                pass
+
+    print(f"ECOUNT worker listening on {path}", file=sys.stderr)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while not stop.is_set():
+                client, _ = server.accept()
+                if stop.is_set():
+                    client.close()
+                    break
+                threading.Thread(target=client_loop, args=(client, executor), daemon=True).start()
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.remove(path)
@@ -1,8 +1,22 @@
 #라이브러리 import
-import requests
-import pprint
+import contextlib
+import contextvars
+import functools
+import io
 import json
+import os
+import sys
+import threading
 import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+from ecount.pagination import DEFAULT_PAGE_SIZE, fetch_all_pages, iter_pages, parse_total_count
+from ecount.stream_decode import DEFAULT_CHUNK_SIZE as STREAM_CHUNK_SIZE, PRODUCT_FIELDS, ResponseStream
+from ecount.tenants import (DEFAULT_TENANT_KEY, Tenant, TenantRegistry, current_tenant_key, select_tenant,
+                            tenant_path, use_tenant)
+from ecount.timings import phase, timed, timed_iter
 
 # --- Configuration (edit as needed) ---
 COM_CODE = 61813
@@ -10,15 +24,204 @@ USER_ID = "LIVING53"
 API_CERT_KEY = "44ef38cddd7b74de1af7d559340a49e8b3"
 DEFAULT_ZONE = "CB"
 USE_TEST_API = True  # True => use sboapi (test), False => use oapi (production)
+# 추가 회사코드(테넌트) 설정: JSON 파일 경로 또는 JSON 문자열 (형식은 ecount/tenants.py 참고)
+# 위 단일 계정 설정은 항상 "default" 테넌트로 포함된다
+TENANTS_CONFIG = os.environ.get('ECOUNT_TENANTS') or ''
+DEFAULT_PAGE_WORKERS = 4  # 페이지 병렬 조회 시 동시 요청 수
+DEFAULT_WINDOW_WORKERS = 2  # 기간 분할 조회 시 동시에 조회할 구간 수
+DEFAULT_DASHBOARD_CONCURRENCY = 4  # 대시보드 스냅샷에서 동시에 실행할 조회 수
+DEFAULT_FANOUT_WORKERS = 4  # 여러 창고/품목 재고현황 조회 시 동시 호출 수
+# 조회 함수의 샘플 행/원본 응답 디버그 출력 (JSON/NDJSON 명령과 워커 모드에서는 자동으로 끔)
+DEBUG_OUTPUT = os.environ.get('ECOUNT_DEBUG_OUTPUT') not in ('0', 'false', 'no')
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# 품목 카탈로그 증분 동기화용 스냅샷 (없으면 products_data.json을 버전 0으로 사용)
+CATALOG_SNAPSHOT_PATH = os.environ.get('ECOUNT_CATALOG_SNAPSHOT') or os.path.join(SCRIPT_DIR, 'products_snapshot.json')
+CATALOG_SEED_PATH = os.path.join(SCRIPT_DIR, 'products_data.json')
+# 품목 검색 인덱스 파일
+SEARCH_INDEX_PATH = os.environ.get('ECOUNT_SEARCH_INDEX') or os.path.join(SCRIPT_DIR, 'products_search.idx')
+# 컬럼형 품목 테이블 파일 (mmap으로 로드)
+PRODUCT_STORE_PATH = os.environ.get('ECOUNT_PRODUCT_STORE') or os.path.join(SCRIPT_DIR, 'products_columns.bin')
+# 부족 보고서가 쓰는 컬럼형 품목 테이블의 최대 나이(초) - 더 오래됐으면 다시 만든다. 0이면 있는 테이블을 그대로 사용
+PRODUCT_STORE_MAX_AGE = float(os.environ.get('ECOUNT_PRODUCT_STORE_MAX_AGE') or 30 * 60)
+# 조회 응답 캐시 (ECOUNT_RESPONSE_CACHE_DISABLE=1이면 사용 안 함)
+RESPONSE_CACHE_PATH = os.environ.get('ECOUNT_RESPONSE_CACHE_PATH') or os.path.join(SCRIPT_DIR, 'ecount_cache.sqlite3')
+RESPONSE_CACHE_ENABLED = os.environ.get('ECOUNT_RESPONSE_CACHE_DISABLE') not in ('1', 'true', 'yes')
+# 로컬 SQLite 미러 (품목, 재고현황, 발주서)
+MIRROR_PATH = os.environ.get('ECOUNT_MIRROR_PATH') or os.path.join(SCRIPT_DIR, 'ecount_mirror.sqlite3')
+MIRROR_ORDER_DAYS = 90  # 발주서 첫 동기화 기간(일)
+MIRROR_ORDER_OVERLAP_DAYS = 7  # 증분 동기화 시 다시 받는 기간(일) - 최근 발주서 수정 반영
+MIRROR_REFRESH_SECONDS = float(os.environ.get('ECOUNT_MIRROR_REFRESH') or 0)  # 워커 백그라운드 갱신 주기, 0이면 끔
+# 일별 재고 시계열 저장소 디렉토리
+INVENTORY_SERIES_DIR = os.environ.get('ECOUNT_INVENTORY_SERIES') or os.path.join(SCRIPT_DIR, 'inventory_series')
+DEFAULT_BACKFILL_WORKERS = 4  # 재고 시계열 백필 시 동시에 조회할 날짜 수
+BACKFILL_BATCH_DAYS = 30  # 백필 결과를 몇 일치씩 묶어 기록할지
+# 일괄 저장 결과 저널 (같은 레코드 재제출 시 성공분은 다시 보내지 않음)
+BULK_JOURNAL_PATH = os.environ.get('ECOUNT_BULK_JOURNAL') or os.path.join(SCRIPT_DIR, 'ecount_bulk.sqlite3')
+DEFAULT_BULK_WORKERS = 2  # 일괄 저장 시 동시에 보낼 배치 수
+# 전체 품목 목록 뷰 유효 시간(초) - 품목 조건 조회를 메모리 인덱스로 답한다. 0이면 조건마다 ECOUNT 조회
+CATALOG_VIEW_TTL = float(os.environ.get('ECOUNT_CATALOG_VIEW_TTL') or 30 * 60)
+# 명령별 단계 시간 지표 (Prometheus 텍스트 형식 누적 카운터/히스토그램, ecount.timings.record_metrics)
+# ECOUNT_METRICS_DIR(예: node_exporter textfile collector 디렉토리)를 지정했을 때만 그 안의 ecount.prom에 기록
+METRICS_DIR = os.environ.get('ECOUNT_METRICS_DIR') or ''
+METRICS_PATH = os.path.join(METRICS_DIR, 'ecount.prom') if METRICS_DIR else ''
+# cProfile: ECOUNT_PROFILE=1이면 CLI 명령마다 정렬된 통계를 stderr로, 그 외 값이면 그 경로에 .prof도 저장
+PROFILE = os.environ.get('ECOUNT_PROFILE') or ''
+PROFILE_SORT = os.environ.get('ECOUNT_PROFILE_SORT') or 'cumulative'
+
+_tenant_registry = None
+_tenant_resources = {}  # 테넌트 키 -> {자원 이름: 객체} (세션, 연결 풀, 속도 제한, 캐시, 미러 등)
+_tenant_resources_lock = threading.RLock()
+
+def get_tenant_registry():
+    """테넌트 설정 (TENANTS_CONFIG + 기본 단일 계정)"""
+    global _tenant_registry
+    if _tenant_registry is None:
+        fallback = Tenant(DEFAULT_TENANT_KEY, COM_CODE, USER_ID, API_CERT_KEY, DEFAULT_ZONE, use_test=USE_TEST_API)
+        _tenant_registry = TenantRegistry.load(TENANTS_CONFIG, fallback)
+    return _tenant_registry
+
+def current_tenant():
+    """현재 컨텍스트의 테넌트 (use_tenant로 지정, 없으면 기본 테넌트)"""
+    return get_tenant_registry().current()
+
+def _tenant_resource(name, factory):
+    """현재 테넌트의 자원을 처음 쓸 때 factory(tenant)로 만들고 이후 재사용"""
+    tenant = current_tenant()
+    with _tenant_resources_lock:
+        resources = _tenant_resources.setdefault(tenant.key, {})
+        if name not in resources:
+            resources[name] = factory(tenant)
+        return resources[name]
+
+def _tenant_file(path):
+    """현재 테넌트의 로컬 파일 경로 (기본 테넌트는 path 그대로, 그 외는 tenant_data/<key>/ 아래)"""
+    registry = get_tenant_registry()
+    return tenant_path(path, registry.current().key, registry.default_key)
+
+def _catalog_seed_path():
+    """products_data.json은 기본 계정의 카탈로그이므로 기본 테넌트만 사용"""
+    registry = get_tenant_registry()
+    return CATALOG_SEED_PATH if registry.current().key == registry.default_key else None
+
+def _api_base():
+    """현재 테넌트의 API 호스트 접두어 (sboapi: 테스트, oapi: 운영)"""
+    return 'sboapi' if current_tenant().use_test else 'oapi'
+
+def _new_rate_limiter(tenant):
+    from ecount.ratelimit import RateLimiter, default_state_path
+    
+    limits = None
+    if tenant.rate_limits:
+        from ecount.ratelimit import DEFAULT_RATE_LIMITS, parse_rate_limits
+        limits = {**DEFAULT_RATE_LIMITS, **parse_rate_limits(tenant.rate_limits)}
+    return RateLimiter(default_state_path(tenant.com_code, tenant.user_id, tenant.use_test), limits)
+
+def get_rate_limiter():
+    """테넌트별 속도 제한기 (엔드포인트별 토큰 버킷, 상태 파일로 워커 프로세스 간 공유)"""
+    return _tenant_resource("rate_limiter", _new_rate_limiter)
+
+def get_transport():
+    """테넌트별 HTTP 전송 계층 (호스트별 keep-alive 연결 풀, 타임아웃, 재시도, 속도 제한)"""
+    from ecount.transport import Transport
+    
+    return _tenant_resource("transport", lambda tenant: Transport(rate_limiter=get_rate_limiter()))
+
+def _new_response_cache(tenant):
+    from ecount.response_cache import ResponseCache
+    return ResponseCache(RESPONSE_CACHE_PATH, namespace=f"{tenant.com_code}:{tenant.user_id}")
+
+def get_response_cache():
+    """테넌트별 조회 응답 캐시 (파일은 공유, 회사코드:사용자로 구분. 사용 안 함이면 None)"""
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    return _tenant_resource("response_cache", _new_response_cache)
 
+def _with_cache_stats(result_func):
+    """결과 dict에 이번 호출의 응답 캐시 적중/실패 횟수("cache")를 붙인다"""
+    @functools.wraps(result_func)
+    def wrapper(*args, **kwargs):
+        cache = get_response_cache()
+        if cache is None:
+            return result_func(*args, **kwargs)
+        with cache.track() as counters:
+            result = result_func(*args, **kwargs)
+        if isinstance(result, dict):
+            result["cache"] = counters
+        return result
+    return wrapper
+
+def _decode_response(response):
+    """응답 본문 JSON 디코딩 ("decode" 단계로 기록)
+
+    디코딩한 객체는 응답에 붙여 두어 같은 응답은 한 번만 디코딩한다 (_cached_post의 Status 확인과 호출 측이 함께 씀).
+    single-flight로 여러 호출이 같은 응답을 받으므로 돌려준 객체는 고치지 않는다.
+    """
+    contents = getattr(response, 'decoded', None)
+    if contents is None:
+        with phase("decode"):
+            contents = json.loads(response.text)
+        response.decoded = contents
+    return contents
+
+def get_single_flight():
+    """테넌트별 동시 동일 조회 합치기 (ecount.singleflight, 상주 워커의 요청 스레드 사이에서 효과)"""
+    from ecount.singleflight import SingleFlight
+    return _tenant_resource("single_flight", lambda tenant: SingleFlight())
+
+def _flight_key(url, payload):
+    """합치기 키: 호스트+경로(SESSION_ID 쿼리 제외) + 정규화된 요청 본문"""
+    from ecount.response_cache import normalize_params
+    
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}", normalize_params(payload)
+
+def http_post(url, payload, idempotent=True):
+    """ECOUNT API POST 요청 - 모든 API 호출은 이 함수를 거친다
+
+    캐시 대상 조회 API(ecount.response_cache.DEFAULT_TTLS)는 캐시에 있으면 요청하지 않는다.
+    조회성 요청은 같은 엔드포인트/본문의 요청이 진행 중이면 그 응답을 함께 받는다 (get_single_flight).
+    (품목 기본정보 조회만 응답을 스트리밍으로 읽기 위해 _product_body_chunks에서 전송 계층을 직접 쓰며 응답 캐시는 거치지 않는다)
+
+    Args:
+        url: 요청 URL
+        payload: JSON 본문
+        idempotent: 조회성 요청이면 True (일시적 오류 시 백오프 후 재시도)
+    """
+    if not idempotent:
+        return get_transport().post(url, payload, idempotent=False)
+    return get_single_flight().do(_flight_key(url, payload), _cached_post, url, payload)
+
+def _cached_post(url, payload):
+    """조회 요청 (응답 캐시 -> 전송 계층)"""
+    cache = get_response_cache()
+    if cache is None or not cache.is_cacheable(url):
+        return get_transport().post(url, payload)
+    
+    body = cache.get(url, payload)
+    if body is not None:
+        return SimpleNamespace(text=body, status_code=200)
+    response = get_transport().post(url, payload)
+    # 정상 응답만 저장 (세션 만료 등 오류 응답은 캐시하지 않음)
+    if response.status_code == 200:
+        try:
+            contents = _decode_response(response)
+        except ValueError:
+            contents = None
+        ok = isinstance(contents, dict) and contents.get('Status') == '200'
+        if ok:
+            cache.put(url, payload, response.text)
+    return response
+
+@timed("zone")
 def get_zone_info(com_code_value, use_test=True):
     # url = 'https://oapi.ecount.com/OAPI/V2/Zone' # production url
     url = 'https://sboapi.ecount.com/OAPI/V2/Zone' if use_test else 'https://oapi.ecount.com/OAPI/V2/Zone'
     payload = {
         "COM_CODE": com_code_value
     }
-    response = requests.post(url, json=payload)
-    contents = json.loads(response.text)
+    response = http_post(url, payload)
+    contents = _decode_response(response)
     status = contents.get('Status')
     data = contents.get('Data') or {}
     error = contents.get('Error') or {}
@@ -29,6 +232,7 @@ def get_zone_info(com_code_value, use_test=True):
         print(f"Zone API error: Status={status}, Code={error.get('Code')}, Message={error.get('Message')}")
         return {}
 
+@timed("login")
 def api_login_oapilogin(com_code_value, user_id_value, api_cert_key_value, zone_value, use_test=True):
     base = 'sboapi' if use_test else 'oapi'
     url = f'https://{base}{zone_value}.ecount.com/OAPI/V2/OAPILogin'
@@ -39,8 +243,8 @@ def api_login_oapilogin(com_code_value, user_id_value, api_cert_key_value, zone_
         "LAN_TYPE": "ko-KR",
         "ZONE": zone_value
     }
-    response = requests.post(url, json=payload)
-    contents = json.loads(response.text)
+    response = http_post(url, payload)
+    contents = _decode_response(response)
     status = contents.get('Status')
     if status != '200':
         err = contents.get('Error') or {}
@@ -53,15 +257,37 @@ def api_login_oapilogin(com_code_value, user_id_value, api_cert_key_value, zone_
     print(f"Logged in. SESSION_ID prefix: {session_id_local[:8]}...")
     return session_id_local
 
+def get_session_manager():
+    """테넌트별 세션 매니저 (ZONE, SESSION_ID를 디스크에 캐시하여 프로세스 간 공유)"""
+    from ecount.session import SessionManager
+    
+    return _tenant_resource("session_manager", lambda tenant: SessionManager(
+        tenant.com_code, tenant.user_id, tenant.api_cert_key, tenant.default_zone or DEFAULT_ZONE,
+        zone_lookup=get_zone_info,
+        login=api_login_oapilogin,
+        use_test=tenant.use_test
+    ))
+
+def call_with_session(func, *args, **kwargs):
+    """캐시된 세션으로 func(session_id, zone, *args, **kwargs) 호출
+
+    세션이 없거나 만료되었을 때만 로그인하고, ECOUNT가 세션을 거부하면 한 번 재로그인 후 재시도한다.
+    """
+    return get_session_manager().call(func, *args, **kwargs)
+
+@timed("extract")
 def run_inventory_lookup(session_id, zone):
-    url = f'https://sboapi{zone}.ecount.com/OAPI/V2/InventoryBalance/GetListInventoryBalanceStatusByLocation?SESSION_ID={session_id}'
+    from ecount.session import check_session
+    
+    url = f'https://{_api_base()}{zone}.ecount.com/OAPI/V2/InventoryBalance/GetListInventoryBalanceStatusByLocation?SESSION_ID={session_id}'
     datas = {
         "PROD_CD": "", 
         "WH_CD": "", 
         "BASE_DATE": "20230115"
         }
-    response = requests.post(url, json=datas)
-    contents = json.loads(response.text)
+    response = http_post(url, datas)
+    contents = _decode_response(response)
+    check_session(contents)
 
     data_container = contents.get('Data', None)
     items = []
@@ -89,40 +315,45 @@ def run_inventory_lookup(session_id, zone):
     ] for m in items]
 
     print(f"Inventory rows: {len(ttt)}")
-    if ttt:
+    if ttt and DEBUG_OUTPUT:
+        import pprint
         pprint.pprint(ttt[:5])
     return ttt
 
-def run_orderlist_lookup(session_id, zone, date_from="20230101", date_to="20230131"):
-    """발주서 조회 API
+@timed("extract")
+def _fetch_order_page(session_id, zone, date_from, date_to, page_no, page_size, strict=False):
+    """발주서 조회 API 한 페이지 요청 -> (원본 item 리스트, TotalCnt)
     
-    Args:
-        session_id: 로그인 후 받은 세션 ID
-        zone: Zone 정보
-        date_from: 검색 시작일 (YYYYMMDD 형식)
-        date_to: 검색 종료일 (YYYYMMDD 형식, date_from으로부터 최대 30일)
+    strict=True면 첫 페이지 오류 Status도 빈 결과 대신 ApiStatusError (미러 동기화 등 결과를 저장하는 호출용)
     """
-    url = f'https://sboapi{zone}.ecount.com/OAPI/V2/Purchases/GetPurchasesOrderList?SESSION_ID={session_id}'
+    from ecount.session import check_session, check_status
+    
+    url = f'https://{_api_base()}{zone}.ecount.com/OAPI/V2/Purchases/GetPurchasesOrderList?SESSION_ID={session_id}'
     datas = {
         "PROD_CD": "",      # 품목코드 (전체 조회를 위해 빈값)
         "CUST_CD": "",      # 거래처코드 (전체 조회를 위해 빈값)
         "ListParam": {
-            "PAGE_CURRENT": 1,
-            "PAGE_SIZE": 100,
+            "PAGE_CURRENT": page_no,
+            "PAGE_SIZE": page_size,
             "BASE_DATE_FROM": date_from,
             "BASE_DATE_TO": date_to
         }
     }
     
-    response = requests.post(url, json=datas)
-    contents = json.loads(response.text)
-    
-    print(f"Purchase Order API Response Status: {contents.get('Status')}")
+    response = http_post(url, datas)
+    contents = _decode_response(response)
+    check_session(contents)
     
     if contents.get('Status') != '200':
         error = contents.get('Error', {})
-        print(f"Purchase Order API error: Status={contents.get('Status')}, Message={error.get('Message')}")
-        return []
+        message = f"Purchase Order API error: Status={contents.get('Status')}, Message={error.get('Message')}"
+        if page_no > 1:
+            # 중간 페이지 실패를 빈 결과로 넘기면 데이터가 잘린 채 반환되므로 실패로 처리
+            raise RuntimeError(f"{message} (page {page_no})")
+        if strict:
+            check_status(contents, "Purchase Order")
+        print(message)
+        return [], 0
 
     data_container = contents.get('Data', None)
     items = []
@@ -143,115 +374,250 @@ def run_orderlist_lookup(session_id, zone, date_from="20230101", date_to="202301
     elif isinstance(data_container, list):
         items = data_container
 
+    total_count = parse_total_count(data_container.get('TotalCnt')) if isinstance(data_container, dict) else None
+    return items, total_count
+
+def _order_row(m):
+    """발주서 item -> 행(10개 필드)"""
+    return [
+        m.get('ORD_NO'),          # 발주번호
+        m.get('ORD_DATE'),        # 발주일자  
+        m.get('CUST_DES'),        # 거래처명
+        m.get('PROD_DES'),        # 품목명
+        m.get('QTY'),             # 수량
+        m.get('BUY_AMT'),         # 공급가액
+        m.get('VAT_AMT'),         # 부가세
+        m.get('TTL_CTT'),         # 제목
+        m.get('TIME_DATE'),       # 납기일자
+        m.get('EDMS_APP_TYPE')    # 전자결재상태
+    ]
+
+def run_orderlist_lookup_paged(session_id, zone, date_from="20230101", date_to="20230131",
+                               page_size=DEFAULT_PAGE_SIZE, max_workers=DEFAULT_PAGE_WORKERS, strict=False):
+    """발주서 조회 API (전체 페이지 병렬 수집)
+    
+    첫 페이지의 TotalCnt로 페이지 수를 계산하고 나머지 페이지를 동시에 가져온다.
+    
+    Args:
+        session_id: 로그인 후 받은 세션 ID
+        zone: Zone 정보
+        date_from: 검색 시작일 (YYYYMMDD 형식)
+        date_to: 검색 종료일 (YYYYMMDD 형식, date_from으로부터 최대 30일)
+        page_size: 페이지당 건수
+        max_workers: 동시에 요청할 최대 페이지 수
+        strict: True면 오류 Status를 빈 결과 대신 ApiStatusError로
+    
+    Returns:
+        (order_data, page_stats) - page_stats에 페이지 수와 페이지별 소요시간(ms)
+    """
+    def fetch_page(page_no, size):
+        return _fetch_order_page(session_id, zone, date_from, date_to, page_no, size, strict)
+    
+    items, page_stats = fetch_all_pages(fetch_page, page_size=int(page_size), max_workers=int(max_workers))
+
     # 발주서 관련 필드들 추출
-    order_data = []
-    for m in items:
-        order_row = [
-            m.get('ORD_NO'),          # 발주번호
-            m.get('ORD_DATE'),        # 발주일자  
-            m.get('CUST_DES'),        # 거래처명
-            m.get('PROD_DES'),        # 품목명
-            m.get('QTY'),             # 수량
-            m.get('BUY_AMT'),         # 공급가액
-            m.get('VAT_AMT'),         # 부가세
-            m.get('TTL_CTT'),         # 제목
-            m.get('TIME_DATE'),       # 납기일자
-            m.get('EDMS_APP_TYPE')    # 전자결재상태
-        ]
-        order_data.append(order_row)
+    order_data = [_order_row(m) for m in items]
 
     print(f"Purchase Order rows: {len(order_data)}")
-    if order_data:
+    if order_data and DEBUG_OUTPUT:
+        import pprint
         print("Sample data (first 3 rows):")
         pprint.pprint(order_data[:3])
         
-    print(f"Total Count from API: {data_container.get('TotalCnt') if isinstance(data_container, dict) else 'N/A'}")
+    print(f"Total Count from API: {page_stats['totalCount']}, pages: {page_stats['pages']}")
     
-    return order_data
+    return order_data, page_stats
 
-def run_product_basic_lookup(session_id, zone, prod_cd="", prod_type=""):
-    """품목 기본정보 조회 API
+def run_orderlist_lookup_range(session_id, zone, date_from, date_to, page_size=DEFAULT_PAGE_SIZE,
+                               max_windows=DEFAULT_WINDOW_WORKERS, strict=False):
+    """기간 제한(30일) 없이 발주서 조회
+    
+    기간을 30일 이하 구간으로 나눠 병렬로 조회한 뒤 시간순으로 합친다.
+    구간 경계에서 같은 발주번호(ORD_NO)가 다른 구간에 또 나오면 먼저 나온 구간의 것만 남긴다.
+    (한 발주서의 여러 품목 행은 같은 구간 안에서는 그대로 유지)
     
     Args:
         session_id: 로그인 후 받은 세션 ID
         zone: Zone 정보
-        prod_cd: 품목코드 (빈값이면 전체 조회)
-        prod_type: 품목구분 (0:원재료, 1:제품, 2:반제품, 3:상품, 4:부재료, 7:무형상품)
+        date_from: 검색 시작일 (YYYYMMDD 형식)
+        date_to: 검색 종료일 (YYYYMMDD 형식)
+        page_size: 페이지당 건수
+        max_windows: 동시에 조회할 최대 구간 수 (구간마다 페이지도 병렬 조회하므로 작게 유지)
+        strict: True면 오류 Status를 빈 결과 대신 ApiStatusError로
+    
+    Returns:
+        (order_data, range_stats)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from ecount.windows import split_date_range
+    
+    windows = split_date_range(date_from, date_to)
+    
+    def fetch_window(window):
+        return run_orderlist_lookup_paged(session_id, zone, window[0], window[1], page_size, strict=strict)
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(int(max_windows), len(windows)))) as executor:
+        # 호출 우선순위(contextvars)가 구간 조회 스레드로 이어지도록 컨텍스트를 복사해 넘긴다
+        futures = [executor.submit(contextvars.copy_context().run, fetch_window, window) for window in windows]
+        window_results = [future.result() for future in futures]
+    
+    order_data = []
+    # 중복은 구간 경계에서만 생기므로 바로 앞 구간의 ORD_NO만 기억한다
+    previous_order_nos = set()
+    duplicates = 0
+    window_stats = []
+    for (window_from, window_to), (rows, page_stats) in zip(windows, window_results):
+        window_order_nos = set()
+        for row in rows:
+            ord_no = row[0]
+            window_order_nos.add(ord_no)
+            if ord_no and ord_no in previous_order_nos:
+                duplicates += 1
+                continue
+            order_data.append(row)
+        previous_order_nos = window_order_nos
+        window_stats.append({"from": window_from, "to": window_to, **page_stats})
+    
+    range_stats = {
+        "windows": len(windows),
+        "pages": sum(stats["pages"] for stats in window_stats),
+        "duplicatesRemoved": duplicates,
+        "windowStats": window_stats
+    }
+    print(f"Purchase Order range {date_from}~{date_to}: {len(windows)} windows, {len(order_data)} rows, {duplicates} duplicates removed")
+    return order_data, range_stats
+
+def run_orderlist_lookup(session_id, zone, date_from="20230101", date_to="20230131", page_size=DEFAULT_PAGE_SIZE):
+    """발주서 조회 API
+    
+    Args:
+        session_id: 로그인 후 받은 세션 ID
+        zone: Zone 정보
+        date_from: 검색 시작일 (YYYYMMDD 형식)
+        date_to: 검색 종료일 (YYYYMMDD 형식, date_from으로부터 최대 30일)
+        page_size: 페이지당 건수 (TotalCnt만큼 모든 페이지를 가져온다)
+    """
+    order_data, _ = run_orderlist_lookup_paged(session_id, zone, date_from, date_to, page_size)
+    return order_data
+
+def _product_body_chunks(url, payload):
+    """품목 기본정보 스트리밍 응답 본문 청크
+
+    응답 캐시를 거치지 않는다. 캐시에 넣으려면 본문 전체(청크 리스트, 합친 bytes, str)를 메모리에 만들어야 해서
+    스트리밍 디코딩의 의미가 없어지기 때문이다. 전체 품목 조회의 재사용은 전체 품목 뷰(ecount.catalog_view)가 맡는다.
     """
-    url = f'https://sboapi{zone}.ecount.com/OAPI/V2/InventoryBasic/GetBasicProductsList?SESSION_ID={session_id}'
+    response = get_transport().post(url, payload, stream=True)
+    try:
+        yield from timed_iter(response.iter_content(STREAM_CHUNK_SIZE), "request")
+    finally:
+        response.close()
+
+def _fetch_product_items(session_id, zone, prod_cd="", prod_type=""):
+    """품목 기본정보 조회 API 요청 -> item(PRODUCT_FIELDS만 남긴 dict)을 하나씩 yield
+
+    응답을 한 번에 json.loads 하지 않고 바이트 스트림에서 바로 item 단위로 디코딩한다
+    (문자열로 인코딩된 Data.Result도 안쪽 문자열 전체를 만들지 않고 푼다. ecount/stream_decode.py).
+    Status는 Data 뒤에 오므로 세션/오류 확인은 item을 다 읽은 뒤에 한다. 오류 Status는 ApiStatusError.
+    """
+    from ecount.session import check_session, check_status
+    
+    url = f'https://{_api_base()}{zone}.ecount.com/OAPI/V2/InventoryBasic/GetBasicProductsList?SESSION_ID={session_id}'
     datas = {
         "PROD_CD": prod_cd,
         "PROD_TYPE": prod_type
     }
     
-    response = requests.post(url, json=datas)
-    contents = json.loads(response.text)
+    stream = ResponseStream(_product_body_chunks(url, datas), PRODUCT_FIELDS)
+    yield from timed_iter(stream, "decode")
+    contents = stream.envelope
+    check_session(contents)
     
     print(f"Product Basic API Response Status: {contents.get('Status')}")
     
-    if contents.get('Status') != '200':
-        error = contents.get('Error', {})
-        print(f"Product Basic API error: Status={contents.get('Status')}, Message={error.get('Message')}")
-        return []
+    check_status(contents, "Product Basic")
+    if stream.result_error:
+        print("Result를 JSON으로 파싱할 수 없습니다.")
 
-    data_container = contents.get('Data', None)
-    items = []
-    
-    if isinstance(data_container, dict):
-        # Result 키에서 데이터 추출 - 이 API는 Result가 문자열로 된 JSON 배열일 수 있음
-        result_data = data_container.get('Result')
-        if isinstance(result_data, str):
-            # JSON 문자열을 파싱
-            try:
-                items = json.loads(result_data)
-            except:
-                print("Result를 JSON으로 파싱할 수 없습니다.")
-                items = []
-        elif isinstance(result_data, list):
-            items = result_data
-        else:
-            # 다른 가능한 키들도 시도
-            candidate_keys = ['Datas', 'List', 'Items', 'rows', 'Row']
-            for key in candidate_keys:
-                value = data_container.get(key)
-                if isinstance(value, list):
-                    items = value
-                    break
-    elif isinstance(data_container, list):
-        items = data_container
+def _product_row(m):
+    """품목 기본정보 item -> 행(PRODUCT_FIELDS 순서 15개 필드, ecount/stream_decode.py)"""
+    return [m.get(name) for name in PRODUCT_FIELDS]
 
-    # 품목 기본정보 관련 필드들 추출
-    product_data = []
-    for m in items:
-        product_row = [
-            m.get('PROD_CD'),         # 품목코드
-            m.get('PROD_DES'),        # 품목명
-            m.get('SIZE_DES'),        # 규격명
-            m.get('UNIT'),            # 단위
-            m.get('PROD_TYPE'),       # 품목구분 (0:원재료, 1:제품, 2:반제품, 3:상품, 4:부재료, 7:무형상품)
-            m.get('IN_PRICE'),        # 입고단가
-            m.get('OUT_PRICE'),       # 출고단가
-            m.get('BAL_FLAG'),        # 재고수량관리여부 (0:제외, 1:대상)
-            m.get('SET_FLAG'),        # 세트여부
-            m.get('CLASS_CD'),        # 그룹코드1
-            m.get('CLASS_CD2'),       # 그룹코드2
-            m.get('BAR_CODE'),        # 바코드
-            m.get('VAT_YN'),          # 부가세율구분
-            m.get('SAFE_QTY'),        # 안전재고수량
-            m.get('MIN_QTY')          # 최소구매단위
-        ]
-        product_data.append(product_row)
+@timed("extract")
+def _product_basic_rows(session_id, zone, prod_cd="", prod_type=""):
+    """품목 기본정보 행 리스트 (응답을 스트리밍으로 디코딩하며 행을 만든다)"""
+    return [_product_row(m) for m in _fetch_product_items(session_id, zone, prod_cd, prod_type)]
+
+def run_product_basic_lookup(session_id, zone, prod_cd="", prod_type="", strict=False):
+    """품목 기본정보 조회 API
+    
+    Args:
+        session_id: 로그인 후 받은 세션 ID
+        zone: Zone 정보
+        prod_cd: 품목코드 (빈값이면 전체 조회)
+        prod_type: 품목구분 (0:원재료, 1:제품, 2:반제품, 3:상품, 4:부재료, 7:무형상품)
+        strict: True면 오류 Status를 빈 결과 대신 ApiStatusError로 (미러/카탈로그 동기화처럼 결과를 저장하는 호출용)
+    """
+    from ecount.session import ApiStatusError
+    
+    # 같은 조건의 동시 조회는 한 번만 요청 (스트리밍 응답이라 http_post 대신 행 단위로 합친다)
+    url = f'https://{_api_base()}{zone}.ecount.com/OAPI/V2/InventoryBasic/GetBasicProductsList'
+    key = _flight_key(url, {"PROD_CD": prod_cd, "PROD_TYPE": prod_type})
+    try:
+        product_data = get_single_flight().do(key, _product_basic_rows, session_id, zone, prod_cd, prod_type)
+    except ApiStatusError as e:
+        if strict:
+            raise
+        print(e)
+        return []
 
     print(f"Product Basic rows: {len(product_data)}")
-    if product_data:
+    if product_data and DEBUG_OUTPUT:
         print("Sample data (first 3 rows):")
         for i, row in enumerate(product_data[:3]):
             print(f"  품목 {i+1}: {row[0]} | {row[1]} | {row[2]} | {row[3]} | 구분:{row[4]}")
         
     return product_data
 
+def get_catalog_views():
+    """테넌트별 전체 품목 목록 뷰 캐시 (ecount.catalog_view, CATALOG_VIEW_TTL마다 한 번 전체 조회)"""
+    from ecount.catalog_view import CatalogViewCache
+    return _tenant_resource("catalog_views", lambda tenant: CatalogViewCache(CATALOG_VIEW_TTL))
+
+def _get_catalog_view(session_id, zone):
+    """유효한 전체 품목 뷰 (오래됐으면 ECOUNT에서 새로 받는다, 오류 Status는 ApiStatusError)"""
+    return get_catalog_views().get(lambda: run_product_basic_lookup(session_id, zone, strict=True))
+
+def run_product_view_lookup(session_id, zone, prod_cd="", prod_type="", strict=False):
+    """run_product_basic_lookup과 같은 행을 전체 품목 뷰에서 찾는다 (ECOUNT 조회는 뷰가 오래됐을 때만)
+    
+    뷰는 ECOUNT에서 새로 받은 전체 목록으로 만들므로 (품목 조회는 응답 캐시를 거치지 않는다) 데이터는 최대 CATALOG_VIEW_TTL만큼 오래됐다.
+    조회가 실패하거나 빈 목록이면 뷰로 남기지 않고 다음 호출에서 다시 조회한다.
+    
+    Args:
+        session_id: 로그인 후 받은 세션 ID (뷰를 새로 만들 때만 사용)
+        zone: Zone 정보
+        prod_cd: 품목코드 ("A,B" 또는 "A∬B"로 여러 개 가능, 빈값이면 전체)
+        prod_type: 품목구분 (여러 개 가능, 빈값이면 전체)
+        strict: True면 오류 Status를 빈 결과 대신 ApiStatusError로
+    """
+    from ecount.session import ApiStatusError
+    
+    if CATALOG_VIEW_TTL <= 0:
+        return run_product_basic_lookup(session_id, zone, prod_cd, prod_type, strict)
+    try:
+        view = _get_catalog_view(session_id, zone)
+    except ApiStatusError as e:
+        if strict:
+            raise
+        print(e)
+        return []
+    with phase("extract"):
+        rows = view.query(PROD_CD=prod_cd, PROD_TYPE=prod_type)
+    print(f"Product view rows: {len(rows)} of {len(view)} (age {view.age():.0f}s)")
+    return rows
+
 def run_inventory_balance_status(session_id, zone, base_date="", wh_cd="", prod_cd=""):
-    """재고현황 조회 API (창고별 재고 현황과는 다른 API)
+    """재고현황 조회 API (창고별 재고 현황과는 다른 API) -> [[PROD_CD, BAL_QTY, WH_CD], ...] (_balance_row)
     
     Args:
         session_id: 로그인 후 받은 세션 ID
@@ -261,10 +627,27 @@ def run_inventory_balance_status(session_id, zone, base_date="", wh_cd="", prod_
         prod_cd: 품목코드 (빈값이면 전체 품목)
     """
     if not base_date:
-        from datetime import datetime
         base_date = datetime.now().strftime("%Y%m%d")
     
-    url = f'https://sboapi{zone}.ecount.com/OAPI/V2/InventoryBalance/GetListInventoryBalanceStatus?SESSION_ID={session_id}'
+    # 재고현황 관련 필드들 추출 (창고별 재고와는 다른 구조)
+    balance_data = [_balance_row(m, wh_cd) for m in _fetch_balance_items(session_id, zone, base_date, wh_cd, prod_cd)]
+
+    print(f"Inventory Balance Status rows: {len(balance_data)}")
+    if balance_data and DEBUG_OUTPUT:
+        print("Sample data (first 5 rows):")
+        for i, row in enumerate(balance_data[:5]):
+            print(f"  품목 {i+1}: 코드={row[0]} | 재고수량={row[1]}")
+        
+    print(f"기준일자: {base_date}")
+    
+    return balance_data
+
+@timed("extract")
+def _fetch_balance_items(session_id, zone, base_date, wh_cd="", prod_cd="", strict=False):
+    """재고현황 조회 API 요청 -> 원본 item 리스트 (strict=True면 오류 Status를 빈 리스트 대신 ApiStatusError로)"""
+    from ecount.session import check_session, check_status
+    
+    url = f'https://{_api_base()}{zone}.ecount.com/OAPI/V2/InventoryBalance/GetListInventoryBalanceStatus?SESSION_ID={session_id}'
     datas = {
         "PROD_CD": prod_cd,      # 품목코드
         "WH_CD": wh_cd,          # 창고코드  
@@ -275,36 +658,42 @@ def run_inventory_balance_status(session_id, zone, base_date="", wh_cd="", prod_
         "SAFE_FLAG": "N"         # 안전재고미만표시 (Y:표시, N:미표시)
     }
     
-    response = requests.post(url, json=datas)
-    contents = json.loads(response.text)
+    response = http_post(url, datas)
+    contents = _decode_response(response)
+    check_session(contents)
     
     print(f"Inventory Balance Status API Response Status: {contents.get('Status')}")
-    print(f"Full API Response: {json.dumps(contents, ensure_ascii=False, indent=2)}")
+    if DEBUG_OUTPUT:
+        print(f"Full API Response: {json.dumps(contents, ensure_ascii=False, indent=2)}")
     
     if contents.get('Status') != '200':
+        if strict:
+            check_status(contents, "Inventory Balance Status")
         error = contents.get('Error', {})
         print(f"Inventory Balance Status API error: Status={contents.get('Status')}, Message={error.get('Message')}")
         return []
 
     data_container = contents.get('Data', None)
-    print(f"Data container type: {type(data_container)}")
-    print(f"Data container keys: {list(data_container.keys()) if isinstance(data_container, dict) else 'Not a dict'}")
-    
-    # TotalCnt 확인
-    if isinstance(data_container, dict):
-        total_cnt = data_container.get('TotalCnt', 'NOT_FOUND')
-        print(f"TotalCnt: {total_cnt}")
+    if DEBUG_OUTPUT:
+        print(f"Data container type: {type(data_container)}")
+        print(f"Data container keys: {list(data_container.keys()) if isinstance(data_container, dict) else 'Not a dict'}")
+        
+        # TotalCnt 확인
+        if isinstance(data_container, dict):
+            total_cnt = data_container.get('TotalCnt', 'NOT_FOUND')
+            print(f"TotalCnt: {total_cnt}")
     
     items = []
     
     if isinstance(data_container, dict):
         # Result 키에서 데이터 추출
         result_data = data_container.get('Result', [])
-        print(f"Result data type: {type(result_data)}, length: {len(result_data) if isinstance(result_data, list) else 'Not a list'}")
+        if DEBUG_OUTPUT:
+            print(f"Result data type: {type(result_data)}, length: {len(result_data) if isinstance(result_data, list) else 'Not a list'}")
         
         if isinstance(result_data, list):
             items = result_data
-            if result_data:
+            if result_data and DEBUG_OUTPUT:
                 print(f"First result item: {result_data[0]}")
         else:
             # 다른 가능한 키들도 시도
@@ -314,204 +703,308 @@ def run_inventory_balance_status(session_id, zone, base_date="", wh_cd="", prod_
                 if isinstance(value, list):
                     items = value
                     print(f"Found data in '{key}' key, length: {len(value)}")
-                    if value:
+                    if value and DEBUG_OUTPUT:
                         print(f"First item from '{key}': {value[0]}")
                     break
     elif isinstance(data_container, list):
         items = data_container
 
-    # 재고현황 관련 필드들 추출 (창고별 재고와는 다른 구조)
-    balance_data = []
-    for m in items:
-        balance_row = [
-            m.get('PROD_CD'),         # 품목코드
-            m.get('BAL_QTY'),         # 재고수량
-            # 추가 필드가 있다면 여기에 추가
-        ]
-        balance_data.append(balance_row)
-
-    print(f"Inventory Balance Status rows: {len(balance_data)}")
-    if balance_data:
-        print("Sample data (first 5 rows):")
-        for i, row in enumerate(balance_data[:5]):
-            print(f"  품목 {i+1}: 코드={row[0]} | 재고수량={row[1]}")
-        
     print(f"Total Count from API: {data_container.get('TotalCnt') if isinstance(data_container, dict) else 'N/A'}")
-    print(f"기준일자: {base_date}")
+    return items
+
+def _balance_row(m, wh_cd=""):
+    """재고현황 item -> [PROD_CD, BAL_QTY, WH_CD]
     
-    return balance_data
+    단일/여러 창고 조회(ecount.fanout.merge_balance_rows)와 NDJSON 모두 이 형식이다.
+    WH_CD는 응답의 창고코드, 없으면 요청한 창고코드 (창고 구분 없는 전체 합계면 빈 값).
+    """
+    return [
+        m.get('PROD_CD'),             # 품목코드
+        m.get('BAL_QTY'),             # 재고수량
+        m.get('WH_CD') or wh_cd,      # 창고코드
+    ]
+
+async def run_inventory_lookup_async(client):
+    """run_inventory_lookup의 asyncio 버전 (client: ecount.aio.AsyncClient)"""
+    return await client.call(run_inventory_lookup)
+
+async def run_orderlist_lookup_async(client, date_from, date_to):
+    """run_orderlist_lookup의 asyncio 버전"""
+    return await client.call(run_orderlist_lookup, date_from, date_to)
+
+async def run_product_basic_lookup_async(client, prod_cd="", prod_type=""):
+    """run_product_basic_lookup의 asyncio 버전"""
+    return await client.call(run_product_basic_lookup, prod_cd, prod_type)
+
+async def run_inventory_balance_status_async(client, base_date, wh_cd="", prod_cd=""):
+    """run_inventory_balance_status의 asyncio 버전"""
+    return await client.call(run_inventory_balance_status, base_date, wh_cd, prod_cd)
+
+def get_async_client(max_concurrency=DEFAULT_DASHBOARD_CONCURRENCY):
+    """프로세스 공용 세션/연결 풀을 쓰는 asyncio 클라이언트"""
+    from ecount.aio import AsyncClient
+    return AsyncClient(call_with_session, max_concurrency)
+
+@_with_cache_stats
+def dashboard_snapshot_result(max_concurrency=DEFAULT_DASHBOARD_CONCURRENCY):
+    """대시보드용 조회 5개(창고별 재고, 최근 30일 발주서, 전체 품목, 제품, 오늘 재고현황)를 동시에 실행
+    
+    전체 소요시간은 각 호출 시간의 합이 아니라 가장 느린 호출에 가까워진다.
+    하나가 실패해도 나머지 결과는 그대로 돌려주고 실패한 항목은 errors에 담는다.
+    """
+    import asyncio
+    
+    end_date = datetime.now()
+    date_from = (end_date - timedelta(days=29)).strftime("%Y%m%d")  # 29일 전부터 (30일 제한)
+    date_to = end_date.strftime("%Y%m%d")
+    
+    calls = {
+        "inventoryByLocation": (run_inventory_lookup, ()),
+        "purchaseOrders": (run_orderlist_lookup, (date_from, date_to)),
+        # 전체 품목과 제품은 같은 전체 목록 뷰에서 (ECOUNT 품목 조회는 많아야 한 번)
+        "products": (run_product_view_lookup, ("", "")),
+        "finishedProducts": (run_product_view_lookup, ("", "1")),
+        "inventoryBalance": (run_inventory_balance_status, (date_to,)),
+    }
+    # 로그인은 동시 호출들이 기다리지 않도록 먼저 한 번만
+    get_session_manager().get()
+    results, stats = asyncio.run(get_async_client(int(max_concurrency)).gather(calls))
+    
+    return {
+        "success": all(outcome["success"] for outcome in results.values()),
+        "data": {name: outcome.get("result") for name, outcome in results.items()},
+        "counts": {name: len(outcome["result"]) for name, outcome in results.items() if outcome["success"]},
+        "errors": {name: outcome["error"] for name, outcome in results.items() if not outcome["success"]},
+        "callMs": {name: outcome["ms"] for name, outcome in results.items()},
+        "dateRange": {"from": date_from, "to": date_to},
+        "stats": stats
+    }
+
+def run_dashboard_snapshot_json(max_concurrency=DEFAULT_DASHBOARD_CONCURRENCY):
+    """대시보드 스냅샷 결과를 JSON 형태로 반환"""
+    _configure_utf8_stdout()
+    
+    try:
+        result = dashboard_snapshot_result(max_concurrency)
+    except Exception as e:
+        result = {
+            "success": False,
+            "error": str(e),
+            "data": {}
+        }
+    _print_json_result(result)
+    return result
 
 def test_all_apis():
-    """모든 API를 테스트하는 함수"""
+    """모든 API를 테스트하는 함수 (서로 독립적인 조회이므로 동시에 실행)"""
     try:
         print("=== ECOUNT API 테스트 시작 ===")
         
-        # 1. Zone 정보 및 로그인
-        zone_info = get_zone_info(COM_CODE, use_test=USE_TEST_API)
-        zone_value = zone_info.get('ZONE') if zone_info.get('ZONE') else DEFAULT_ZONE
-        session_id_value = api_login_oapilogin(COM_CODE, USER_ID, API_CERT_KEY, zone_value, use_test=USE_TEST_API)
-        time.sleep(1)
-        
-        print("\n=== 1. 재고 조회 테스트 ===")
-        inventory_result = run_inventory_lookup(session_id_value, zone_value)
-        
-        print("\n=== 2. 발주서 조회 테스트 ===")
-        # 최근 30일간의 발주서 조회
-        from datetime import datetime, timedelta
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=29)  # 29일 전부터 (30일 제한)
-        
-        date_from = start_date.strftime("%Y%m%d")
-        date_to = end_date.strftime("%Y%m%d")
-        
-        print(f"조회 기간: {date_from} ~ {date_to}")
-        order_result = run_orderlist_lookup(session_id_value, zone_value, date_from, date_to)
-        
-        print("\n=== 3. 품목 기본정보 조회 테스트 ===")
-        print("전체 품목 조회:")
-        product_basic_result = run_product_basic_lookup(session_id_value, zone_value)
-        
-        print("\n제품만 조회 (PROD_TYPE=1):")
-        product_only_result = run_product_basic_lookup(session_id_value, zone_value, prod_type="1")
-        
-        print("\n=== 4. 재고현황 조회 테스트 ===")
-        from datetime import datetime
-        today = datetime.now().strftime("%Y%m%d")
-        print(f"오늘 날짜({today}) 기준 재고현황 조회:")
-        balance_status_result = run_inventory_balance_status(session_id_value, zone_value, base_date=today)
+        snapshot = dashboard_snapshot_result()
         
         print("\n=== 테스트 결과 요약 ===")
-        print(f"창고별 재고 조회 결과: {len(inventory_result)}개 창고별 품목")
-        print(f"발주서 조회 결과: {len(order_result)}개 발주서")
-        print(f"품목 기본정보 조회 결과: {len(product_basic_result)}개 품목")
-        print(f"제품만 조회 결과: {len(product_only_result)}개 제품")
-        print(f"재고현황 조회 결과: {len(balance_status_result)}개 품목")
+        print(f"조회 기간: {snapshot['dateRange']['from']} ~ {snapshot['dateRange']['to']}")
+        labels = {
+            "inventoryByLocation": "창고별 재고 조회 결과",
+            "purchaseOrders": "발주서 조회 결과",
+            "products": "품목 기본정보 조회 결과",
+            "finishedProducts": "제품만 조회 결과 (PROD_TYPE=1)",
+            "inventoryBalance": "재고현황 조회 결과",
+        }
+        for name, label in labels.items():
+            if name in snapshot['errors']:
+                print(f"{label}: 오류 - {snapshot['errors'][name]}")
+            else:
+                print(f"{label}: {snapshot['counts'][name]}건 ({snapshot['callMs'][name]}ms)")
+        stats = snapshot['stats']
+        print(f"전체 소요시간: {stats['elapsedMs']}ms (순차 실행 시 약 {stats['sumMs']}ms)")
         
     except Exception as e:
         print(f"테스트 중 오류 발생: {e}")
 
-def run_purchase_orders_json(date_from="", date_to=""):
-    """발주서 조회하여 JSON 형태로 반환"""
-    import sys
-    import io
-    
-    # stdout을 UTF-8로 설정
+def _configure_utf8_stdout():
+    """stdout을 UTF-8로 설정"""
     if hasattr(sys.stdout, 'reconfigure'):
         sys.stdout.reconfigure(encoding='utf-8')
     else:
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+def _print_json_result(result):
+    """Node 쪽에서 파싱할 수 있도록 JSON_RESULT_START/END 마커 사이에 결과 출력
+
+    단계 시간 측정 중이면(CLI 명령) 결과 객체에 "timings"(ecount.timings summary)를 붙인다.
+    """
+    from ecount.timings import current
+    
+    with phase("serialize"):
+        text = json.dumps(result, ensure_ascii=False, indent=None)
+    recorder = current()
+    if recorder is not None and isinstance(result, dict) and result and "timings" not in result:
+        # 직렬화 시간까지 담기 위해 직렬화한 뒤 마지막 "}" 앞에 timings를 덧붙인다
+        text = f'{text[:-1]}, "timings": {json.dumps(recorder.summary())}}}'
+    print("JSON_RESULT_START")
+    print(text)
+    print("JSON_RESULT_END")
+    sys.stdout.flush()
+
+@_with_cache_stats
+def purchase_orders_result(date_from="", date_to="", page_size=DEFAULT_PAGE_SIZE):
+    """발주서 조회 결과를 dict로 반환 (JSON 명령과 워커 공용)"""
+    # 기본값 설정 (기간 제한 없음 - 30일 초과 기간은 구간으로 나눠 조회)
+    if not date_to:
+        date_to = datetime.now().strftime("%Y%m%d")
+    if not date_from:
+        start_date = datetime.strptime(date_to, "%Y%m%d") - timedelta(days=29)
+        date_from = start_date.strftime("%Y%m%d")
+    
+    order_data, range_stats = call_with_session(run_orderlist_lookup_range, date_from, date_to, page_size)
+    
+    return {
+        "success": True,
+        "data": order_data,
+        "count": len(order_data),
+        "dateRange": {"from": date_from, "to": date_to},
+        "pagination": range_stats
+    }
+
+@_with_cache_stats
+def inventory_balance_result(base_date="", wh_cd="", prod_cd=""):
+    """재고현황 조회 결과를 dict로 반환 (JSON 명령과 워커 공용)
+    
+    wh_cd/prod_cd에 여러 코드("W1,W2" 또는 리스트)를 주면 inventory_balance_multi_result로 처리한다.
+    data 행은 어느 쪽이든 [PROD_CD, BAL_QTY, WH_CD] (_balance_row)
+    """
+    from ecount.fanout import split_codes
+    
+    # 기본값 설정
+    if not base_date:
+        base_date = datetime.now().strftime("%Y%m%d")
     
+    wh_codes = split_codes(wh_cd)
+    prod_codes = split_codes(prod_cd)
+    if len(wh_codes) > 1 or len(prod_codes) > 1:
+        return inventory_balance_multi_result(base_date, wh_codes, prod_codes)
+    
+    inventory_data = call_with_session(run_inventory_balance_status, base_date,
+                                       wh_codes[0] if wh_codes else "", prod_codes[0] if prod_codes else "")
+    
+    return {
+        "success": True,
+        "data": inventory_data,
+        "count": len(inventory_data),
+        "baseDate": base_date
+    }
+
+def _estimated_catalog_rows():
+    """필터 없는 재고현황 응답 행 수 추정 (컬럼형 품목 테이블이 있으면 그 품목 수)"""
     try:
-        zone_info = get_zone_info(COM_CODE, use_test=USE_TEST_API)
-        zone_value = zone_info.get('ZONE') if zone_info.get('ZONE') else DEFAULT_ZONE
-        session_id_value = api_login_oapilogin(COM_CODE, USER_ID, API_CERT_KEY, zone_value, use_test=USE_TEST_API)
-        time.sleep(1)
-        
-        # 기본값 설정
-        if not date_from:
-            from datetime import datetime, timedelta
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=29)
-            date_from = start_date.strftime("%Y%m%d")
-            date_to = end_date.strftime("%Y%m%d")
-        
-        order_data = run_orderlist_lookup(session_id_value, zone_value, date_from, date_to)
-        
-        result = {
-            "success": True,
-            "data": order_data,
-            "count": len(order_data),
-            "dateRange": {"from": date_from, "to": date_to}
+        table = get_product_store()
+    except (OSError, ValueError):
+        return None
+    return len(table) if table is not None else None
+
+def inventory_balance_multi_result(base_date, wh_codes, prod_codes, max_workers=DEFAULT_FANOUT_WORKERS):
+    """여러 창고/품목 재고현황을 한 번에 조회
+    
+    조합별 필터 호출과 필터 없는 호출 + 로컬 필터 중 예상 시간이 짧은 계획을 골라 동시에 실행하고,
+    결과를 (WH_CD, PROD_CD) 기준으로 중복 없이 합친다.
+    
+    Args:
+        base_date: 기준일자 (YYYYMMDD)
+        wh_codes: 창고코드 리스트 (비면 전체 창고 합계)
+        prod_codes: 품목코드 리스트 (비면 전체 품목)
+        max_workers: 동시 호출 수
+    
+    Returns:
+        data 행은 [PROD_CD, BAL_QTY, WH_CD] (단일 조회와 같은 형식)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from ecount.fanout import merge_balance_rows, plan_balance_fanout
+    
+    plan = plan_balance_fanout(wh_codes, prod_codes, _estimated_catalog_rows(), max_workers)
+    print(f"Inventory fan-out: {plan['strategy']} ({len(plan['requests'])} calls, ~{plan['estimatedMs']}ms)")
+    
+    def fetch(request):
+        return call_with_session(_fetch_balance_items, base_date, request[0], request[1])
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(plan['requests'])))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, fetch, request) for request in plan['requests']]
+        batches = [(request[0], future.result()) for request, future in zip(plan['requests'], futures)]
+    inventory_data, duplicates = merge_balance_rows(batches, prod_codes)
+    
+    return {
+        "success": True,
+        "data": inventory_data,
+        "count": len(inventory_data),
+        "baseDate": base_date,
+        "warehouses": wh_codes,
+        "products": prod_codes,
+        "plan": {
+            "strategy": plan['strategy'],
+            "calls": len(plan['requests']),
+            "estimatedMs": plan['estimatedMs'],
+            "alternatives": plan['alternatives'],
+            "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+            "duplicates": duplicates
         }
-        
-        print("JSON_RESULT_START")
-        print(json.dumps(result, ensure_ascii=False, indent=None))
-        print("JSON_RESULT_END")
-        sys.stdout.flush()
-        
-        return result
-        
+    }
+
+@_with_cache_stats
+def product_basic_result(prod_cd="", prod_type=""):
+    """품목 기본정보 조회 결과를 dict로 반환 (JSON 명령과 워커 공용)
+    
+    조건 조회도 전체 품목 뷰(run_product_view_lookup)에서 답한다. prod_cd/prod_type은 여러 값 가능("A,B").
+    """
+    product_data = call_with_session(run_product_view_lookup, prod_cd, prod_type)
+    
+    return {
+        "success": True,
+        "data": product_data,
+        "count": len(product_data)
+    }
+
+def run_purchase_orders_json(date_from="", date_to="", page_size=DEFAULT_PAGE_SIZE):
+    """발주서 조회하여 JSON 형태로 반환"""
+    _configure_utf8_stdout()
+    
+    try:
+        result = purchase_orders_result(date_from, date_to, page_size)
     except Exception as e:
-        error_result = {
+        result = {
             "success": False,
             "error": str(e),
             "data": []
         }
-        print("JSON_RESULT_START")
-        print(json.dumps(error_result, ensure_ascii=False, indent=None))
-        print("JSON_RESULT_END")
-        sys.stdout.flush()
-        return error_result
+    _print_json_result(result)
+    return result
 
 def run_inventory_balance_status_json(base_date="", wh_cd="", prod_cd=""):
     """재고현황 조회하여 JSON 형태로 반환"""
-    import sys
-    import io
-    
-    # stdout을 UTF-8로 설정
-    if hasattr(sys.stdout, 'reconfigure'):
-        sys.stdout.reconfigure(encoding='utf-8')
-    else:
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    _configure_utf8_stdout()
     
     try:
-        zone_info = get_zone_info(COM_CODE, use_test=USE_TEST_API)
-        zone_value = zone_info.get('ZONE') if zone_info.get('ZONE') else DEFAULT_ZONE
-        session_id_value = api_login_oapilogin(COM_CODE, USER_ID, API_CERT_KEY, zone_value, use_test=USE_TEST_API)
-        time.sleep(1)
-        
-        # 기본값 설정
-        if not base_date:
-            from datetime import datetime
-            base_date = datetime.now().strftime("%Y%m%d")
-        
-        inventory_data = run_inventory_balance_status(session_id_value, zone_value, base_date, wh_cd, prod_cd)
-        
+        result = inventory_balance_result(base_date, wh_cd, prod_cd)
+    except Exception as e:
         result = {
-            "success": True,
-            "data": inventory_data,
-            "count": len(inventory_data),
-            "baseDate": base_date
-        }
-        
-        print("JSON_RESULT_START")
-        print(json.dumps(result, ensure_ascii=False, indent=None))
-        print("JSON_RESULT_END")
-        sys.stdout.flush()
-        
-        return result
-        
-    except Exception as e:
-        error_result = {
             "success": False,
             "error": str(e),
             "data": []
         }
-        print("JSON_RESULT_START")
-        print(json.dumps(error_result, ensure_ascii=False, indent=None))
-        print("JSON_RESULT_END")
-        sys.stdout.flush()
-        return error_result
+    _print_json_result(result)
+    return result
 
-def get_materials_management():
-    """자재관리 데이터에서 제품 정보를 조회하여 반환 - Memory Product Service용"""
-    import sys
-    import io
+@_with_cache_stats
+def get_materials_management(strict=False):
+    """자재관리 데이터에서 제품 정보를 조회하여 반환 - Memory Product Service용
     
-    # stdout을 UTF-8로 설정
-    if hasattr(sys.stdout, 'reconfigure'):
-        sys.stdout.reconfigure(encoding='utf-8')
-    else:
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    strict=True면 ECOUNT 오류 Status를 빈 목록 대신 success=False로 (카탈로그 동기화용)
+    """
+    _configure_utf8_stdout()
     
     try:
-        zone_info = get_zone_info(COM_CODE, use_test=USE_TEST_API)
-        zone_value = zone_info.get('ZONE') if zone_info.get('ZONE') else DEFAULT_ZONE
-        session_id_value = api_login_oapilogin(COM_CODE, USER_ID, API_CERT_KEY, zone_value, use_test=USE_TEST_API)
-        time.sleep(1)
-        
         # 모든 제품 정보 조회 (prod_cd="", prod_type="" = 전체 조회)
-        product_basic_result = run_product_basic_lookup(session_id_value, zone_value, "", "")
+        product_basic_result = call_with_session(run_product_view_lookup, "", "", strict=strict)
         
         # Memory Product Service에서 요구하는 형태로 변환 (prodCd, prodNm)
         products = []
@@ -541,65 +1034,1018 @@ def get_materials_management():
 
 def run_product_basic_lookup_json(prod_cd="", prod_type=""):
     """품목 기본정보 조회하여 JSON 형태로 반환"""
-    import sys
-    import io
+    _configure_utf8_stdout()
     
-    # stdout을 UTF-8로 설정
-    if hasattr(sys.stdout, 'reconfigure'):
-        sys.stdout.reconfigure(encoding='utf-8')
+    try:
+        result = product_basic_result(prod_cd, prod_type)
+    except Exception as e:
+        result = {
+            "success": False,
+            "error": str(e),
+            "data": []
+        }
+    _print_json_result(result)
+    return result
+
+@_with_cache_stats
+def catalog_sync_result(since_version=None):
+    """품목 카탈로그 증분 동기화 - 스냅샷 대비 추가/삭제/변경된 품목만 반환
+    
+    조회가 실패하거나 빈 목록이면 success=False이고 스냅샷은 그대로 둔다
+    (빈 목록을 비교하면 모든 품목이 removed가 되어 Node 카탈로그가 비워진다).
+    
+    Args:
+        since_version: 호출 측이 마지막으로 적용한 스냅샷 버전 (없으면 변경분만 반환)
+    """
+    from ecount.catalog_sync import sync_catalog
+    from ecount.ratelimit import BACKGROUND, priority as rate_priority
+    
+    # 백그라운드 동기화이므로 대화형 조회보다 뒤로 양보
+    with rate_priority(BACKGROUND):
+        materials = get_materials_management(strict=True)
+    if not materials.get('success'):
+        return {"success": False, "error": materials.get('error') or '제품 정보 조회 실패'}
+    if not materials['data']:
+        return {"success": False, "error": "ECOUNT에서 받은 품목 목록이 비어 있어 카탈로그를 갱신하지 않았습니다"}
+    
+    since = int(since_version) if since_version not in (None, "") else None
+    delta = sync_catalog(materials['data'], _tenant_file(CATALOG_SNAPSHOT_PATH), _catalog_seed_path(), since)
+    print(f"Catalog sync: v{delta['baseVersion']} -> v{delta['version']}, {delta['counts']}")
+    return {"success": True, **delta}
+
+def run_catalog_sync_json(since_version=None):
+    """품목 카탈로그 증분 동기화 결과를 JSON 형태로 반환"""
+    _configure_utf8_stdout()
+    
+    try:
+        result = catalog_sync_result(since_version)
+    except Exception as e:
+        result = {
+            "success": False,
+            "error": str(e)
+        }
+    _print_json_result(result)
+    return result
+
+def build_search_index_result(source="ecount"):
+    """품목 검색 인덱스를 만들어 SEARCH_INDEX_PATH에 저장
+    
+    Args:
+        source: "ecount"면 get_materials_management로 카탈로그를 새로 받고,
+                "snapshot"이면 카탈로그 동기화 스냅샷(없으면 products_data.json)을 사용
+    """
+    from ecount.ratelimit import BACKGROUND, priority as rate_priority
+    from ecount.search_index import ProductSearchIndex
+    
+    if source == "snapshot":
+        from ecount.catalog_sync import load_snapshot
+        snapshot = load_snapshot(_tenant_file(CATALOG_SNAPSHOT_PATH), _catalog_seed_path())
+        products = [{'prodCd': prod_cd, 'prodNm': entry['prodNm']} for prod_cd, entry in snapshot['products'].items()]
     else:
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+        with rate_priority(BACKGROUND):
+            materials = get_materials_management()
+        if not materials.get('success'):
+            raise RuntimeError(materials.get('error') or '제품 정보 조회 실패')
+        products = materials['data']
+    
+    path = _tenant_file(SEARCH_INDEX_PATH)
+    started = time.perf_counter()
+    index = ProductSearchIndex.build(products)
+    index.save(path)
+    build_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    print(f"Search index: {len(index)} products -> {path}")
+    return {
+        "success": True,
+        "count": len(index),
+        "bytes": os.path.getsize(path),
+        "buildMs": build_ms,
+        "source": source
+    }
+
+def get_search_index():
+    """검색 인덱스 로드 (파일이 바뀌었을 때만 다시 읽음)"""
+    from ecount.search_index import ProductSearchIndex
+    
+    path = _tenant_file(SEARCH_INDEX_PATH)
+    state = _tenant_resource("search_index", lambda tenant: {"index": None, "mtime": None})
+    mtime = os.path.getmtime(path)
+    if state["index"] is None or mtime != state["mtime"]:
+        state["index"] = ProductSearchIndex.load(path)
+        state["mtime"] = mtime
+    return state["index"]
+
+def product_search_result(query, limit=15):
+    """품목 검색 (품목코드 접두어, 품목명 부분 문자열, 한글 초성)
+    
+    Args:
+        query: 검색어 (예: "허브큐어", "A0001", "ㅎㅂㅋㅇ")
+        limit: 최대 결과 수
+    """
+    if not os.path.exists(_tenant_file(SEARCH_INDEX_PATH)):
+        build_search_index_result("snapshot")
+    index = get_search_index()
+    
+    started = time.perf_counter()
+    matches = index.search(query, int(limit))
+    search_ms = round((time.perf_counter() - started) * 1000, 3)
+    
+    return {
+        "success": True,
+        "query": query,
+        "data": matches,
+        "count": len(matches),
+        "searchMs": search_ms
+    }
+
+def run_search_index_build_json(source="ecount"):
+    """품목 검색 인덱스 생성 결과를 JSON 형태로 반환"""
+    _configure_utf8_stdout()
     
     try:
-        zone_info = get_zone_info(COM_CODE, use_test=USE_TEST_API)
-        zone_value = zone_info.get('ZONE') if zone_info.get('ZONE') else DEFAULT_ZONE
-        session_id_value = api_login_oapilogin(COM_CODE, USER_ID, API_CERT_KEY, zone_value, use_test=USE_TEST_API)
-        time.sleep(1)
-        
-        product_data = run_product_basic_lookup(session_id_value, zone_value, prod_cd, prod_type)
-        
+        result = build_search_index_result(source)
+    except Exception as e:
         result = {
-            "success": True,
-            "data": product_data,
-            "count": len(product_data)
+            "success": False,
+            "error": str(e)
         }
-        
-        print("JSON_RESULT_START")
-        print(json.dumps(result, ensure_ascii=False, indent=None))
-        print("JSON_RESULT_END")
-        sys.stdout.flush()
-        
-        return result
-        
+    _print_json_result(result)
+    return result
+
+def run_product_search_json(query, limit=15):
+    """품목 검색 결과를 JSON 형태로 반환"""
+    _configure_utf8_stdout()
+    
+    try:
+        result = product_search_result(query, limit)
     except Exception as e:
-        error_result = {
+        result = {
             "success": False,
             "error": str(e),
             "data": []
         }
-        print("JSON_RESULT_START")
-        print(json.dumps(error_result, ensure_ascii=False, indent=None))
-        print("JSON_RESULT_END")
-        sys.stdout.flush()
-        return error_result
+    _print_json_result(result)
+    return result
 
-if __name__ == "__main__":
-    import sys
-    import io
+def build_product_store_result():
+    """품목 기본정보 전체를 받아 컬럼형 품목 테이블(PRODUCT_STORE_PATH의 새 버전 파일)로 저장"""
+    from ecount.columnar import ProductTable, save_version
+    from ecount.ratelimit import BACKGROUND, priority as rate_priority
     
-    # stdout을 UTF-8로 설정
-    if hasattr(sys.stdout, 'reconfigure'):
-        sys.stdout.reconfigure(encoding='utf-8')
+    with rate_priority(BACKGROUND):
+        rows = call_with_session(run_product_basic_lookup, "", "", strict=True)
+    if not rows:
+        raise ValueError("Refusing to build the product store from an empty product list")
+    
+    path = _tenant_file(PRODUCT_STORE_PATH)
+    started = time.perf_counter()
+    table = ProductTable.from_rows(rows)
+    path = save_version(table, path)
+    build_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    json_bytes = len(json.dumps(rows, ensure_ascii=False).encode('utf-8'))
+    print(f"Product store: {len(table)} products -> {path}")
+    return {
+        "success": True,
+        "count": len(table),
+        "bytes": os.path.getsize(path),
+        "jsonBytes": json_bytes,
+        "buildMs": build_ms
+    }
+
+def get_product_store(build_missing=False, max_age=0):
+    """컬럼형 품목 테이블 로드 (새 버전 파일이 생겼을 때만 다시 mmap, 파일이 없으면 None)
+    
+    Args:
+        build_missing: 테이블 파일이 없으면 ECOUNT에서 받아 새로 만든다
+        max_age: 0보다 크면 파일이 이보다(초) 오래됐을 때 ECOUNT에서 받아 다시 만든다 (실패하면 예외)
+    """
+    from ecount.columnar import ProductTable, latest_version
+    
+    path = latest_version(_tenant_file(PRODUCT_STORE_PATH))
+    stale = path is not None and max_age > 0 and time.time() - os.path.getmtime(path) > max_age
+    if path is None or stale:
+        if path is None and not build_missing:
+            return None
+        build_product_store_result()
+        path = latest_version(_tenant_file(PRODUCT_STORE_PATH))
+    state = _tenant_resource("product_store", lambda tenant: {"table": None, "path": None})
+    if state["table"] is None or path != state["path"]:
+        # 이전 테이블은 다른 스레드가 읽고 있을 수 있으므로 닫지 않고 참조가 사라질 때 해제되게 둔다
+        # (갱신은 항상 새 버전 파일에 쓰므로 열린 파일을 덮어쓰지 않는다)
+        state["table"] = ProductTable.open(path)
+        state["path"] = path
+    return state["table"]
+
+def product_store_result(prod_cd="", prod_type=""):
+    """컬럼형 품목 테이블에서 품목 기본정보 조회 (ECOUNT 호출 없음, 행 형식과 값(단가/수량 문자열 포함)은 product_basic_json과 같음)
+    
+    Args:
+        prod_cd: 품목코드 (쉼표로 여러 개 가능, 비우면 전체)
+        prod_type: 품목구분 (쉼표로 여러 개 가능, 비우면 전체)
+    """
+    table = get_product_store(build_missing=True)
+    
+    started = time.perf_counter()
+    codes = set(filter(None, prod_cd.split(','))) if prod_cd else None
+    types = set(filter(None, prod_type.split(','))) if prod_type else None
+    code_column = table.column('PROD_CD')
+    type_column = table.column('PROD_TYPE')
+    data = [
+        table.row(index) for index in range(len(table))
+        if (codes is None or code_column[index] in codes) and (types is None or type_column[index] in types)
+    ]
+    
+    return {
+        "success": True,
+        "data": data,
+        "count": len(data),
+        "queryMs": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+def run_product_store_build_json():
+    """컬럼형 품목 테이블 생성 결과를 JSON 형태로 반환"""
+    _configure_utf8_stdout()
+    
+    try:
+        result = build_product_store_result()
+    except Exception as e:
+        result = {
+            "success": False,
+            "error": str(e)
+        }
+    _print_json_result(result)
+    return result
+
+def run_product_store_json(prod_cd="", prod_type=""):
+    """컬럼형 품목 테이블 조회 결과를 JSON 형태로 반환"""
+    _configure_utf8_stdout()
+    
+    try:
+        result = product_store_result(prod_cd, prod_type)
+    except Exception as e:
+        result = {
+            "success": False,
+            "error": str(e),
+            "data": []
+        }
+    _print_json_result(result)
+    return result
+
+def cache_invalidate_result(endpoint=""):
+    """조회 응답 캐시 삭제
+    
+    Args:
+        endpoint: 엔드포인트 이름 (예: "GetBasicProductsList"), 비우면 전체
+    """
+    if endpoint in ("", "GetBasicProductsList"):
+        get_catalog_views().invalidate()
+    cache = get_response_cache()
+    if cache is None:
+        return {"success": True, "removed": 0, "enabled": False}
+    removed = cache.invalidate(endpoint or None)
+    print(f"Response cache: removed {removed} entries ({endpoint or 'all'})")
+    return {"success": True, "removed": removed, "endpoint": endpoint or None}
+
+def cache_stats_result():
+    """조회 응답 캐시 통계 (이 프로세스의 적중/실패 횟수, 엔드포인트별 항목 수)"""
+    cache = get_response_cache()
+    if cache is None:
+        return {"success": True, "enabled": False}
+    return {"success": True, "enabled": True, **cache.stats()}
+
+def run_cache_invalidate_json(endpoint=""):
+    """조회 응답 캐시 삭제 결과를 JSON 형태로 반환"""
+    _configure_utf8_stdout()
+    
+    try:
+        result = cache_invalidate_result(endpoint)
+    except Exception as e:
+        result = {
+            "success": False,
+            "error": str(e)
+        }
+    _print_json_result(result)
+    return result
+
+def get_mirror():
+    """테넌트별 로컬 SQLite 미러"""
+    from ecount.mirror import Mirror
+    return _tenant_resource("mirror", lambda tenant: Mirror(_tenant_file(MIRROR_PATH)))
+
+def mirror_sync_result(datasets="products,inventory,orders", allow_empty=False):
+    """ECOUNT 데이터를 로컬 미러에 동기화 (백그라운드 우선순위)
+    
+    ECOUNT 오류 Status는 빈 결과가 아니라 그 데이터셋의 실패로 처리한다 (errors에 담고 기존 행과 watermark는 그대로).
+    
+    Args:
+        datasets: 쉼표로 구분한 대상 (products, inventory, orders)
+            - products: 전체 품목 upsert
+            - inventory: 오늘 기준 재고현황 (창고별)
+            - orders: 마지막 동기화일 - MIRROR_ORDER_OVERLAP_DAYS부터 오늘까지 (처음이면 MIRROR_ORDER_DAYS일)
+        allow_empty: True면 빈 조회 결과로 비어 있지 않은 products/inventory 테이블을 비우는 것을 허용
+    """
+    from ecount.fanout import merge_balance_rows, split_codes
+    from ecount.ratelimit import BACKGROUND, priority as rate_priority
+    
+    if isinstance(allow_empty, str):
+        allow_empty = allow_empty.lower() in ("1", "true", "yes", "allow_empty")
+    mirror = get_mirror()
+    targets = split_codes(datasets)
+    today = datetime.now().strftime("%Y%m%d")
+    synced = {}
+    errors = {}
+    
+    def sync_products():
+        rows = call_with_session(run_product_basic_lookup, "", "", strict=True)
+        return mirror.sync_products(rows, round((time.perf_counter() - started) * 1000, 1), allow_empty)
+    
+    def sync_inventory():
+        items = call_with_session(_fetch_balance_items, today, "", "", strict=True)
+        rows, _ = merge_balance_rows([("", items)])
+        return mirror.sync_inventory(today, rows, round((time.perf_counter() - started) * 1000, 1), allow_empty)
+    
+    def sync_orders():
+        watermark = mirror.watermarks().get('purchase_orders', {}).get('watermark')
+        if watermark:
+            start = datetime.strptime(watermark, "%Y%m%d") - timedelta(days=MIRROR_ORDER_OVERLAP_DAYS)
+        else:
+            start = datetime.now() - timedelta(days=MIRROR_ORDER_DAYS - 1)
+        date_from = min(start.strftime("%Y%m%d"), today)
+        rows, _ = call_with_session(run_orderlist_lookup_range, date_from, today, strict=True)
+        return mirror.sync_orders(date_from, today, rows, round((time.perf_counter() - started) * 1000, 1))
+    
+    with rate_priority(BACKGROUND):
+        for name, sync in (("products", sync_products), ("inventory", sync_inventory), ("orders", sync_orders)):
+            if name not in targets:
+                continue
+            started = time.perf_counter()
+            try:
+                synced[name] = sync()
+            except Exception as e:
+                # 한 데이터셋이 실패해도 나머지는 동기화한다
+                errors[name] = str(e)
+    
+    print(f"Mirror sync: {synced}" + (f", errors: {errors}" if errors else ""))
+    return {"success": not errors, "synced": synced, "errors": errors, "watermarks": mirror.watermarks()}
+
+def mirror_products_result(prod_cd="", class_cd="", prod_type="", limit=None):
+    """미러에서 품목 조회 (각 조건은 쉼표로 여러 개 가능)
+    
+    Returns:
+        data 행은 product_basic_json과 같은 15개 필드 배열
+    """
+    from ecount.fanout import split_codes
+    from ecount.mirror import PRODUCT_FIELDS
+    
+    mirror = get_mirror()
+    rows = mirror.products(split_codes(prod_cd), split_codes(class_cd), split_codes(prod_type), limit)
+    data = [[row[field] for field in PRODUCT_FIELDS] for row in rows]
+    return {
+        "success": True,
+        "data": data,
+        "count": len(data),
+        "syncedAt": mirror.watermarks().get('products', {}).get('syncedAt')
+    }
+
+def mirror_inventory_result(prod_cd="", wh_cd="", base_date=""):
+    """미러에서 재고현황 조회 (base_date가 없으면 가장 최근 동기화한 기준일자)
+    
+    Returns:
+        data 행은 [PROD_CD, BAL_QTY, WH_CD]
+    """
+    from ecount.fanout import split_codes
+    
+    mirror = get_mirror()
+    base_date, rows = mirror.inventory(split_codes(prod_cd), split_codes(wh_cd), base_date or None)
+    data = [[row['prod_cd'], row['bal_qty'], row['wh_cd']] for row in rows]
+    return {
+        "success": True,
+        "data": data,
+        "count": len(data),
+        "baseDate": base_date,
+        "syncedAt": mirror.watermarks().get('inventory', {}).get('syncedAt')
+    }
+
+def mirror_orders_result(date_from="", date_to="", cust_des="", limit=None):
+    """미러에서 발주서 조회 (발주일자 범위, 거래처명은 쉼표로 여러 개 가능)
+    
+    Returns:
+        data 행은 purchase_orders_json과 같은 10개 필드 배열
+    """
+    from ecount.fanout import split_codes
+    from ecount.mirror import ORDER_FIELDS
+    
+    mirror = get_mirror()
+    rows = mirror.orders(date_from or None, date_to or None, split_codes(cust_des), limit)
+    data = [[row[field] for field in ORDER_FIELDS] for row in rows]
+    return {
+        "success": True,
+        "data": data,
+        "count": len(data),
+        "dateRange": {"from": date_from or None, "to": date_to or None},
+        "watermark": mirror.watermarks().get('purchase_orders', {}).get('watermark')
+    }
+
+def _fetch_balance_snapshot(base_date):
+    """기준일자 재고현황 -> [[PROD_CD, BAL_QTY, WH_CD], ...] (창고/품목 중복 제거)"""
+    from ecount.fanout import merge_balance_rows
+    
+    items = call_with_session(_fetch_balance_items, base_date, "", "", strict=True)
+    rows, _ = merge_balance_rows([("", items)])
+    return rows
+
+def get_inventory_series():
+    from ecount.timeseries import InventorySeries
+    return InventorySeries(_tenant_file(INVENTORY_SERIES_DIR))
+
+def inventory_snapshot_result(base_date=""):
+    """기준일자(기본 오늘) 재고현황을 시계열 저장소에 기록"""
+    from ecount.ratelimit import BACKGROUND, priority as rate_priority
+    
+    if not base_date:
+        base_date = datetime.now().strftime("%Y%m%d")
+    
+    series = get_inventory_series()
+    with rate_priority(BACKGROUND):
+        rows = _fetch_balance_snapshot(base_date)
+    records = series.record(base_date, rows)
+    print(f"Inventory snapshot {base_date}: {len(rows)} rows, {records} changes recorded")
+    return {"success": True, "baseDate": base_date, "rows": len(rows), "records": records, "store": series.stats()}
+
+def inventory_backfill_result(date_from, date_to="", max_workers=DEFAULT_BACKFILL_WORKERS):
+    """시계열 저장소에 없는 과거 날짜의 재고현황을 병렬로 받아 기록
+    
+    조회가 실패한 날짜는 기록하지 않고 failed에 남긴다 (빈 날로 기록되면 다음 백필에서 다시 받지 않으므로).
+    
+    Args:
+        date_from: 시작일 (YYYYMMDD)
+        date_to: 종료일 (YYYYMMDD, 기본 오늘 - 오늘 이후 날짜는 건너뜀)
+        max_workers: 동시에 조회할 날짜 수 (호출은 속도 제한기를 거친다)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from ecount.ratelimit import BACKGROUND, priority as rate_priority
+    
+    today = datetime.now().strftime("%Y%m%d")
+    date_to = min(date_to or today, today)
+    series = get_inventory_series()
+    recorded = set(series.dates())
+    
+    missing = []
+    day = datetime.strptime(date_from, "%Y%m%d")
+    while day.strftime("%Y%m%d") <= date_to:
+        if day.strftime("%Y%m%d") not in recorded:
+            missing.append(day.strftime("%Y%m%d"))
+        day += timedelta(days=1)
+    
+    started = time.perf_counter()
+    records = 0
+    batch = {}
+    failed = {}
+    with rate_priority(BACKGROUND), ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _fetch_balance_snapshot, base_date)
+                   for base_date in missing]
+        # 날짜 순으로 받아 BACKFILL_BATCH_DAYS일씩 기록 (메모리에 쌓이는 스냅샷 수 제한)
+        for base_date, future in zip(missing, futures):
+            try:
+                batch[base_date] = future.result()
+            except Exception as e:
+                failed[base_date] = str(e)
+                continue
+            if len(batch) >= BACKFILL_BATCH_DAYS:
+                records += sum(series.record_many(batch).values())
+                batch = {}
+        if batch:
+            records += sum(series.record_many(batch).values())
+    
+    print(f"Inventory backfill {date_from}~{date_to}: {len(missing) - len(failed)} days fetched, "
+          f"{len(failed)} failed, {records} changes recorded")
+    return {
+        "success": not failed,
+        "dateRange": {"from": date_from, "to": date_to},
+        "fetchedDays": len(missing) - len(failed),
+        "failed": failed,
+        "records": records,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+        "store": series.stats()
+    }
+
+def inventory_history_result(prod_cd="", wh_cd="", date_from="", date_to=""):
+    """재고 시계열 조회 (ECOUNT 호출 없음)
+    
+    Args:
+        prod_cd: 품목코드 (쉼표로 여러 개 가능, 비우면 전체)
+        wh_cd: 창고코드 (쉼표로 여러 개 가능, 비우면 전체)
+        date_from, date_to: 기간 (YYYYMMDD, 비우면 전체)
+    
+    Returns:
+        data: [{"whCd", "prodCd", "points": [[YYYYMMDD, qty], ...]}] - 기록된 날짜마다 값
+    """
+    from ecount.fanout import split_codes
+    
+    series = get_inventory_series()
+    started = time.perf_counter()
+    data = series.series(split_codes(prod_cd), split_codes(wh_cd), date_from or None, date_to or None)
+    return {
+        "success": True,
+        "data": data,
+        "count": len(data),
+        "dateRange": {"from": date_from or None, "to": date_to or None},
+        "queryMs": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+def shortage_report_result(base_date="", demand="", limit=None, include_all=False):
+    """안전재고 부족 보고서 (품목 마스터의 SAFE_QTY/MIN_QTY와 재고현황 BAL_QTY를 NumPy로 조인)
+    
+    품목 마스터는 컬럼형 품목 테이블에서 읽는다. 테이블이 없거나 PRODUCT_STORE_MAX_AGE보다 오래됐으면
+    먼저 다시 만든다 (결과의 productsAgeSeconds가 사용한 테이블의 나이). 재고현황은 기준일자로 조회한다.
+    품목 테이블 갱신이나 재고현황 조회가 실패하면 success=False (재고를 0으로 보고 부족을 보고하지 않는다).
+    
+    Args:
+        base_date: 재고 기준일자 (YYYYMMDD, 기본 오늘)
+        demand: 품목별 일평균 수요 - {"A0001": 3.5} 형태 JSON 문자열, JSON 파일 경로 또는 dict
+        limit: 최대 행 수
+        include_all: True면 부족하지 않은 품목도 포함 (CLI에서는 "all", "true", "1", "yes")
+    """
+    from ecount.columnar import latest_version
+    from ecount.shortage import shortage_report
+    
+    if isinstance(include_all, str):
+        include_all = include_all.lower() in ("1", "true", "yes", "all")
+    if not base_date:
+        base_date = datetime.now().strftime("%Y%m%d")
+    if isinstance(demand, str) and demand:
+        if demand.lstrip().startswith('{'):
+            demand = json.loads(demand)
+        else:
+            with open(demand, encoding='utf-8') as f:
+                demand = json.load(f)
+    
+    try:
+        table = get_product_store(build_missing=True, max_age=PRODUCT_STORE_MAX_AGE)
+        products_age = round(time.time() - os.path.getmtime(latest_version(_tenant_file(PRODUCT_STORE_PATH))), 1)
+        balances = _fetch_balance_snapshot(base_date)
+    except Exception as e:
+        return {"success": False, "error": str(e), "data": [], "baseDate": base_date}
+    
+    started = time.perf_counter()
+    rows, summary = shortage_report(
+        list(table.column('PROD_CD')),
+        table.numeric_view('SAFE_QTY'),
+        table.numeric_view('MIN_QTY'),
+        [row[0] for row in balances],
+        [row[1] for row in balances],
+        demand=demand or None,
+        names=list(table.column('PROD_DES')),
+        include_all=bool(include_all),
+        limit=int(limit) if limit else None
+    )
+    
+    return {
+        "success": True,
+        "data": rows,
+        "count": len(rows),
+        "baseDate": base_date,
+        "productsAgeSeconds": products_age,
+        "summary": summary,
+        "analysisMs": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+def _run_json(result_func, *args):
+    """result_func(*args) 결과를 JSON_RESULT 마커 사이에 출력 (예외는 success=False로)"""
+    _configure_utf8_stdout()
+    
+    try:
+        result = result_func(*args)
+    except Exception as e:
+        result = {
+            "success": False,
+            "error": str(e),
+            "data": []
+        }
+    _print_json_result(result)
+    return result
+
+def iter_purchase_order_pages(session_id, zone, date_from, date_to, page_size=DEFAULT_PAGE_SIZE):
+    """발주서 행을 페이지가 도착하는 대로 페이지 단위 리스트로 yield (스트리밍 출력용)
+    
+    기간은 30일 구간으로 나눠 순서대로 조회하고, 구간 경계의 중복 ORD_NO는
+    run_orderlist_lookup_range와 같은 규칙으로 제거한다 (기억하는 ORD_NO는 현재 구간과 바로 앞 구간 것뿐이다).
+    """
+    from ecount.windows import split_date_range
+    
+    previous_order_nos = set()
+    for window_from, window_to in split_date_range(date_from, date_to):
+        def fetch_page(page_no, size, window_from=window_from, window_to=window_to):
+            return _fetch_order_page(session_id, zone, window_from, window_to, page_no, size)
+        
+        window_order_nos = set()
+        for items in iter_pages(fetch_page, int(page_size), DEFAULT_PAGE_WORKERS):
+            rows = []
+            for m in items:
+                row = _order_row(m)
+                window_order_nos.add(row[0])
+                if row[0] and row[0] in previous_order_nos:
+                    continue
+                rows.append(row)
+            yield rows
+        previous_order_nos = window_order_nos
+
+def iter_product_basic_pages(session_id, zone, prod_cd="", prod_type="", page_size=DEFAULT_PAGE_SIZE):
+    """품목 기본정보 행을 page_size개씩 yield (응답은 한 번이지만 디코딩하는 대로 내보낸다)"""
+    rows = []
+    for m in _fetch_product_items(session_id, zone, prod_cd, prod_type):
+        rows.append(_product_row(m))
+        if len(rows) >= page_size:
+            yield rows
+            rows = []
+    if rows:
+        yield rows
+
+def iter_inventory_balance_pages(session_id, zone, base_date, wh_cd="", prod_cd=""):
+    """재고현황 행을 yield (API가 한 번에 응답하므로 한 묶음)"""
+    yield [_balance_row(m, wh_cd) for m in _fetch_balance_items(session_id, zone, base_date, wh_cd, prod_cd)]
+
+def _stream_ndjson(iter_func, *args, meta=None):
+    """iter_func가 내놓는 행을 NDJSON으로 한 줄씩 출력하고 마지막에 trailer 출력
+    
+    조회 함수들의 디버그 출력은 행 스트림과 섞이지 않도록 stderr로 보낸다.
+    """
+    from ecount.ndjson import NdjsonWriter
+    from ecount.timings import current
+    
+    writer = NdjsonWriter(sys.stdout.buffer)
+    meta = meta or {}
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            for rows in get_session_manager().iterate(iter_func, *args):
+                with phase("serialize"):
+                    writer.rows(rows)
+        success, error = True, None
+    except Exception as e:
+        success, error = False, str(e)
+    recorder = current()
+    if recorder is not None:
+        meta = {**meta, "timings": recorder.summary()}
+    return writer.trailer(success, error=error, **meta)
+
+def run_purchase_orders_ndjson(date_from="", date_to="", page_size=DEFAULT_PAGE_SIZE):
+    """발주서 조회 결과를 NDJSON 스트림으로 출력 (행마다 한 줄, 마지막 줄은 trailer)"""
+    if not date_to:
+        date_to = datetime.now().strftime("%Y%m%d")
+    if not date_from:
+        date_from = (datetime.strptime(date_to, "%Y%m%d") - timedelta(days=29)).strftime("%Y%m%d")
+    return _stream_ndjson(iter_purchase_order_pages, date_from, date_to, page_size,
+                          meta={"dateRange": {"from": date_from, "to": date_to}})
+
+def run_inventory_balance_status_ndjson(base_date="", wh_cd="", prod_cd=""):
+    """재고현황 조회 결과를 NDJSON 스트림으로 출력"""
+    if not base_date:
+        base_date = datetime.now().strftime("%Y%m%d")
+    return _stream_ndjson(iter_inventory_balance_pages, base_date, wh_cd, prod_cd,
+                          meta={"baseDate": base_date})
+
+def run_product_basic_lookup_ndjson(prod_cd="", prod_type=""):
+    """품목 기본정보 조회 결과를 NDJSON 스트림으로 출력"""
+    return _stream_ndjson(iter_product_basic_pages, prod_cd, prod_type)
+
+def get_name_matcher():
+    """전체 품목 뷰의 품목명 매칭 인덱스 (뷰가 새로 만들어졌을 때만 다시 만듦)
+    
+    뷰가 유효한 동안은 ECOUNT 조회도 카탈로그 비교도 하지 않는다.
+    CATALOG_VIEW_TTL <= 0이면 매번 전체 목록을 받아 품목코드/품목명이 바뀌었을 때만 다시 만든다.
+    """
+    from ecount.name_match import NameMatcher
+    
+    if CATALOG_VIEW_TTL > 0:
+        view = call_with_session(_get_catalog_view)
+        rows, source = view.rows, view
     else:
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+        rows = call_with_session(run_product_basic_lookup, "", "", strict=True)
+        source = hash(tuple((row[0], row[1]) for row in rows))
+    state = _tenant_resource("name_matcher", lambda tenant: {"matcher": None, "source": None})
+    if state["matcher"] is None or state["source"] != source:
+        state["matcher"] = NameMatcher([{'prodCd': row[0], 'prodNm': row[1]} for row in rows if row[0] and row[1]])
+        state["source"] = source
+    return state["matcher"]
+
+def product_name_match_result(source, top_k=None, threshold=None, column=""):
+    """업로드 품목명(엑셀/CSV 생산계획 등)을 카탈로그 품목코드에 일괄 매칭
+    
+    Args:
+        source: 품목명 리스트, JSON 배열 문자열, "-"(stdin) 또는 파일 경로(.json/.csv/한 줄에 하나)
+        top_k: 품목명마다 돌려줄 후보 수
+        threshold: 1순위 점수가 이 이상이면 matched
+        column: CSV 파일의 품목명 열 이름 (없으면 첫 열)
     
+    Returns:
+        data: [{"name", "normalized", "matched", "prodCd", "score", "candidates"}], matched(매칭된 수)
+    """
+    from ecount.name_match import DEFAULT_THRESHOLD, DEFAULT_TOP_K, read_names
+    
+    names = read_names(source, column or None)
+    matcher = get_name_matcher()
+    
+    started = time.perf_counter()
+    data = matcher.match(
+        names,
+        int(top_k) if top_k not in (None, "") else DEFAULT_TOP_K,
+        float(threshold) if threshold not in (None, "") else DEFAULT_THRESHOLD)
+    match_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    matched = sum(1 for row in data if row["matched"])
+    print(f"Name match: {matched}/{len(data)} matched against {len(matcher)} products ({match_ms}ms)")
+    return {
+        "success": True,
+        "data": data,
+        "count": len(data),
+        "matched": matched,
+        "catalogSize": len(matcher),
+        "matchMs": match_ms
+    }
+
+def _save_bulk_lines(session_id, zone, endpoint, list_name, lines):
+    """저장 API 한 요청 (lines: BulkDatas 필드 dict 리스트)"""
+    from ecount.session import check_session
+    
+    url = f'https://{_api_base()}{zone}.ecount.com/OAPI/V2/{endpoint}?SESSION_ID={session_id}'
+    payload = {list_name: [{"BulkDatas": line} for line in lines]}
+    # 저장 요청은 전송 계층에서 재시도하지 않는다 (배치 재시도는 ecount.bulk가 판단)
+    response = http_post(url, payload, idempotent=False)
+    contents = _decode_response(response)
+    check_session(contents)
+    return contents
+
+def bulk_submit_result(kind, source, batch_limit=None, max_workers=DEFAULT_BULK_WORKERS, dry_run=False,
+                       resend_unknown=False):
+    """레코드 파일/스트림을 ECOUNT 저장 API로 일괄 전송
+    
+    Args:
+        kind: 저장 종류 (job_order, sale_order, sale, purchases, goods_issued, goods_receipt)
+        source: 레코드 JSON/NDJSON 파일 경로, "-"(stdin) 또는 레코드 리스트
+                레코드는 BulkDatas 필드 dict, 선택적으로 "_key"(멱등 키)
+        batch_limit: 요청당 최대 줄 수 (기본 ecount.bulk.DEFAULT_BATCH_LIMIT)
+        max_workers: 동시에 보낼 배치 수
+        dry_run: True면 보내지 않고 배치 계획만 반환
+        resend_unknown: True면 전송 오류로 결과 불명인 레코드도 다시 보낸다 (ECOUNT에 전표가 없는 것을 확인한 뒤)
+    
+    Returns:
+        data: 레코드별 {index, key, success, unknown, slipNo, error, skipped, batch}, summary
+        unknown 레코드는 저장 여부를 ECOUNT에서 확인해야 한다 (자동으로 다시 보내지 않음)
+    """
+    from ecount.bulk import DEFAULT_BATCH_LIMIT, BulkJournal, read_records, submit_bulk
+    
+    if isinstance(dry_run, str):
+        dry_run = dry_run.lower() in ("1", "true", "yes", "dry_run")
+    if isinstance(resend_unknown, str):
+        resend_unknown = resend_unknown.lower() in ("1", "true", "yes", "resend_unknown")
+    records = read_records(source)
+    journal = _tenant_resource("bulk_journal", lambda tenant: BulkJournal(_tenant_file(BULK_JOURNAL_PATH)))
+    
+    def send(endpoint, list_name, lines):
+        return call_with_session(_save_bulk_lines, endpoint, list_name, lines)
+    
+    started = time.perf_counter()
+    results, summary = submit_bulk(
+        kind, records, send, journal,
+        batch_limit=int(batch_limit) if batch_limit not in (None, "") else DEFAULT_BATCH_LIMIT,
+        max_workers=int(max_workers) if max_workers not in (None, "") else DEFAULT_BULK_WORKERS,
+        dry_run=dry_run, resend_unknown=resend_unknown)
+    summary["elapsedMs"] = round((time.perf_counter() - started) * 1000, 1)
+    print(f"Bulk {kind}: {summary}")
+    return {
+        "success": summary["failed"] == 0 and summary["unknown"] == 0,
+        "data": results,
+        "summary": summary
+    }
+
+@_with_cache_stats
+def purchase_orders_rollup_result(date_from="", date_to="", by="customer,product,day", limit=None,
+                                  due_days=None, page_size=DEFAULT_PAGE_SIZE):
+    """발주서를 페이지 단위로 받으면서 거래처/품목/기간별로 집계 (행 목록은 만들지 않음)
+    
+    Args:
+        date_from, date_to: 발주일자 기간 (기본 최근 30일, 30일 초과는 구간으로 나눠 순서대로 조회)
+        by: 집계 차원 (customer, product, day, week, month - 쉼표로 여러 개, "customer+month"처럼 조합 가능)
+        limit: 차원별 최대 그룹 수 (기간 차원은 기간 순, 나머지는 합계금액 내림차순)
+        due_days: 납기 임박(dueSoon)으로 셀 기간(일)
+    
+    Returns:
+        totals, rollups, upcoming(납기가 가까운 발주 행), groups(메모리에 둔 그룹 수), pages
+    """
+    from ecount.rollup import DEFAULT_DUE_DAYS, OrderRollup
+    
+    if not date_to:
+        date_to = datetime.now().strftime("%Y%m%d")
+    if not date_from:
+        date_from = (datetime.strptime(date_to, "%Y%m%d") - timedelta(days=29)).strftime("%Y%m%d")
+    
+    rollup = OrderRollup(by, due_days=int(due_days) if due_days not in (None, "") else DEFAULT_DUE_DAYS)
+    pages = 0
+    started = time.perf_counter()
+    for rows in get_session_manager().iterate(iter_purchase_order_pages, date_from, date_to, int(page_size)):
+        rollup.add(rows)
+        pages += 1
+    
+    result = rollup.result(int(limit) if limit not in (None, "") else None)
+    print(f"Purchase order rollup {date_from}~{date_to}: {result['totals']['lines']} rows, {rollup.group_count()} groups")
+    return {
+        "success": True,
+        **result,
+        "groups": rollup.group_count(),
+        "pages": pages,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+        "dateRange": {"from": date_from, "to": date_to}
+    }
+
+def tenants_result():
+    """설정된 테넌트 목록 (API 키 제외)"""
+    registry = get_tenant_registry()
+    return {
+        "success": True,
+        "default": registry.default_key,
+        "tenants": [registry.get(key).describe() for key in registry.keys()]
+    }
+
+def _for_each_tenant(func):
+    """모든 테넌트에 대해 func()를 동시에 실행 ({테넌트 키: 결과 또는 오류 메시지})
+
+    한 테넌트의 실패(로그인 오류 등)가 다른 테넌트를 막지 않는다.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    keys = get_tenant_registry().keys()
+    
+    def run(key):
+        with use_tenant(key):
+            try:
+                return func()
+            except Exception as e:
+                print(f"[{key}] {e}")
+                return str(e)
+    
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        futures = {key: executor.submit(contextvars.copy_context().run, run, key) for key in keys}
+        return {key: future.result() for key, future in futures.items()}
+
+def _session_command(func):
+    """run_* 조회 함수를 캐시된 세션으로 호출하는 워커 명령으로 감싼다"""
+    def command(*args, **kwargs):
+        return call_with_session(func, *args, **kwargs)
+    return command
+
+# 상주 워커(worker 모드)에서 받을 수 있는 명령
+WORKER_COMMANDS = {
+    "purchase_orders_json": purchase_orders_result,
+    "inventory_balance_json": inventory_balance_result,
+    "product_basic_json": product_basic_result,
+    "materials_management": get_materials_management,
+    "catalog_sync": catalog_sync_result,
+    "search_index_build": build_search_index_result,
+    "product_search": product_search_result,
+    "product_store_build": build_product_store_result,
+    "product_store": product_store_result,
+    "dashboard_snapshot": dashboard_snapshot_result,
+    "run_inventory_lookup": _session_command(run_inventory_lookup),
+    "run_orderlist_lookup": _session_command(run_orderlist_lookup),
+    # Node /product-basic 라우트: 조건 조회도 전체 품목 뷰에서 답한다
+    "run_product_basic_lookup": _session_command(run_product_view_lookup),
+    "run_inventory_balance_status": _session_command(run_inventory_balance_status),
+    "transport_stats": lambda: get_transport().stats(),
+    "rate_limit_stats": lambda: get_rate_limiter().stats(),
+    "single_flight_stats": lambda: get_single_flight().stats(),
+    "catalog_view_stats": lambda: get_catalog_views().stats(),
+    "cache_invalidate": cache_invalidate_result,
+    "cache_stats": cache_stats_result,
+    "mirror_sync": mirror_sync_result,
+    "mirror_products": mirror_products_result,
+    "mirror_inventory": mirror_inventory_result,
+    "mirror_orders": mirror_orders_result,
+    "inventory_snapshot": inventory_snapshot_result,
+    "inventory_backfill": inventory_backfill_result,
+    "inventory_history": inventory_history_result,
+    "shortage_report": shortage_report_result,
+    "purchase_orders_rollup": purchase_orders_rollup_result,
+    "bulk_submit": bulk_submit_result,
+    "product_name_match": product_name_match_result,
+    "tenants": tenants_result,
+}
+
+def _record_metrics(command, recorder):
+    """명령 한 번의 단계 시간을 지표 파일에 더한다 (METRICS_DIR을 지정했을 때만, 실패해도 명령 결과에는 영향 없음)"""
+    from ecount.timings import record_metrics
+    
+    if not METRICS_PATH:
+        return
+    try:
+        record_metrics(METRICS_PATH, recorder.summary(), {"command": command, "tenant": current_tenant().key})
+    except (OSError, ValueError) as e:
+        print(f"Metrics write failed: {e}", file=sys.stderr)
+
+def _instrumented_command(name, func):
+    """워커 명령을 단계 시간 측정으로 감싼다 (결과 dict에 "timings", 지표 파일에 한 번분)
+    
+    워커는 결과를 받은 뒤 직렬화하므로 serialize 단계는 CLI 실행에만 있다.
+    """
+    from ecount.timings import track
+    
+    @functools.wraps(func)
+    def command(*args, **kwargs):
+        with track() as recorder:
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _record_metrics(name, recorder)
+        if isinstance(result, dict) and "timings" not in result:
+            result["timings"] = recorder.summary()
+        return result
+    return command
+
+@contextlib.contextmanager
+def _instrumented(command):
+    """CLI 명령 하나를 단계 시간 측정(+ ECOUNT_PROFILE이면 cProfile)으로 감싼다"""
+    from ecount.timings import profiled, track
+    
+    with track() as recorder:
+        try:
+            if PROFILE:
+                output = None if PROFILE.lower() in ('1', 'true', 'yes') else PROFILE
+                with profiled(output, sort=PROFILE_SORT):
+                    yield recorder
+            else:
+                yield recorder
+        finally:
+            _record_metrics(command, recorder)
+
+def run_worker(argv):
+    """상주 워커 실행: python test.py worker [--socket PATH] [--workers N] [--mirror-refresh SECONDS]
+    
+    요청의 "tenant" 필드로 테넌트를 고른다. 테넌트마다 세션과 연결 풀이 따로라서
+    서로 다른 테넌트의 요청은 같은 로그인을 기다리지 않고 병렬로 처리된다.
+    """
+    import argparse
+    from ecount import worker
+    
+    parser = argparse.ArgumentParser(prog="test.py worker")
+    parser.add_argument("--socket", help="Unix 소켓 경로 (없으면 stdin/stdout 사용)")
+    parser.add_argument("--workers", type=int, default=worker.DEFAULT_MAX_WORKERS, help="동시 처리 스레드 수")
+    parser.add_argument("--mirror-refresh", type=float, default=MIRROR_REFRESH_SECONDS,
+                        help="로컬 미러 백그라운드 갱신 주기(초), 0이면 갱신 안 함")
+    options = parser.parse_args(argv)
+    
+    if options.mirror_refresh > 0:
+        from ecount.mirror import start_background_refresh
+        start_background_refresh(lambda: _for_each_tenant(mirror_sync_result), options.mirror_refresh)
+    
+    # 첫 요청이 로그인을 기다리지 않도록 모든 테넌트의 세션을 미리 확보
+    warmup = lambda: _for_each_tenant(lambda: get_session_manager().get())
+    # 요청에 tenant가 없으면 워커를 띄울 때 고른 테넌트 (--tenant / ECOUNT_TENANT)
+    default_tenant = current_tenant_key()
+    scope = lambda request: use_tenant(request.get("tenant") or default_tenant)
+    handlers = {name: _instrumented_command(name, func) for name, func in WORKER_COMMANDS.items()}
+    if options.socket:
+        worker.serve_unix(options.socket, handlers, max_workers=options.workers, warmup=warmup, scope=scope)
+    else:
+        worker.serve_stdio(handlers, max_workers=options.workers, warmup=warmup, scope=scope)
+
+def main():
+    """명령행 실행 (python test.py <명령> [인수...] 또는 python cli.py <명령> [인수...])"""
+    global DEBUG_OUTPUT
+    
+    _configure_utf8_stdout()
+    
+    # 테넌트 선택: --tenant KEY (어느 위치든) 또는 ECOUNT_TENANT 환경변수
+    tenant_key = os.environ.get('ECOUNT_TENANT')
+    if "--tenant" in sys.argv[1:]:
+        position = sys.argv.index("--tenant")
+        tenant_key = sys.argv[position + 1] if len(sys.argv) > position + 1 else None
+        del sys.argv[position:position + 2]
+    if tenant_key:
+        get_tenant_registry().get(tenant_key)  # 없는 키면 여기서 오류
+        select_tenant(tenant_key)
+    
+    # JSON/NDJSON 명령과 워커는 마커 사이 결과만 읽히므로 디버그용 샘플 출력을 만들지 않는다
+    if len(sys.argv) > 1 and (sys.argv[1].endswith(("_json", "_ndjson")) or sys.argv[1] == "worker"):
+        DEBUG_OUTPUT = False
+    
+    # 워커는 요청마다 따로 측정한다 (_instrumented_command)
+    if len(sys.argv) > 1 and sys.argv[1] == "worker":
+        run_worker(sys.argv[2:])
+        return
+    with _instrumented(sys.argv[1] if len(sys.argv) > 1 else "inventory_lookup"):
+        _run_command()
+
+def _run_command():
+    """sys.argv의 명령 실행 (main에서 테넌트/출력 설정 후 호출)"""
     # 명령행 인수 확인
     if len(sys.argv) > 1:
         if sys.argv[1] == "purchase_orders_json":
             date_from = sys.argv[2] if len(sys.argv) > 2 else ""
             date_to = sys.argv[3] if len(sys.argv) > 3 else ""
-            run_purchase_orders_json(date_from, date_to)
+            page_size = int(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_PAGE_SIZE
+            run_purchase_orders_json(date_from, date_to, page_size)
         elif sys.argv[1] == "inventory_balance_json":
+            # 창고코드/품목코드는 쉼표로 여러 개 지정 가능 (예: W1,W2 A0001,A0002)
             base_date = sys.argv[2] if len(sys.argv) > 2 else ""
             wh_cd = sys.argv[3] if len(sys.argv) > 3 else ""
             prod_cd = sys.argv[4] if len(sys.argv) > 4 else ""
@@ -608,13 +2054,77 @@ if __name__ == "__main__":
             prod_cd = sys.argv[2] if len(sys.argv) > 2 else ""
             prod_type = sys.argv[3] if len(sys.argv) > 3 else ""
             run_product_basic_lookup_json(prod_cd, prod_type)
+        elif sys.argv[1] == "purchase_orders_ndjson":
+            date_from = sys.argv[2] if len(sys.argv) > 2 else ""
+            date_to = sys.argv[3] if len(sys.argv) > 3 else ""
+            page_size = int(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_PAGE_SIZE
+            run_purchase_orders_ndjson(date_from, date_to, page_size)
+        elif sys.argv[1] == "inventory_balance_ndjson":
+            base_date = sys.argv[2] if len(sys.argv) > 2 else ""
+            wh_cd = sys.argv[3] if len(sys.argv) > 3 else ""
+            prod_cd = sys.argv[4] if len(sys.argv) > 4 else ""
+            run_inventory_balance_status_ndjson(base_date, wh_cd, prod_cd)
+        elif sys.argv[1] == "product_basic_ndjson":
+            prod_cd = sys.argv[2] if len(sys.argv) > 2 else ""
+            prod_type = sys.argv[3] if len(sys.argv) > 3 else ""
+            run_product_basic_lookup_ndjson(prod_cd, prod_type)
+        elif sys.argv[1] == "catalog_sync_json":
+            since_version = sys.argv[2] if len(sys.argv) > 2 else None
+            run_catalog_sync_json(since_version)
+        elif sys.argv[1] == "search_index_build_json":
+            source = sys.argv[2] if len(sys.argv) > 2 else "ecount"
+            run_search_index_build_json(source)
+        elif sys.argv[1] == "product_search_json":
+            query = sys.argv[2] if len(sys.argv) > 2 else ""
+            limit = int(sys.argv[3]) if len(sys.argv) > 3 else 15
+            run_product_search_json(query, limit)
+        elif sys.argv[1] == "product_store_build_json":
+            run_product_store_build_json()
+        elif sys.argv[1] == "product_store_json":
+            prod_cd = sys.argv[2] if len(sys.argv) > 2 else ""
+            prod_type = sys.argv[3] if len(sys.argv) > 3 else ""
+            run_product_store_json(prod_cd, prod_type)
+        elif sys.argv[1] == "dashboard_snapshot_json":
+            max_concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DASHBOARD_CONCURRENCY
+            run_dashboard_snapshot_json(max_concurrency)
+        elif sys.argv[1] == "cache_invalidate_json":
+            endpoint = sys.argv[2] if len(sys.argv) > 2 else ""
+            run_cache_invalidate_json(endpoint)
+        elif sys.argv[1] == "mirror_sync_json":
+            # 예: mirror_sync_json [products,inventory,orders] [allow_empty]
+            _run_json(mirror_sync_result, *sys.argv[2:4])
+        elif sys.argv[1] == "mirror_products_json":
+            _run_json(mirror_products_result, *sys.argv[2:5])
+        elif sys.argv[1] == "mirror_inventory_json":
+            _run_json(mirror_inventory_result, *sys.argv[2:5])
+        elif sys.argv[1] == "mirror_orders_json":
+            _run_json(mirror_orders_result, *sys.argv[2:5])
+        elif sys.argv[1] == "inventory_snapshot_json":
+            _run_json(inventory_snapshot_result, *sys.argv[2:3])
+        elif sys.argv[1] == "inventory_backfill_json":
+            date_from = sys.argv[2] if len(sys.argv) > 2 else ""
+            date_to = sys.argv[3] if len(sys.argv) > 3 else ""
+            max_workers = int(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_BACKFILL_WORKERS
+            _run_json(inventory_backfill_result, date_from, date_to, max_workers)
+        elif sys.argv[1] == "inventory_history_json":
+            _run_json(inventory_history_result, *sys.argv[2:6])
+        elif sys.argv[1] == "shortage_report_json":
+            # 예: shortage_report_json 20260101 demand.json [최대 행 수] [all]
+            _run_json(shortage_report_result, *sys.argv[2:6])
+        elif sys.argv[1] == "purchase_orders_rollup_json":
+            _run_json(purchase_orders_rollup_result, *sys.argv[2:6])
+        elif sys.argv[1] == "product_name_match_json":
+            # 예: product_name_match_json plan.csv [후보 수] [기준 점수] [CSV 열 이름]
+            _run_json(product_name_match_result, *sys.argv[2:6])
+        elif sys.argv[1] == "bulk_submit_json":
+            # 예: bulk_submit_json job_order plans.ndjson [배치 줄 수] [동시 배치 수] [dry_run] [resend_unknown]
+            _run_json(bulk_submit_result, *sys.argv[2:8])
     else:
         # 기본 실행: 재고 조회만
-        zone_info = get_zone_info(COM_CODE, use_test=USE_TEST_API)
-        zone_value = zone_info.get('ZONE') if zone_info.get('ZONE') else DEFAULT_ZONE
-        session_id_value = api_login_oapilogin(COM_CODE, USER_ID, API_CERT_KEY, zone_value, use_test=USE_TEST_API)
-        time.sleep(1)
-        run_inventory_lookup(session_id_value, zone_value)
+        call_with_session(run_inventory_lookup)
         
         # 전체 테스트 실행을 원하면 아래 주석 해제
         # test_all_apis()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import pytest
+
+from ecount import bulk
+from ecount.bulk import BulkJournal, plan_batches, submit_bulk
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(bulk.time, 'sleep', lambda seconds: None)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = BulkJournal(str(tmp_path / 'bulk.sqlite3'))
+    yield journal
+    journal.close()
+
+
+def ok_response(lines):
+    return {"Status": "200", "Data": {"FailCnt": 0, "ResultDetails": [],
+                                      "SlipNos": [f"SLIP-{line['UPLOAD_SER_NO']}" for line in lines]}}
+
+
+class Recorder:
+    """send() 대역: 호출을 기록하고 responses 순서대로 응답하거나 예외를 던진다"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, endpoint, list_name, lines):
+        self.calls.append((endpoint, list_name, [dict(line) for line in lines]))
+        response = self.responses.pop(0) if self.responses else ok_response
+        if isinstance(response, Exception):
+            raise response
+        return response(lines) if callable(response) else response
+
+
+def test_plan_batches_keeps_documents_together_and_renumbers():
+    entries = [(0, 'a', {'UPLOAD_SER_NO': '7'}), (1, 'b', {'UPLOAD_SER_NO': '7'}),
+               (2, 'c', {'UPLOAD_SER_NO': '9'}), (3, 'd', {})]
+    batches = plan_batches(entries, batch_limit=3)
+    assert [[index for index, _, _ in batch] for batch in batches] == [[0, 1, 2], [3]]
+    assert [fields['UPLOAD_SER_NO'] for _, _, fields in batches[0]] == ['1', '1', '2']
+    assert batches[1][0][2]['UPLOAD_SER_NO'] == '1'
+
+
+def test_oversized_document_is_sent_alone():
+    entries = [(0, 'a', {})] + [(i, str(i), {'UPLOAD_SER_NO': '5'}) for i in range(1, 5)]
+    batches = plan_batches(entries, batch_limit=2)
+    assert [len(batch) for batch in batches] == [1, 4]
+
+
+def test_batches_are_sent_and_slip_numbers_returned(journal):
+    send = Recorder()
+    records = [{'_key': f'k{i}', 'PROD_CD': f'P{i}'} for i in range(5)]
+    results, summary = submit_bulk('job_order', records, send, journal, batch_limit=2)
+    assert len(send.calls) == 3
+    assert all('_key' not in line for _, _, lines in send.calls for line in lines)
+    assert [result['slipNo'] for result in results] == ['SLIP-1', 'SLIP-2', 'SLIP-1', 'SLIP-2', 'SLIP-1']
+    assert summary['succeeded'] == 5 and summary['failed'] == 0 and summary['unknown'] == 0
+
+
+def test_replay_skips_records_already_saved(journal):
+    records = [{'_key': 'a', 'PROD_CD': 'P1'}, {'_key': 'b', 'PROD_CD': 'P2'}]
+    submit_bulk('sale', records, Recorder(), journal)
+
+    send = Recorder()
+    results, summary = submit_bulk('sale', records + [{'_key': 'c', 'PROD_CD': 'P3'}], send, journal)
+    assert [len(lines) for _, _, lines in send.calls] == [1]
+    assert [result['skipped'] for result in results] == [True, True, False]
+    assert results[0]['slipNo'] == 'SLIP-1'
+    assert summary['skipped'] == 2
+
+
+def test_record_key_without_explicit_key_is_content_hash():
+    assert bulk.record_key('sale', {'A': 1, 'B': 2}) == bulk.record_key('sale', {'B': 2, 'A': 1})
+    assert bulk.record_key('sale', {'A': 1}) != bulk.record_key('purchases', {'A': 1})
+
+
+def test_rejected_batch_is_retried(journal):
+    rejected = {"Status": "500", "Error": {"Code": "E", "Message": "busy"}}
+    send = Recorder(rejected, ok_response)
+    results, summary = submit_bulk('sale', [{'_key': 'a'}], send, journal, retries=2)
+    assert len(send.calls) == 2
+    assert results[0]['success'] and results[0]['attempts'] == 2
+    assert summary['retriedBatches'] == 1
+
+
+def test_line_errors_are_not_retried(journal):
+    response = {"Status": "200", "Data": {"FailCnt": 1, "SlipNos": [], "ResultDetails": [
+        {"Line": "0", "IsSuccess": False, "TotalError": "bad PROD_CD"}]}}
+    send = Recorder(response)
+    results, summary = submit_bulk('sale', [{'_key': 'a'}], send, journal, retries=2)
+    assert len(send.calls) == 1
+    assert results[0]['error'] == 'bad PROD_CD' and not results[0]['unknown']
+    assert summary['failed'] == 1
+
+
+@pytest.mark.parametrize('error', [TimeoutError('read timed out'), ConnectionError('reset'),
+                                   ValueError('Expecting value')])
+def test_ambiguous_failure_is_not_retried(journal, error):
+    send = Recorder(error, ok_response)
+    results, summary = submit_bulk('sale', [{'_key': 'a'}, {'_key': 'b'}], send, journal, retries=3)
+    assert len(send.calls) == 1
+    assert all(result['unknown'] and not result['success'] for result in results)
+    assert summary['unknown'] == 2 and summary['failed'] == 0 and summary['retriedBatches'] == 0
+
+
+def test_unknown_records_are_not_resent_on_replay(journal):
+    records = [{'_key': 'a'}]
+    submit_bulk('sale', records, Recorder(TimeoutError('read timed out')), journal)
+
+    send = Recorder()
+    results, summary = submit_bulk('sale', records, send, journal)
+    assert send.calls == []
+    assert results[0]['unknown'] and results[0]['skipped']
+    assert 'read timed out' in results[0]['error']
+    assert summary['unknown'] == 1
+
+    results, summary = submit_bulk('sale', records, send, journal, resend_unknown=True)
+    assert len(send.calls) == 1
+    assert results[0]['success'] and not results[0]['unknown']
+    assert journal.unknown('sale', ['a']) == {}
+
+
+def test_dry_run_sends_nothing(journal):
+    send = Recorder()
+    results, summary = submit_bulk('sale', [{'_key': 'a'}, {'_key': 'b'}], send, journal, batch_limit=1,
+                                   dry_run=True)
+    assert send.calls == []
+    assert [result['batch'] for result in results] == [0, 1]
+    assert journal.succeeded('sale', ['a', 'b']) == {}
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from ecount.catalog_sync import sync_catalog
+
+
+def test_delta_between_versions(tmp_path):
+    path = str(tmp_path / 'snapshot.json')
+    first = sync_catalog([{'prodCd': 'A', 'prodNm': '사과'}, {'prodCd': 'B', 'prodNm': '배'}], path)
+    assert first['version'] == 1 and first['counts']['added'] == 2
+
+    delta = sync_catalog([{'prodCd': 'A', 'prodNm': '청사과'}, {'prodCd': 'C', 'prodNm': '감'}], path)
+    assert delta['baseVersion'] == 1 and delta['version'] == 2
+    assert [item['prodCd'] for item in delta['added']] == ['C']
+    assert [item['prodCd'] for item in delta['changed']] == ['A']
+    assert delta['removed'] == ['B']
+
+
+def test_empty_catalog_leaves_snapshot_untouched(tmp_path):
+    path = str(tmp_path / 'snapshot.json')
+    sync_catalog([{'prodCd': 'A', 'prodNm': '사과'}], path)
+    with open(path, encoding='utf-8') as f:
+        before = f.read()
+    with pytest.raises(ValueError):
+        sync_catalog([], path)
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == before
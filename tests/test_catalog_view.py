@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from ecount.catalog_view import CatalogView, CatalogViewCache
+from ecount.stream_decode import PRODUCT_FIELDS
+
+
+def row(prod_cd, prod_type, class_cd=''):
+    values = dict.fromkeys(PRODUCT_FIELDS, '')
+    values.update(PROD_CD=prod_cd, PROD_TYPE=prod_type, CLASS_CD=class_cd)
+    return [values[name] for name in PRODUCT_FIELDS]
+
+
+ROWS = [row('A1', '1', 'C1'), row('A2', '0', 'C1'), row('A3', '1', 'C2')]
+
+
+def test_query_multi_value_and_fields():
+    view = CatalogView(ROWS)
+    assert [r[0] for r in view.query(PROD_CD='A3,A1')] == ['A1', 'A3']
+    assert [r[0] for r in view.query(PROD_CD='A1∬A2', PROD_TYPE='1')] == ['A1']
+    assert [r[0] for r in view.query(CLASS_CD='C1', PROD_TYPE='')] == ['A1', 'A2']
+    assert view.query(PROD_CD='nope') == []
+    assert view.query() == ROWS
+    with pytest.raises(ValueError):
+        view.query(PROD_DES='x')
+
+
+def test_cache_fetches_once_within_ttl():
+    calls = []
+    cache = CatalogViewCache(ttl=60)
+    fetch = lambda: calls.append(1) or ROWS
+    assert cache.get(fetch) is cache.get(fetch)
+    assert len(calls) == 1
+    cache.invalidate()
+    cache.get(fetch)
+    assert len(calls) == 2
+
+
+def test_failed_or_empty_fetch_is_not_kept():
+    cache = CatalogViewCache(ttl=60)
+
+    def failing():
+        raise RuntimeError('upstream error')
+
+    with pytest.raises(RuntimeError):
+        cache.get(failing)
+    assert len(cache.get(lambda: [])) == 0
+    assert not cache.stats()['loaded']
+    assert len(cache.get(lambda: ROWS)) == 3
+    assert cache.stats()['emptyFetches'] == 1
+
+
+def test_concurrent_stale_gets_fetch_once():
+    cache = CatalogViewCache(ttl=60)
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return ROWS
+
+    views = []
+    threads = [threading.Thread(target=lambda: views.append(cache.get(fetch))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(view is views[0] for view in views)
@@ -0,0 +1,38 @@
+import os
+
+from ecount.columnar import PRODUCT_COLUMNS, ProductTable, latest_version, list_versions, save_version
+
+
+def _row(code, price, qty):
+    row = [None] * len(PRODUCT_COLUMNS)
+    row[0] = code
+    for index, (name, kind) in enumerate(PRODUCT_COLUMNS):
+        if kind == 'f64':
+            row[index] = price if 'PRICE' in name else qty
+    return row
+
+
+ROWS = [_row('A001', '1200.50', '10'), _row('A002', None, '0'), _row('A003', '', 'x')]
+
+
+def test_numeric_columns_keep_original_strings(tmp_path):
+    path = save_version(ProductTable.from_rows(ROWS), str(tmp_path / 'products_columns.bin'))
+    with ProductTable.open(path) as table:
+        assert [table.row(index) for index in range(len(table))] == ROWS
+        name = next(name for name, kind in PRODUCT_COLUMNS if kind == 'f64' and 'PRICE' in name)
+        values = list(table.numeric_view(name))
+        assert values[0] == 1200.5
+        assert values[1] != values[1]
+
+
+def test_save_version_writes_new_file_and_prunes_old(tmp_path):
+    path = str(tmp_path / 'products_columns.bin')
+    assert latest_version(path) is None
+    first = save_version(ProductTable.from_rows(ROWS), path)
+    with ProductTable.open(first) as table:
+        second = save_version(ProductTable.from_rows(ROWS[:1]), path)
+        assert second != first
+        assert len(table) == 3
+    assert latest_version(path) == second
+    assert [file for _, file in list_versions(path)] == [second]
+    assert not os.path.exists(path)
@@ -0,0 +1,36 @@
+import pytest
+
+from ecount.session import ApiStatusError
+from ecount.timeseries import InventorySeries
+
+test_script = pytest.importorskip('test')
+
+
+@pytest.fixture
+def series(tmp_path, monkeypatch):
+    series = InventorySeries(str(tmp_path))
+    monkeypatch.setattr(test_script, 'get_inventory_series', lambda: series)
+    return series
+
+
+def test_failed_day_is_not_recorded(series, monkeypatch):
+    def fetch(base_date):
+        if base_date == '20240102':
+            raise ApiStatusError("Inventory Balance Status API error: Status=500, Code=None, Message=busy")
+        return [['A', base_date[-1], 'W1']]
+
+    monkeypatch.setattr(test_script, '_fetch_balance_snapshot', fetch)
+    result = test_script.inventory_backfill_result('20240101', '20240103', 2)
+    assert result['success'] is False
+    assert list(result['failed']) == ['20240102']
+    assert result['fetchedDays'] == 2
+    assert series.dates() == ['20240101', '20240103']
+
+    # 다음 백필은 실패한 날짜만 다시 받는다
+    fetched = []
+    monkeypatch.setattr(test_script, '_fetch_balance_snapshot',
+                        lambda base_date: fetched.append(base_date) or [['A', '2', 'W1']])
+    result = test_script.inventory_backfill_result('20240101', '20240103', 2)
+    assert result['success'] is True
+    assert fetched == ['20240102']
+    assert series.dates() == ['20240101', '20240102', '20240103']
@@ -0,0 +1,45 @@
+import pytest
+
+from ecount.mirror import EmptySyncError, Mirror
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = Mirror(str(tmp_path / 'mirror.sqlite3'))
+    yield mirror
+    mirror.close()
+
+
+def product(code):
+    return [code, f'{code} 품목'] + [''] * 13
+
+
+def test_sync_products_replaces_catalog(mirror):
+    mirror.sync_products([product('A'), product('B')])
+    mirror.sync_products([product('B'), product('C')])
+    assert [row['prod_cd'] for row in mirror.products()] == ['B', 'C']
+
+
+def test_empty_fetch_does_not_clear_products(mirror):
+    mirror.sync_products([product('A')], elapsed_ms=1.0)
+    before = mirror.watermarks()['products']
+    with pytest.raises(EmptySyncError):
+        mirror.sync_products([])
+    assert [row['prod_cd'] for row in mirror.products()] == ['A']
+    assert mirror.watermarks()['products'] == before
+
+    assert mirror.sync_products([], allow_empty=True) == 0
+    assert mirror.products() == []
+
+
+def test_empty_fetch_does_not_clear_inventory(mirror):
+    mirror.sync_inventory('20240101', [['A', '3', 'W1']])
+    with pytest.raises(EmptySyncError):
+        mirror.sync_inventory('20240102', [])
+    assert mirror.watermarks()['inventory']['watermark'] == '20240101'
+    assert mirror.inventory()[1] == [{'prod_cd': 'A', 'bal_qty': '3', 'wh_cd': 'W1'}]
+
+
+def test_first_sync_may_be_empty(mirror):
+    assert mirror.sync_products([]) == 0
+    assert mirror.sync_inventory('20240101', []) == 0
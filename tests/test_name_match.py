@@ -0,0 +1,32 @@
+import pytest
+
+from ecount.name_match import NameMatcher, normalize_name
+
+
+@pytest.mark.parametrize("name, expected", [
+    ('3M 테이프', '3m 테이프'),
+    ('2단 선반', '2단 선반'),
+    ('4p 세트', '4p 세트'),
+    ('선반 2단', '선반'),
+    ('테이프 3개', '테이프'),
+    ('허브큐어 9g 12입', '허브큐어'),
+    ('허브큐어9g', '허브큐어'),
+    ('비타민C 500ml x 3', '비타민c'),
+    ('2kg x 3 쌀', '쌀'),
+    ('양말 10개입 (국산)', '양말'),
+])
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+
+
+def test_leading_counts_distinguish_products():
+    pytest.importorskip('numpy')
+    matcher = NameMatcher([
+        {'prodCd': 'T3M', 'prodNm': '3M 테이프'},
+        {'prodCd': 'T', 'prodNm': '테이프'},
+        {'prodCd': 'S2', 'prodNm': '2단 선반'},
+        {'prodCd': 'S3', 'prodNm': '3단 선반'},
+    ])
+    results = matcher.match(['3M 테이프 5개', '2단 선반', '테이프'])
+    assert [result['prodCd'] for result in results] == ['T3M', 'S2', 'T']
+    assert all(result['matched'] for result in results)
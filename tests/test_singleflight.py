@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from ecount.singleflight import SingleFlight
+
+THREADS = 8
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _run_concurrently(flight, key, func):
+    """THREADS개 호출을 같은 key로 동시에 실행 -> [(결과 또는 예외)]"""
+    outcomes = [None] * THREADS
+
+    def worker(index):
+        try:
+            outcomes[index] = flight.do(key, func)
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: flight.stats()["waiters"] == THREADS - 1)
+    return threads, outcomes
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"rows": [1, 2, 3]}
+
+    threads, outcomes = _run_concurrently(flight, 'key', fetch)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    stats = flight.stats()
+    assert (stats["calls"], stats["leaders"], stats["shared"], stats["inFlight"]) == (THREADS, 1, THREADS - 1, 0)
+
+
+def test_leader_error_reaches_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise RuntimeError("upstream failed")
+
+    threads, outcomes = _run_concurrently(flight, 'key', fetch)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert isinstance(outcomes[0], RuntimeError)
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert flight.stats()["errors"] == 1
+    # 실패한 결과는 남지 않으므로 다음 호출은 다시 실행한다
+    assert flight.do('key', lambda: "retried") == "retried"
+
+
+def test_results_are_not_kept_and_keys_are_independent():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('a', lambda: 2) == 2
+    assert flight.do('b', lambda: 3) == 3
+    assert flight.stats()["shared"] == 0
+    with pytest.raises(ValueError):
+        flight.do('a', int, 'x')
+    assert flight.stats()["inFlight"] == 0
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from ecount.stream_decode import PRODUCT_FIELDS, ResponseStream, text_chunks
+
+ITEMS = [
+    {'PROD_CD': 'A001', 'PROD_DES': '허브큐어 "특가" 9g', 'SIZE_DES': 'a\\b/c', 'UNIT': 'EA', 'IN_PRICE': '1200.5',
+     'EXTRA': {'nested': [1, 2.5, None, True]}},
+    {'PROD_CD': 'A002', 'PROD_DES': '줄바꿈\n탭\t이모지 😀', 'SAFE_QTY': '10', 'BAR_CODE': None},
+    {'PROD_CD': 'A003'},
+]
+
+
+def _body(encoded, ascii=False):
+    result = json.dumps(ITEMS, ensure_ascii=ascii)
+    data = {'TotalCnt': len(ITEMS), 'Result': result if encoded else ITEMS}
+    return json.dumps({'Data': data, 'Status': '200', 'Error': None}, ensure_ascii=ascii)
+
+
+def _byte_chunks(text, size):
+    body = text.encode('utf-8')
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+def _expected(body, fields):
+    data = json.loads(body)['Data']
+    items = json.loads(data['Result']) if isinstance(data['Result'], str) else data['Result']
+    return [{name: item.get(name) for name in fields} for item in items] if fields else items
+
+
+@pytest.mark.parametrize("encoded", [False, True])
+@pytest.mark.parametrize("ascii", [False, True])
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64 * 1024])
+@pytest.mark.parametrize("fields", [None, PRODUCT_FIELDS])
+def test_projection_matches_json_loads(encoded, ascii, size, fields):
+    body = _body(encoded, ascii)
+    for chunks in (text_chunks(body, size), _byte_chunks(body, size)):
+        stream = ResponseStream(chunks, fields)
+        assert list(stream) == _expected(body, fields)
+        assert stream.count == len(ITEMS)
+        assert stream.envelope == {'Data': {'TotalCnt': len(ITEMS)}, 'Status': '200', 'Error': None}
+        assert stream.result_error is None
+
+
+def test_error_response_has_no_items():
+    body = json.dumps({'Data': None, 'Status': '500', 'Error': {'Code': 204, 'Message': '세션 만료'}},
+                      ensure_ascii=False)
+    stream = ResponseStream(_byte_chunks(body, 5))
+    assert list(stream) == []
+    assert stream.envelope == json.loads(body)
+
+
+def test_result_string_that_is_not_an_array():
+    body = json.dumps({'Data': {'Result': '조회 결과 없음'}, 'Status': '200'}, ensure_ascii=False)
+    stream = ResponseStream(text_chunks(body, 4))
+    assert list(stream) == []
+    assert stream.result_error == "Result is not a JSON array"
+    assert stream.envelope['Status'] == '200'
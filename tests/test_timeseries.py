@@ -0,0 +1,43 @@
+from ecount.timeseries import InventorySeries
+
+SNAPSHOTS = {
+    '20260101': [['A', '10', 'W1'], ['B', '5', 'W1']],
+    '20260102': [['A', '10', 'W1'], ['B', '3', 'W1']],
+    '20260103': [['A', '7', 'W1']],
+    '20260104': [['A', '7', 'W1'], ['B', '3', 'W1'], ['C', '1', 'W2']],
+}
+
+
+def _points(series):
+    return {(item['whCd'], item['prodCd']): item['points'] for item in series.series()}
+
+
+def test_record_skips_unchanged_values(tmp_path):
+    series = InventorySeries(str(tmp_path))
+    written = series.record_many(SNAPSHOTS)
+    assert written == {'20260101': 2, '20260102': 1, '20260103': 2, '20260104': 2}
+    assert _points(series)[('W1', 'B')] == [
+        ['20260101', 5.0], ['20260102', 3.0], ['20260103', None], ['20260104', 3.0]]
+
+
+def test_backfill_matches_in_order_recording(tmp_path):
+    expected = InventorySeries(str(tmp_path / 'forward'))
+    expected.record_many(SNAPSHOTS)
+
+    series = InventorySeries(str(tmp_path / 'backfill'))
+    series.record_many({date: SNAPSHOTS[date] for date in ('20260102', '20260104')})
+    series.record('20260101', SNAPSHOTS['20260101'])
+    series.record('20260103', SNAPSHOTS['20260103'])
+
+    assert series.dates() == sorted(SNAPSHOTS)
+    assert _points(series) == _points(expected)
+
+
+def test_backfill_does_not_change_later_dates(tmp_path):
+    series = InventorySeries(str(tmp_path))
+    series.record('20260105', [['A', '4', 'W1']])
+    before = _points(series)[('W1', 'A')]
+    series.record('20260101', [['A', '9', 'W1']])
+    points = _points(series)[('W1', 'A')]
+    assert points == [['20260101', 9.0]] + before
+    assert series.series(prod_cd=['A'], date_from='20260102')[0]['points'] == before
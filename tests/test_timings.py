@@ -0,0 +1,46 @@
+import os
+
+from ecount.timings import parse_metrics, record_metrics
+
+
+def _summary(total_ms, request_ms):
+    return {"totalMs": total_ms, "phases": {"request": request_ms}, "calls": {"request": 2}, "otherMs": 0.0}
+
+
+def test_runs_accumulate_into_one_series_each(tmp_path):
+    path = str(tmp_path / 'ecount.prom')
+    labels = {"command": "product_basic_json", "tenant": "default"}
+    record_metrics(path, _summary(300.0, 200.0), labels)
+    record_metrics(path, _summary(2000.0, 1500.0), labels)
+    record_metrics(path, _summary(50.0, 10.0), {"command": "tenants", "tenant": "default"})
+
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    series = [line.rpartition(' ')[0] for line in text.splitlines() if not line.startswith('#')]
+    assert len(series) == len(set(series))
+    assert text.count('# TYPE ecount_command_duration_seconds histogram') == 1
+
+    samples = parse_metrics(text)
+    base = 'command="product_basic_json",tenant="default"'
+    assert samples[f'ecount_command_runs_total{{{base}}}'] == 2
+    assert samples[f'ecount_command_phase_calls_total{{{base},phase="request"}}'] == 4
+    assert samples[f'ecount_command_phase_seconds_total{{{base},phase="request"}}'] == 1.7
+    assert samples[f'ecount_command_duration_seconds_bucket{{{base},le="0.5"}}'] == 1
+    assert samples[f'ecount_command_duration_seconds_bucket{{{base},le="+Inf"}}'] == 2
+    assert samples[f'ecount_command_duration_seconds_sum{{{base}}}'] == 2.3
+
+
+def test_family_lines_are_contiguous_and_buckets_ordered(tmp_path):
+    path = str(tmp_path / 'ecount.prom')
+    for command in ('b', 'a'):
+        record_metrics(path, _summary(1000.0, 1.0), {"command": command, "tenant": "default"})
+    with open(path, encoding='utf-8') as f:
+        lines = [line for line in f.read().splitlines() if not line.startswith('#')]
+    families = [line.partition('{')[0].replace('_bucket', '').replace('_sum', '').replace('_count', '')
+                for line in lines]
+    assert families == sorted(families, key=families.index)   # 지표마다 한 덩어리
+    buckets = [line for line in lines if line.startswith('ecount_command_duration_seconds_bucket{command="a"')]
+    bounds = [line.split('le="')[1].split('"')[0] for line in buckets]
+    assert bounds[-1] == '+Inf'
+    assert [float(bound) for bound in bounds[:-1]] == sorted(float(bound) for bound in bounds[:-1])
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]